@@ -0,0 +1,76 @@
+"""
+Per-request measurements feeding ``registry``.
+
+``MetricsMiddleware`` times every request. For the sampled fraction
+(``METRICS_SAMPLE_RATE``) it also opens a ``Sample`` in ``current_sample``,
+which the hooks below fill in: a wrapper installed on every database
+connection counts queries and their time, and ``BaseSerializer.is_valid``
+and ``.data`` are timed. Outside a sample the hooks only check the context
+variable, so unsampled requests pay next to nothing. Context variables
+follow a request into ``sync_to_async`` threads, so async views are
+measured too.
+"""
+
+import contextvars
+import functools
+import time
+
+from django.db.backends.signals import connection_created
+from rest_framework.serializers import BaseSerializer
+
+
+class Sample:
+    __slots__ = ("db_queries", "db_time", "serializer_time", "in_serializer")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.in_serializer = False
+
+
+current_sample = contextvars.ContextVar("metrics_sample", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    sample = current_sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.db_queries += 1
+        sample.db_time += time.perf_counter() - start
+
+
+def add_query_recorder(sender, connection, **kwargs):
+    # Fires on every reconnect of the same wrapper, hence the check.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+def timed_serializer(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        sample = current_sample.get()
+        # Nested serializers are already inside the outer one's time.
+        if sample is None or sample.in_serializer:
+            return method(self, *args, **kwargs)
+        sample.in_serializer = True
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            sample.serializer_time += time.perf_counter() - start
+            sample.in_serializer = False
+
+    wrapper.timed = True
+    return wrapper
+
+
+def install():
+    connection_created.connect(add_query_recorder)
+    if not getattr(BaseSerializer.is_valid, "timed", False):
+        BaseSerializer.is_valid = timed_serializer(BaseSerializer.is_valid)
+        BaseSerializer.data = property(timed_serializer(BaseSerializer.data.fget))
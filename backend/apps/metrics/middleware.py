@@ -0,0 +1,83 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .instrumentation import Sample, current_sample
+from .registry import registry
+
+
+def endpoint_label(request):
+    match = request.resolver_match
+    if match is None:
+        # One label for every unmatched path, so scanners cannot blow up
+        # the number of series.
+        return "unmatched"
+    return match.view_name or match.route
+
+
+class MetricsMiddleware:
+    """
+    Records the wall time, response size and, for sampled requests, the
+    query count, database time and serializer time of every request, per
+    URL name and method. See apps/metrics/registry.py for how the numbers
+    are shared between workers and exported.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def start_sample(self):
+        rate = getattr(settings, "METRICS_SAMPLE_RATE", 0.1)
+        return Sample() if rate > 0 and random.random() < rate else None
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        sample = self.start_sample()
+        token = current_sample.set(sample)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, response, time.perf_counter() - start, sample)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        sample = self.start_sample()
+        token = current_sample.set(sample)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, response, time.perf_counter() - start, sample)
+        return response
+
+    def record(self, request, response, duration, sample):
+        endpoint = endpoint_label(request)
+        if endpoint == "metrics":
+            return
+        labels = (("endpoint", endpoint), ("method", request.method))
+        registry.inc(
+            "http_requests_total",
+            (*labels, ("status", f"{response.status_code // 100}xx")),
+        )
+        registry.observe("http_request_duration_seconds", labels, duration)
+        if not response.streaming:
+            registry.observe("http_response_size_bytes", labels, len(response.content))
+        if sample is not None:
+            registry.observe("http_request_db_queries", labels, sample.db_queries)
+            registry.observe("http_request_db_duration_seconds", labels, sample.db_time)
+            registry.observe(
+                "http_request_serializer_duration_seconds", labels, sample.serializer_time
+            )
+        registry.maybe_flush()
@@ -0,0 +1,221 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# name: (help, buckets)
+HISTOGRAMS = {
+    "http_request_duration_seconds": (
+        "Wall time of the request, measured for every request.",
+        SECONDS,
+    ),
+    "http_response_size_bytes": (
+        "Size of the response body; streaming responses are not counted.",
+        (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    ),
+    "http_request_db_queries": (
+        "Database queries run by a sampled request.",
+        (0, 1, 2, 3, 5, 10, 20, 50, 100),
+    ),
+    "http_request_db_duration_seconds": (
+        "Time a sampled request spent in database queries.",
+        SECONDS,
+    ),
+    "http_request_serializer_duration_seconds": (
+        "Time a sampled request spent in serializer is_valid() and .data.",
+        SECONDS,
+    ),
+}
+
+COUNTERS = {
+    "http_requests_total": "Requests handled, by status class.",
+}
+
+
+def quantile(q, buckets, counts):
+    """Estimate a quantile from bucket counts, like PromQL histogram_quantile."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    lower = 0
+    for bound, count in zip(buckets, counts):
+        if count and seen + count >= rank:
+            return lower + (bound - lower) * (rank - seen) / count
+        seen += count
+        lower = bound
+    # Past the last bucket; the best estimate is its upper bound.
+    return buckets[-1]
+
+
+def format_labels(labels):
+    return ",".join(f'{name}="{value}"' for name, value in labels)
+
+
+def format_value(value):
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Per-process request metrics, shared between workers through files.
+
+    Each series is a tuple of label pairs. Histograms keep non-cumulative
+    bucket counts (the last one is +Inf), their sum and their count.
+
+    With ``METRICS_DIR`` set, every worker writes its totals to
+    ``<METRICS_DIR>/metrics-<pid>.json`` at most every
+    ``METRICS_FLUSH_INTERVAL`` seconds, and a scrape, whichever worker
+    serves it, merges all the files. Without it, a scrape only sees the
+    worker that serves it, which is all there is under runserver.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+            self.flushed_at = time.monotonic()
+
+    @property
+    def directory(self):
+        return getattr(settings, "METRICS_DIR", None)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, "METRICS_FLUSH_INTERVAL", 5)
+
+    def observe(self, name, labels, value):
+        buckets = HISTOGRAMS[name][1]
+        index = bisect_left(buckets, value)
+        with self.lock:
+            series = self.histograms.setdefault(name, {})
+            entry = series.get(labels)
+            if entry is None:
+                entry = series[labels] = [[0] * (len(buckets) + 1), 0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def inc(self, name, labels, amount=1):
+        with self.lock:
+            series = self.counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    # Sharing between workers.
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "histograms": {
+                    name: [[list(labels), counts[:], total, count]
+                           for labels, (counts, total, count) in series.items()]
+                    for name, series in self.histograms.items()
+                },
+                "counters": {
+                    name: [[list(labels), value] for labels, value in series.items()]
+                    for name, series in self.counters.items()
+                },
+            }
+
+    def maybe_flush(self):
+        if self.directory and time.monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.flushed_at = time.monotonic()
+        directory = Path(self.directory)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            # Write a temporary file and rename it, so readers never see a
+            # half-written one.
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as file:
+                json.dump(self.snapshot(), file)
+            os.replace(tmp, directory / f"metrics-{os.getpid()}.json")
+        except OSError as exc:
+            logger.warning("Could not write metrics: %s", exc)
+
+    def collect(self):
+        """All workers' totals, merged, as ``(histograms, counters)``."""
+        if not self.directory:
+            snapshots = [self.snapshot()]
+        else:
+            self.flush()
+            snapshots = []
+            for path in Path(self.directory).glob("metrics-*.json"):
+                try:
+                    snapshots.append(json.loads(path.read_text()))
+                except (OSError, ValueError) as exc:
+                    logger.warning("Skipping metrics file %s: %s", path, exc)
+
+        histograms, counters = {}, {}
+        for snapshot in snapshots:
+            for name, entries in snapshot["histograms"].items():
+                series = histograms.setdefault(name, {})
+                for labels, counts, total, count in entries:
+                    key = tuple(map(tuple, labels))
+                    merged = series.setdefault(key, [[0] * len(counts), 0, 0])
+                    merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                    merged[1] += total
+                    merged[2] += count
+            for name, entries in snapshot["counters"].items():
+                series = counters.setdefault(name, {})
+                for labels, value in entries:
+                    key = tuple(map(tuple, labels))
+                    series[key] = series.get(key, 0) + value
+        return histograms, counters
+
+    def render(self):
+        """The merged metrics in the Prometheus text exposition format."""
+        histograms, counters = self.collect()
+        lines = []
+        for name, help_text in COUNTERS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for labels, value in sorted(counters.get(name, {}).items()):
+                lines.append(f"{name}{{{format_labels(labels)}}} {value}")
+
+        for name, (help_text, buckets) in HISTOGRAMS.items():
+            series = sorted(histograms.get(name, {}).items())
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for labels, (counts, total, count) in series:
+                cumulative = 0
+                for bound, bucket_count in zip((*buckets, "+Inf"), counts):
+                    cumulative += bucket_count
+                    bucket_labels = format_labels((*labels, ("le", format_value(bound))))
+                    lines.append(f"{name}_bucket{{{bucket_labels}}} {cumulative}")
+                lines.append(f"{name}_sum{{{format_labels(labels)}}} {format_value(total)}")
+                lines.append(f"{name}_count{{{format_labels(labels)}}} {count}")
+
+            lines += [
+                f"# HELP {name}_quantile Quantiles estimated from {name}.",
+                f"# TYPE {name}_quantile gauge",
+            ]
+            for labels, (counts, total, count) in series:
+                for q in QUANTILES:
+                    value = quantile(q, buckets, counts)
+                    if value is not None:
+                        q_labels = format_labels((*labels, ("quantile", str(q))))
+                        lines.append(f"{name}_quantile{{{q_labels}}} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
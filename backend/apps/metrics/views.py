@@ -0,0 +1,28 @@
+import hmac
+import logging
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotFound
+
+from .registry import registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics(request):
+    """
+    Prometheus scrape endpoint, behind METRICS_TOKEN. Without a token it is
+    only served with DEBUG on.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token and not settings.DEBUG:
+        logger.warning("Refusing to serve /metrics: METRICS_TOKEN is not set.")
+        return HttpResponseNotFound()
+    if token:
+        expected = f"Bearer {token}"
+        provided = request.headers.get("Authorization", "")
+        if not hmac.compare_digest(provided.encode(), expected.encode()):
+            return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
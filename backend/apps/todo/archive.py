@@ -0,0 +1,111 @@
+"""
+Moving completed tasks between ``Task`` and the ``ArchivedTask`` cold table.
+
+``archive_completed`` moves the tasks that were completed, and not edited
+since, more than ``TASK_ARCHIVE_AFTER_DAYS`` days ago; ``restore`` moves
+archived tasks back. Both go in batches of ``TASK_ARCHIVE_BATCH_SIZE``:
+a batch is copied, deleted from its source table and counted in its
+owners' ``TaskStats`` in one transaction, so a run can stop anywhere
+without losing or duplicating a task. ``TaskStats`` only count tasks in
+``Task``.
+"""
+
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import events, search, stats
+from .cache import task_cache
+from .models import ArchivedTask, Task
+
+COPIED_FIELDS = [field.attname for field in Task._meta.concrete_fields]
+
+
+def batch_size():
+    return getattr(settings, "TASK_ARCHIVE_BATCH_SIZE", 1000)
+
+
+def copy(task, model, **extra):
+    return model(**{field: getattr(task, field) for field in COPIED_FIELDS}, **extra)
+
+
+def by_owner(tasks):
+    owners = defaultdict(list)
+    for task in tasks:
+        owners[task.owner_id].append(task)
+    return owners
+
+
+def archive_batch(cutoff, now, size):
+    """Archive up to ``size`` tasks completed before ``cutoff``; returns them."""
+    with transaction.atomic():
+        tasks = list(
+            Task.objects.select_for_update()
+            .filter(status=Task.Status.COMPLETED, updated_at__lt=cutoff)
+            .order_by("pk")[:size]
+        )
+        if not tasks:
+            return tasks
+        ArchivedTask.objects.bulk_create(
+            copy(task, ArchivedTask, archived_at=now) for task in tasks
+        )
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).delete()
+        for owner_id, owned in by_owner(tasks).items():
+            stats.record(owner_id, before=[stats.state(task) for task in owned], now=now)
+    return tasks
+
+
+def archive_completed(now=None):
+    """Archive every task due for it; returns how many were moved."""
+    now = now or timezone.now()
+    days = getattr(settings, "TASK_ARCHIVE_AFTER_DAYS", 90)
+    cutoff = now - datetime.timedelta(days=days)
+    size = batch_size()
+    archived = 0
+    while True:
+        tasks = archive_batch(cutoff, now, size)
+        archived += len(tasks)
+        for owner_id, owned in by_owner(tasks).items():
+            ids = [task.pk for task in owned]
+            task_cache.invalidate(owner_id, *ids)
+            events.publish(owner_id, "archived", {"ids": ids})
+        if len(tasks) < size:
+            break
+    if archived:
+        search.optimize_index()
+    return archived
+
+
+def restore_batch(archived, size):
+    """Move up to ``size`` tasks of the ``archived`` queryset back to ``Task``."""
+    with transaction.atomic():
+        rows = list(archived.select_for_update().order_by("pk")[:size])
+        if not rows:
+            return []
+        # bulk_create() stamps both timestamps. updated_at stays "now", so
+        # a restored task is not archived again by the next run.
+        tasks = Task.objects.bulk_create(copy(row, Task) for row in rows)
+        for task, row in zip(tasks, rows):
+            task.created_at = row.created_at
+        Task.objects.bulk_update(tasks, ["created_at"])
+        ArchivedTask.objects.filter(pk__in=[row.pk for row in rows]).delete()
+        for owner_id, owned in by_owner(tasks).items():
+            stats.record(owner_id, after=[stats.state(task) for task in owned])
+    return tasks
+
+
+def restore(archived):
+    """Restore every task of the ``archived`` queryset; returns how many."""
+    size = batch_size()
+    restored = 0
+    while True:
+        tasks = restore_batch(archived, size)
+        restored += len(tasks)
+        for owner_id in by_owner(tasks):
+            task_cache.invalidate(owner_id)
+            events.publish(owner_id, "refresh", {})
+        if len(tasks) < size:
+            return restored
@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+try:
+    from django_redis.exceptions import ConnectionInterrupted
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover
+    CACHE_ERRORS = (OSError,)
+else:
+    CACHE_ERRORS = (ConnectionInterrupted, RedisError, OSError)
+
+logger = logging.getLogger(__name__)
+
+ALL_OWNERS = "all"
+
+
+class TaskCache:
+    """
+    Response cache for ``TaskViewSet.get``.
+
+    List keys embed a generation counter of the owner they were built for;
+    a write bumps that owner's counter (and the anonymous "all tasks"
+    counter) so every stale page of that owner stops matching at once while
+    other owners' pages stay cached. Detail keys embed a counter of their
+    task the same way, rather than being deleted: a reader that fetched the
+    task before a write and stores it after the invalidation stores it
+    under a key nobody reads any more.
+
+    When the cache backend errors out (Redis down), reads and writes go to a
+    small in-process LRU for ``retry_after`` seconds. Invalidations made in
+    that window are replayed against the backend once it answers again, so
+    it never serves pages that were invalidated during the outage.
+    """
+
+    prefix = "tasks"
+    unavailable = object()
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.local = OrderedDict()
+            self.local_generations = {}
+            self.pending_bumps = set()
+            self.down_until = 0
+            self.hits = 0
+            self.misses = 0
+            self.errors = 0
+
+    @property
+    def timeout(self):
+        return getattr(settings, "TASK_CACHE_TIMEOUT", 300)
+
+    @property
+    def local_size(self):
+        return getattr(settings, "TASK_CACHE_LOCAL_SIZE", 1024)
+
+    @property
+    def retry_after(self):
+        return getattr(settings, "TASK_CACHE_RETRY_AFTER", 30)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "local_entries": len(self.local),
+            "backend_available": self.backend_available(),
+        }
+
+    def detail_key(self, pk):
+        return f"{self.prefix}:detail:{pk}:{self.generation(task_scope(pk))}"
+
+    def generation_key(self, scope):
+        return f"{self.prefix}:gen:{scope}"
+
+    def generation_timeout(self, scope):
+        # Owner counters are kept. A task's only has to outlive the entries
+        # cached under it; once it expires, one restarted from the clock
+        # cannot match them.
+        if isinstance(scope, str) and scope.startswith("task:"):
+            return 2 * self.timeout
+        return None
+
+    def list_key(self, request, owner_id=None):
+        owner = owner_id if owner_id is not None else ALL_OWNERS
+        params = sorted(request.query_params.lists())
+        digest = hashlib.sha1(repr((request.get_host(), params)).encode()).hexdigest()
+        return f"{self.prefix}:list:{owner}:{self.generation(owner)}:{digest}"
+
+    def get(self, key):
+        value = self.call("get", key)
+        if value is self.unavailable:
+            value = self.local_get(key)
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        if self.call("set", key, value, self.timeout) is self.unavailable:
+            self.local_set(key, value)
+
+    def generation(self, scope):
+        generation = self.call("get", self.generation_key(scope))
+        if generation is self.unavailable:
+            return f"local{self.local_generations.get(scope, 0)}"
+        return generation or 0
+
+    def invalidate(self, owner_id, *pks):
+        for scope in (owner_id, ALL_OWNERS, *map(task_scope, pks)):
+            self.bump(scope)
+
+    def bump(self, scope):
+        with self.lock:
+            self.local_generations[scope] = self.local_generations.get(scope, 0) + 1
+        key, timeout = self.generation_key(scope), self.generation_timeout(scope)
+        if self.call(incr_generation, key, timeout) is self.unavailable:
+            with self.lock:
+                self.pending_bumps.add(scope)
+
+    # Backend access with the in-process fallback.
+
+    def backend_available(self):
+        return time.monotonic() >= self.down_until
+
+    def call(self, method, *args):
+        if not self.backend_available():
+            return self.unavailable
+        try:
+            if self.pending_bumps:
+                self.replay()
+            if callable(method):
+                return method(caches[self.alias], *args)
+            return getattr(caches[self.alias], method)(*args)
+        except CACHE_ERRORS as exc:
+            logger.warning("Task cache backend unavailable: %s", exc)
+            with self.lock:
+                self.errors += 1
+                self.down_until = time.monotonic() + self.retry_after
+            return self.unavailable
+
+    def replay(self):
+        with self.lock:
+            bumps, self.pending_bumps = self.pending_bumps, set()
+        try:
+            cache = caches[self.alias]
+            for scope in bumps:
+                incr_generation(
+                    cache, self.generation_key(scope), self.generation_timeout(scope)
+                )
+        except CACHE_ERRORS:
+            with self.lock:
+                self.pending_bumps |= bumps
+            raise
+        with self.lock:
+            self.local.clear()
+
+    def local_get(self, key):
+        with self.lock:
+            entry = self.local.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self.local[key]
+                return None
+            self.local.move_to_end(key)
+            return value
+
+    def local_set(self, key, value):
+        with self.lock:
+            self.local[key] = (value, time.monotonic() + self.timeout)
+            self.local.move_to_end(key)
+            while len(self.local) > self.local_size:
+                self.local.popitem(last=False)
+
+
+def task_scope(pk):
+    return f"task:{pk}"
+
+
+def incr_generation(cache, key, timeout=None):
+    # Generations start from the clock rather than 0 so that a counter lost
+    # to eviction or expiry comes back above every value pages were cached
+    # under.
+    cache.add(key, int(time.time() * 1000), timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout)
+
+
+task_cache = TaskCache()
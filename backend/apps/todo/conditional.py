@@ -0,0 +1,133 @@
+"""
+Validators for conditional GETs of tasks.
+
+A task's ETag and Last-Modified come from its ``updated_at``. A list
+page's ETag comes from the row count and latest ``updated_at`` of the
+filtered tasks, plus everything that shapes the page (owner, query string,
+host, pagination class): adding or editing a task raises the latest
+``updated_at`` and deleting one lowers the count, so any change to the
+tasks a page is cut from changes its ETag. Lists get no Last-Modified,
+since a deletion does not move it.
+
+A cursor page is validated by its own rows instead, so that it keeps
+costing one index range scan: the ids it holds, their latest
+``updated_at`` and whether more pages follow change with any insertion,
+deletion or edit that changes the page.
+
+Writes to a task honour If-Match and If-Unmodified-Since against the same
+validators, so that a client editing a copy it read earlier gets a 412
+instead of overwriting someone else's edit.
+"""
+
+import datetime
+import hashlib
+
+from django.db.models import Func, Subquery
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts):
+    return f'W/"{hashlib.sha1(repr(parts).encode()).hexdigest()}"'
+
+
+def utc_isoformat(value):
+    return value and value.astimezone(datetime.timezone.utc).isoformat()
+
+
+def detail_etag(pk, updated_at, fields):
+    return make_etag("task", pk, utc_isoformat(updated_at), fields)
+
+
+def list_etag(request, owner_id, paginator, summary):
+    return make_etag(
+        "tasks",
+        owner_id,
+        request.get_host(),
+        sorted(request.query_params.lists()),
+        type(paginator).__name__,
+        summary["count"],
+        utc_isoformat(summary["last_modified"]),
+        summary.get("page"),
+    )
+
+
+def summary_rows(tasks):
+    """
+    The latest ``updated_at`` of ``tasks`` and their count, as one row
+    (none when ``tasks`` is empty); see ``summarize``.
+    """
+    # The latest edit comes off the (owner, updated_at) index and the count
+    # is a scalar subquery: COUNT and MAX side by side make SQLite compare
+    # every row's updated_at.
+    count = Subquery(tasks.order_by().values(count=Func("pk", function="COUNT")))
+    return tasks.order_by("-updated_at").values_list("updated_at", count)
+
+
+def summarize(row):
+    last_modified, count = row or (None, 0)
+    return {"count": count, "last_modified": last_modified}
+
+
+def page_summary(paginator, rows):
+    """A summary of the cursor page ``rows`` that ``paginator`` just cut."""
+    return {
+        "count": len(rows),
+        "last_modified": max((row.updated_at for row in rows), default=None),
+        "page": ([row.id for row in rows], paginator.has_next, paginator.has_previous),
+    }
+
+
+def merge(*summaries):
+    """One summary of the tasks of several ``summarize`` results."""
+    modified = [summary["last_modified"] for summary in summaries]
+    return {
+        "count": sum(summary["count"] for summary in summaries),
+        "last_modified": max(filter(None, modified), default=None),
+    }
+
+
+def weak(etag):
+    return etag.removeprefix("W/")
+
+
+def precondition_failed(request, etag, last_modified):
+    """
+    Whether ``request``'s If-Match or If-Unmodified-Since rule out writing
+    over the task version whose validators are ``etag`` and ``last_modified``.
+    """
+    # Django compares If-Match strongly, which never matches the weak ETags
+    # given out here; a task's ETag stands for one version of it, so the weak
+    # comparison tells whether it changed.
+    if_match = request.META.get("HTTP_IF_MATCH")
+    if if_match is not None:
+        etags = parse_etags(if_match)
+        return etags != ["*"] and weak(etag) not in map(weak, etags)
+    since = parse_http_date_safe(request.META.get("HTTP_IF_UNMODIFIED_SINCE"))
+    return since is not None and int(last_modified.timestamp()) > since
+
+
+def validator_headers(etag, last_modified=None):
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified.timestamp())
+    return headers
+
+
+def precondition_response(request, etag, last_modified=None):
+    """
+    The 304 (or 412) answering ``request``'s conditional headers, or ``None``
+    when the full response should be sent.
+    """
+    headers = validator_headers(etag, last_modified)
+    response = HttpResponse(headers=headers)
+    conditional = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and int(last_modified.timestamp()),
+        response=response,
+    )
+    return None if conditional is response else conditional
@@ -0,0 +1,292 @@
+"""
+Live feed of a user's task changes, streamed as Server-Sent Events.
+
+Writes call ``publish`` once committed; it renders one SSE frame and
+publishes it on the owner's broker channel (Redis pub/sub, or
+``MemoryBroker`` in tests and single-process setups). Each event loop
+serving streams holds one broker subscription, subscribed to the channels
+of the owners with an open stream, and copies every frame into the queue
+of each of the owner's connections. A queue holds at most
+``TASK_EVENTS_QUEUE_SIZE`` frames: a connection that falls that far behind
+loses them and gets a single ``refresh`` event telling the client to
+reload, so a slow reader never holds more than that in memory.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+import weakref
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .renderers import FastJSONRenderer
+
+try:
+    from redis.exceptions import RedisError
+except ImportError:  # pragma: no cover
+    BROKER_ERRORS = (OSError,)
+else:
+    BROKER_ERRORS = (RedisError, OSError)
+
+logger = logging.getLogger(__name__)
+
+# Tells EventSource how long to wait before reconnecting.
+READY_FRAME = b"retry: 5000\nevent: ready\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+def channel_name(owner_id):
+    return f"tasks:events:{owner_id}"
+
+
+def render(event, data):
+    payload = FastJSONRenderer().render(data)
+    return b"event: %s\ndata: %s\n\n" % (event.encode(), payload)
+
+
+REFRESH_FRAME = render("refresh", {})
+
+
+class MemoryBroker:
+    """Delivers frames to subscriptions of this process only."""
+
+    def __init__(self, url=None):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def publish(self, channel, frame):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.deliver(channel, frame)
+
+    def subscription(self):
+        subscription = MemorySubscription(self)
+        with self.lock:
+            self.subscriptions.add(subscription)
+        return subscription
+
+
+class MemorySubscription:
+    def __init__(self, broker):
+        self.broker = broker
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue()
+        self.channels = set()
+
+    def deliver(self, channel, frame):
+        # Publishers run in other threads (sync views, sync_to_async).
+        if channel in self.channels:
+            try:
+                self.loop.call_soon_threadsafe(self.queue.put_nowait, (channel, frame))
+            except RuntimeError:  # loop closed
+                with self.broker.lock:
+                    self.broker.subscriptions.discard(self)
+
+    async def subscribe(self, channel):
+        self.channels.add(channel)
+
+    async def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    async def messages(self):
+        while True:
+            yield await self.queue.get()
+
+    async def close(self):
+        with self.broker.lock:
+            self.broker.subscriptions.discard(self)
+
+
+class RedisBroker:
+    """Redis pub/sub, so that every worker and host sees every write."""
+
+    def __init__(self, url):
+        self.url = url
+        self.client = None
+
+    def publish(self, channel, frame):
+        if self.client is None:
+            import redis
+
+            self.client = redis.Redis.from_url(
+                self.url, socket_connect_timeout=0.5, socket_timeout=0.5
+            )
+        self.client.publish(channel, frame)
+
+    def subscription(self):
+        import redis.asyncio
+
+        return RedisSubscription(redis.asyncio.Redis.from_url(self.url))
+
+
+class RedisSubscription:
+    def __init__(self, client):
+        self.client = client
+        self.pubsub = client.pubsub(ignore_subscribe_messages=True)
+
+    async def subscribe(self, channel):
+        await self.pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel):
+        await self.pubsub.unsubscribe(channel)
+
+    async def messages(self):
+        while True:
+            if not self.pubsub.subscribed:
+                await asyncio.sleep(0.1)
+                continue
+            message = await self.pubsub.get_message(timeout=1.0)
+            if message is not None and message["type"] == "message":
+                yield message["channel"].decode(), message["data"]
+
+    async def close(self):
+        await self.pubsub.aclose()
+        await self.client.aclose()
+
+
+@functools.cache
+def load_broker(path, url):
+    return import_string(path)(url)
+
+
+def get_broker():
+    return load_broker(
+        getattr(settings, "TASK_EVENTS_BROKER", "apps.todo.events.RedisBroker"),
+        getattr(settings, "TASK_EVENTS_BROKER_URL", None),
+    )
+
+
+def publish(owner_id, event, data):
+    """
+    Send ``event`` to the open streams of ``owner_id``. Call it after the
+    write committed; a broker error is logged, never raised.
+    """
+    try:
+        get_broker().publish(channel_name(owner_id), render(event, data))
+    except BROKER_ERRORS as exc:
+        logger.warning("Task event broker unavailable: %s", exc)
+
+
+class Listener:
+    """The bounded frame queue of one open stream."""
+
+    def __init__(self, size):
+        self.queue = asyncio.Queue(size)
+        self.dropped = 0
+
+    def put(self, frame):
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # The client stopped reading: what it missed is replaced by one
+            # refresh, so its backlog never exceeds the queue size.
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(REFRESH_FRAME)
+
+    def drain(self):
+        frames = []
+        while not self.queue.empty():
+            frames.append(self.queue.get_nowait())
+        return frames
+
+
+class Hub:
+    """One event loop's broker subscription and the streams it feeds."""
+
+    retry_delay = 1
+
+    def __init__(self, broker):
+        self.broker = broker
+        self.listeners = defaultdict(set)
+        self.lock = asyncio.Lock()
+        self.subscription = None
+        self.reader = None
+
+    def connections(self):
+        return sum(len(listeners) for listeners in self.listeners.values())
+
+    async def add(self, channel, listener):
+        async with self.lock:
+            if self.subscription is None:
+                self.subscription = self.broker.subscription()
+                self.reader = asyncio.create_task(self.read())
+            if not self.listeners[channel]:
+                await self.subscription.subscribe(channel)
+            self.listeners[channel].add(listener)
+
+    async def remove(self, channel, listener):
+        async with self.lock:
+            listeners = self.listeners.get(channel)
+            if listeners is None:
+                return
+            listeners.discard(listener)
+            if not listeners:
+                del self.listeners[channel]
+                await self.subscription.unsubscribe(channel)
+            if not self.listeners:
+                self.reader.cancel()
+                await self.subscription.close()
+                self.subscription = self.reader = None
+
+    async def read(self):
+        while True:
+            try:
+                async for channel, frame in self.subscription.messages():
+                    for listener in tuple(self.listeners.get(channel, ())):
+                        listener.put(frame)
+            except BROKER_ERRORS as exc:
+                # Frames published meanwhile are lost; have every client reload.
+                logger.warning("Task event subscription failed: %s", exc)
+                for listeners in tuple(self.listeners.values()):
+                    for listener in tuple(listeners):
+                        listener.put(REFRESH_FRAME)
+                await asyncio.sleep(self.retry_delay)
+
+
+hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    loop = asyncio.get_running_loop()
+    broker = get_broker()
+    hub = hubs.get(loop)
+    if hub is None or hub.broker is not broker:
+        hub = hubs[loop] = Hub(broker)
+    return hub
+
+
+async def stream(owner_id, expires_at=None):
+    """
+    SSE body for one connection: ``ready``, then the owner's events and a
+    heartbeat comment every ``TASK_EVENTS_HEARTBEAT`` seconds. It ends at
+    ``expires_at`` (a Unix time, the access token's expiry) so the client
+    reconnects with a fresh token.
+    """
+    heartbeat = getattr(settings, "TASK_EVENTS_HEARTBEAT", 15)
+    listener = Listener(getattr(settings, "TASK_EVENTS_QUEUE_SIZE", 100))
+    hub = get_hub()
+    channel = channel_name(owner_id)
+    await hub.add(channel, listener)
+    try:
+        yield READY_FRAME
+        while True:
+            timeout = heartbeat
+            if expires_at is not None:
+                timeout = min(timeout, expires_at - time.time())
+                if timeout <= 0:
+                    return
+            try:
+                frame = await asyncio.wait_for(listener.queue.get(), timeout)
+            except TimeoutError:
+                yield HEARTBEAT_FRAME
+                continue
+            yield b"".join([frame, *listener.drain()])
+    finally:
+        await hub.remove(channel, listener)
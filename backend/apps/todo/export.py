@@ -0,0 +1,94 @@
+import csv
+import json
+
+from django.conf import settings
+
+from .renderers import dumps, orjson
+from .rows import TASK_FIELDS, datetime_formatter, row_encoder, task_rows
+
+
+def export_rows(tasks):
+    # Named rows: plain values_list() runs its query as soon as aiterator()
+    # asks for the iterator, on the event loop rather than in a thread.
+    return task_rows(tasks)
+
+
+def to_records(rows):
+    encode = row_encoder()
+    fmt = datetime_formatter()
+    return (encode(row, fmt) for row in rows)
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+class NDJSONEncoder:
+    content_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def header(self):
+        return ""
+
+    def encode(self, rows):
+        if orjson is not None:
+            return b"".join(dumps(record) + b"\n" for record in to_records(rows)).decode()
+        return "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for record in to_records(rows)
+        )
+
+
+class CSVEncoder:
+    content_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self):
+        self.writer = csv.writer(Echo())
+
+    def header(self):
+        return self.writer.writerow(TASK_FIELDS)
+
+    def encode(self, rows):
+        return "".join(
+            self.writer.writerow(
+                "" if value is None else value for value in record.values()
+            )
+            for record in to_records(rows)
+        )
+
+
+ENCODERS = {"ndjson": NDJSONEncoder, "csv": CSVEncoder}
+
+
+def chunk_size():
+    return getattr(settings, "TASK_EXPORT_CHUNK_SIZE", 2000)
+
+
+def stream_export(tasks, encoder):
+    """Yield the export in chunks; at most one chunk of rows is held in memory."""
+    yield encoder.header()
+    size = chunk_size()
+    batch = []
+    for row in export_rows(tasks).iterator(chunk_size=size):
+        batch.append(row)
+        if len(batch) >= size:
+            yield encoder.encode(batch)
+            batch = []
+    if batch:
+        yield encoder.encode(batch)
+
+
+async def astream_export(tasks, encoder):
+    """``stream_export`` for ASGI, reading rows through the async ORM."""
+    yield encoder.header()
+    size = chunk_size()
+    batch = []
+    async for row in export_rows(tasks).aiterator(chunk_size=size):
+        batch.append(row)
+        if len(batch) >= size:
+            yield encoder.encode(batch)
+            batch = []
+    if batch:
+        yield encoder.encode(batch)
@@ -0,0 +1,60 @@
+from rest_framework.exceptions import ParseError
+
+from .models import Task
+from .rows import TASK_FIELDS
+from .search import search_tasks
+
+ALLOWED_ORDERING_FIELDS = ["created_at", "due_date", "priority"]
+
+
+def filter_tasks(tasks, params, rank=True):
+    """
+    Apply the task list's ``search``, ``status``, ``priority`` and
+    ``ordering``; without ``rank`` searches keep the default ordering.
+    """
+    search_query = params.get("search")
+    if search_query:
+        tasks = search_tasks(tasks, search_query, rank=rank)
+
+    # Unknown codes match nothing, as they did when the columns held them.
+    status_filter = params.get("status")
+    if status_filter:
+        tasks = tasks.filter(status=Task.Status.from_code(status_filter))
+
+    priority_filter = params.get("priority")
+    if priority_filter:
+        tasks = tasks.filter(priority=Task.Priority.from_code(priority_filter))
+
+    ordering = params.get("ordering")
+    if ordering and ordering.lstrip("-") in ALLOWED_ORDERING_FIELDS:
+        tasks = tasks.order_by(ordering)
+    elif not tasks.ordered:
+        # Ranked searches come back already in relevance order.
+        tasks = tasks.order_by("-created_at")
+    return tasks
+
+
+def include_archived(params):
+    value = params.get("include_archived", "").lower()
+    if value in ("", "0", "false", "no"):
+        return False
+    if value in ("1", "true", "yes"):
+        return True
+    raise ParseError("include_archived must be true or false.")
+
+
+def requested_fields(params):
+    """
+    The task fields named by the comma-separated ``fields`` parameter, in
+    output order; every field when it is absent.
+    """
+    value = params.get("fields")
+    if not value:
+        return TASK_FIELDS
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names.difference(TASK_FIELDS)
+    if unknown:
+        raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+    if not names:
+        raise ParseError("Expected at least one field.")
+    return tuple(field for field in TASK_FIELDS if field in names)
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import events, stats
+from .cache import task_cache
+from .models import Task, TaskImport
+from .serializers import TaskSerializer
+
+FORMATS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson"}
+
+
+def detect_format(filename):
+    for extension, import_format in FORMATS.items():
+        if filename.lower().endswith(extension):
+            return import_format
+    return None
+
+
+def iter_rows(raw, import_format):
+    """
+    Yield ``(line_number, row)`` from a binary file, one line at a time.
+
+    ``row`` is ``None`` for lines that are not valid NDJSON objects so the
+    caller can report them alongside validation errors.
+    """
+    text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+    if import_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Blank cells mean "not given", so optional columns fall back
+            # to their defaults instead of failing to parse.
+            yield reader.line_num, {k: v for k, v in row.items() if k and v != ""}
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def run_import(task_import):
+    """
+    Validate and insert the rows of ``task_import`` in bounded batches.
+
+    Each batch is validated against ``TaskSerializer`` and written with one
+    ``bulk_create`` in its own transaction together with the progress
+    counters, so progress is visible while the import runs and a failure
+    only loses the batch in flight.
+    """
+    batch_size = getattr(settings, "TASK_IMPORT_BATCH_SIZE", 500)
+    max_errors = getattr(settings, "TASK_IMPORT_MAX_ERRORS", 100)
+
+    TaskImport.objects.filter(pk=task_import.pk).update(status="running")
+    errors = []
+    try:
+        with task_import.file.open("rb") as raw:
+            batch = []
+            for line_number, row in iter_rows(raw, task_import.format):
+                batch.append((line_number, row))
+                if len(batch) >= batch_size:
+                    save_batch(task_import, batch, errors, max_errors, raw.tell())
+                    batch = []
+            if batch:
+                save_batch(task_import, batch, errors, max_errors, task_import.file_size)
+    except Exception as exc:
+        TaskImport.objects.filter(pk=task_import.pk).update(
+            status="failed",
+            errors=errors + [{"line": None, "errors": str(exc)}],
+            finished_at=timezone.now(),
+        )
+        raise
+    finally:
+        task_cache.invalidate(task_import.owner_id)
+        # One refresh rather than an event per imported row.
+        events.publish(task_import.owner_id, "refresh", {})
+
+    TaskImport.objects.filter(pk=task_import.pk).update(
+        status="completed",
+        bytes_processed=task_import.file_size,
+        finished_at=timezone.now(),
+    )
+    task_import.file.delete(save=False)
+
+
+def save_batch(task_import, batch, errors, max_errors, bytes_processed):
+    """Insert one batch; its row errors are appended to ``errors`` up to ``max_errors``."""
+    tasks, error_rows = [], 0
+    for line_number, row in batch:
+        if row is None:
+            row_errors = "Invalid JSON object."
+        else:
+            serializer = TaskSerializer(data=row)
+            if serializer.is_valid():
+                tasks.append(
+                    Task(**serializer.validated_data, owner_id=task_import.owner_id)
+                )
+                continue
+            row_errors = serializer.errors
+        error_rows += 1
+        if len(errors) < max_errors:
+            errors.append({"line": line_number, "errors": row_errors})
+
+    with transaction.atomic():
+        Task.objects.bulk_create(tasks)
+        stats.record(task_import.owner_id, after=[stats.state(task) for task in tasks])
+        TaskImport.objects.filter(pk=task_import.pk).update(
+            processed_rows=F("processed_rows") + len(batch),
+            created_rows=F("created_rows") + len(tasks),
+            error_rows=F("error_rows") + error_rows,
+            errors=errors,
+            bytes_processed=bytes_processed,
+        )
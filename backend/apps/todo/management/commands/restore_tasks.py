@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.todo import archive
+from apps.todo.models import ArchivedTask
+
+
+class Command(BaseCommand):
+    help = (
+        "Move archived tasks back to the task list. Restored tasks count as "
+        "edited now, so the archival job leaves them alone for another "
+        "TASK_ARCHIVE_AFTER_DAYS days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--task", type=int, action="append", help="Only this task id (repeatable)."
+        )
+        parser.add_argument(
+            "--owner", type=int, action="append", help="Only this user id (repeatable)."
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Restore every archived task."
+        )
+
+    def handle(self, *args, task=None, owner=None, all=False, **options):
+        if not (task or owner or all):
+            raise CommandError("Pass --task, --owner or --all.")
+        archived = ArchivedTask.objects.all()
+        if task:
+            archived = archived.filter(pk__in=task)
+        if owner:
+            archived = archived.filter(owner_id__in=owner)
+        self.stdout.write(f"Restored {archive.restore(archived)} task(s).")
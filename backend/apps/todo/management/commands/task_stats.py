@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.todo import stats
+from apps.todo.models import Task, TaskStats
+from django.contrib.auth.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-owner task stats from the tasks themselves, or with "
+        "--verify only report owners whose stats disagree with their tasks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare instead of rebuilding; exit with an error on any difference.",
+        )
+        parser.add_argument(
+            "--owner", type=int, action="append", help="Only this user id (repeatable)."
+        )
+
+    def handle(self, *args, verify=False, owner=None, **options):
+        owners = User.objects.filter(
+            Q(pk__in=Task.objects.values("owner_id")) | Q(task_stats__isnull=False)
+        )
+        if owner:
+            owners = owners.filter(pk__in=owner)
+        owner_ids = owners.order_by("pk").values_list("pk", flat=True)
+
+        if not verify:
+            for owner_id in owner_ids.iterator():
+                stats.rebuild(owner_id)
+            self.stdout.write(f"Rebuilt task stats for {len(owner_ids)} owner(s).")
+            return
+
+        wrong = 0
+        for owner_id in owner_ids.iterator():
+            row = TaskStats.objects.filter(owner_id=owner_id).first()
+            if row is None:
+                problems = ["missing"]
+            else:
+                problems = [
+                    f"{field} {stored} != {counted}"
+                    for field, stored, counted in stats.differences(row)
+                ]
+            if problems:
+                wrong += 1
+                self.stdout.write(f"owner {owner_id}: {', '.join(problems)}")
+        if wrong:
+            raise CommandError(f"Task stats of {wrong} owner(s) are wrong.")
+        self.stdout.write(f"Task stats of {len(owner_ids)} owner(s) are correct.")
@@ -0,0 +1,81 @@
+from django.db import migrations
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE todo_task_fts USING fts5(
+        title, description, status,
+        content='todo_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER todo_task_fts_insert AFTER INSERT ON todo_task BEGIN
+        INSERT INTO todo_task_fts(rowid, title, description, status)
+        VALUES (new.id, new.title, new.description, new.status);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_task_fts_delete AFTER DELETE ON todo_task BEGIN
+        INSERT INTO todo_task_fts(todo_task_fts, rowid, title, description, status)
+        VALUES ('delete', old.id, old.title, old.description, old.status);
+    END
+    """,
+    """
+    CREATE TRIGGER todo_task_fts_update
+    AFTER UPDATE OF title, description, status ON todo_task BEGIN
+        INSERT INTO todo_task_fts(todo_task_fts, rowid, title, description, status)
+        VALUES ('delete', old.id, old.title, old.description, old.status);
+        INSERT INTO todo_task_fts(rowid, title, description, status)
+        VALUES (new.id, new.title, new.description, new.status);
+    END
+    """,
+    "INSERT INTO todo_task_fts(todo_task_fts) VALUES('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS todo_task_fts_update",
+    "DROP TRIGGER IF EXISTS todo_task_fts_delete",
+    "DROP TRIGGER IF EXISTS todo_task_fts_insert",
+    "DROP TABLE IF EXISTS todo_task_fts",
+]
+
+
+def search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    vector = (
+        SearchVector("title", weight="A", config="simple")
+        + SearchVector("description", weight="B", config="simple")
+        + SearchVector("status", weight="C", config="simple")
+    )
+    return GinIndex(vector, name="task_search_idx")
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_FORWARDS:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("todo", "Task"), search_index())
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_BACKWARDS:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("todo", "Task"), search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo", "0002_task_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,202 @@
+from django.db import migrations, models
+
+# Frozen copies of the codes at the time of this migration.
+STATUS_CODES = {"pending": 1, "in_progress": 2, "completed": 3}
+PRIORITY_CODES = {"low": 1, "medium": 2, "high": 3}
+
+
+def sqlite_status_code(column):
+    # The full-text index keeps matching the status words, so its content
+    # comes from a view, and its triggers, that spell the integer out again.
+    whens = " ".join(f"WHEN {value} THEN '{code}'" for code, value in STATUS_CODES.items())
+    return f"CASE {column} {whens} ELSE '' END"
+
+
+SQLITE_DROP_SEARCH = [
+    "DROP TRIGGER IF EXISTS todo_task_fts_update",
+    "DROP TRIGGER IF EXISTS todo_task_fts_delete",
+    "DROP TRIGGER IF EXISTS todo_task_fts_insert",
+    "DROP TABLE IF EXISTS todo_task_fts",
+    "DROP VIEW IF EXISTS todo_task_fts_content",
+]
+
+
+def sqlite_create_search():
+    status = sqlite_status_code
+    return [
+        f"""
+        CREATE VIEW todo_task_fts_content AS
+        SELECT id, title, description, {status("status")} AS status
+        FROM todo_task
+        """,
+        """
+        CREATE VIRTUAL TABLE todo_task_fts USING fts5(
+            title, description, status,
+            content='todo_task_fts_content', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER todo_task_fts_insert AFTER INSERT ON todo_task BEGIN
+            INSERT INTO todo_task_fts(rowid, title, description, status)
+            VALUES (new.id, new.title, new.description, {status("new.status")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER todo_task_fts_delete AFTER DELETE ON todo_task BEGIN
+            INSERT INTO todo_task_fts(todo_task_fts, rowid, title, description, status)
+            VALUES ('delete', old.id, old.title, old.description, {status("old.status")});
+        END
+        """,
+        f"""
+        CREATE TRIGGER todo_task_fts_update
+        AFTER UPDATE OF title, description, status ON todo_task BEGIN
+            INSERT INTO todo_task_fts(todo_task_fts, rowid, title, description, status)
+            VALUES ('delete', old.id, old.title, old.description, {status("old.status")});
+            INSERT INTO todo_task_fts(rowid, title, description, status)
+            VALUES (new.id, new.title, new.description, {status("new.status")});
+        END
+        """,
+        "INSERT INTO todo_task_fts(todo_task_fts) VALUES('rebuild')",
+    ]
+
+
+def sqlite_create_text_search():
+    # The 0003 layout, indexing the text columns directly.
+    return [
+        """
+        CREATE VIRTUAL TABLE todo_task_fts USING fts5(
+            title, description, status,
+            content='todo_task', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        """
+        CREATE TRIGGER todo_task_fts_insert AFTER INSERT ON todo_task BEGIN
+            INSERT INTO todo_task_fts(rowid, title, description, status)
+            VALUES (new.id, new.title, new.description, new.status);
+        END
+        """,
+        """
+        CREATE TRIGGER todo_task_fts_delete AFTER DELETE ON todo_task BEGIN
+            INSERT INTO todo_task_fts(todo_task_fts, rowid, title, description, status)
+            VALUES ('delete', old.id, old.title, old.description, old.status);
+        END
+        """,
+        """
+        CREATE TRIGGER todo_task_fts_update
+        AFTER UPDATE OF title, description, status ON todo_task BEGIN
+            INSERT INTO todo_task_fts(todo_task_fts, rowid, title, description, status)
+            VALUES ('delete', old.id, old.title, old.description, old.status);
+            INSERT INTO todo_task_fts(rowid, title, description, status)
+            VALUES (new.id, new.title, new.description, new.status);
+        END
+        """,
+        "INSERT INTO todo_task_fts(todo_task_fts) VALUES('rebuild')",
+    ]
+
+
+def postgres_search_index(status):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    vector = (
+        SearchVector("title", weight="A", config="simple")
+        + SearchVector("description", weight="B", config="simple")
+        + SearchVector(status, weight="C", config="simple")
+    )
+    return GinIndex(vector, name="task_search_idx")
+
+
+def status_code_expression():
+    return models.Case(
+        *[
+            models.When(status=value, then=models.Value(code))
+            for code, value in STATUS_CODES.items()
+        ],
+        default=models.Value(""),
+        output_field=models.TextField(),
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in SQLITE_DROP_SEARCH:
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS task_search_idx")
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in sqlite_create_search():
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        index = postgres_search_index(status_code_expression())
+        schema_editor.add_index(apps.get_model("todo", "Task"), index)
+
+
+def create_text_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        for statement in sqlite_create_text_search():
+            schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        index = postgres_search_index("status")
+        schema_editor.add_index(apps.get_model("todo", "Task"), index)
+
+
+def convert(apps, field, codes, default):
+    # Rewrite the strings as integer literals while the column is still text;
+    # AlterField then only has to cast them. Unknown values get the default.
+    Task = apps.get_model("todo", "Task")
+    for code, value in codes.items():
+        Task.objects.filter(**{field: code}).update(**{field: str(value)})
+    known = [str(value) for value in codes.values()]
+    Task.objects.exclude(**{f"{field}__in": known}).update(**{field: str(default)})
+
+
+def revert(apps, field, codes):
+    Task = apps.get_model("todo", "Task")
+    for code, value in codes.items():
+        Task.objects.filter(**{field: str(value)}).update(**{field: code})
+
+
+def codes_to_integers(apps, schema_editor):
+    convert(apps, "status", STATUS_CODES, 1)
+    convert(apps, "priority", PRIORITY_CODES, 1)
+
+
+def integers_to_codes(apps, schema_editor):
+    revert(apps, "status", STATUS_CODES)
+    revert(apps, "priority", PRIORITY_CODES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("todo", "0004_taskimport"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_search_index, create_text_search_index),
+        migrations.RunPython(codes_to_integers, integers_to_codes),
+        migrations.AlterField(
+            model_name="task",
+            name="priority",
+            field=models.SmallIntegerField(
+                choices=[(1, "Low"), (2, "Medium"), (3, "High")], default=1
+            ),
+        ),
+        migrations.AlterField(
+            model_name="task",
+            name="status",
+            field=models.SmallIntegerField(
+                choices=[(1, "Pending"), (2, "In Progress"), (3, "Completed")],
+                default=1,
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,31 +1,192 @@
 from django.db import models
+from django.utils import timezone
 
 
-class Task(models.Model):
+class CodedChoices(models.IntegerChoices):
+    """
+    Integer choices that the API exchanges as their lower-cased member
+    names, e.g. ``Task.Status.IN_PROGRESS`` is stored as ``2`` and shown
+    as ``"in_progress"``.
+    """
+
+    @property
+    def code(self):
+        return self.name.lower()
+
+    @classmethod
+    def from_code(cls, code):
+        for member in cls:
+            if member.code == code:
+                return member
+        return None
+
+
+class AbstractTask(models.Model):
+    # Stored as small integers so they sort by meaning (low < medium < high)
+    # and keep the composite indexes narrow.
+    class Status(CodedChoices):
+        PENDING = 1, "Pending"
+        IN_PROGRESS = 2, "In Progress"
+        COMPLETED = 3, "Completed"
+
+    class Priority(CodedChoices):
+        LOW = 1, "Low"
+        MEDIUM = 2, "Medium"
+        HIGH = 3, "High"
+
     title = models.CharField(max_length=255)
     description = models.TextField()
+    status = models.SmallIntegerField(choices=Status.choices, default=Status.PENDING)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    due_date = models.DateTimeField(null=True, blank=True)
+    priority = models.SmallIntegerField(
+        choices=Priority.choices, default=Priority.LOW
+    )
+    owner = models.ForeignKey(
+        "auth.User",
+        on_delete=models.CASCADE,
+        # Every owner lookup is served by the composite indexes below.
+        db_index=False,
+    )
+
+    class Meta:
+        abstract = True
+
+
+class Task(AbstractTask):
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "created_at"], name="task_owner_created_idx"),
+            models.Index(fields=["owner", "due_date"], name="task_owner_due_idx"),
+            models.Index(
+                fields=["owner", "status", "created_at"],
+                name="task_owner_status_created_idx",
+            ),
+            models.Index(
+                fields=["owner", "status", "due_date"], name="task_owner_status_due_idx"
+            ),
+            models.Index(
+                fields=["owner", "status", "priority"],
+                name="task_owner_status_prio_idx",
+            ),
+            models.Index(fields=["owner", "priority"], name="task_owner_prio_idx"),
+            models.Index(fields=["created_at"], name="task_created_idx"),
+            # The latest edit behind the list ETags, per owner and overall.
+            models.Index(fields=["owner", "updated_at"], name="task_owner_updated_idx"),
+            models.Index(fields=["updated_at"], name="task_updated_idx"),
+            # The due-date window scanned by the reminders.
+            models.Index(fields=["due_date"], name="task_due_idx"),
+        ]
+
+
+class ArchivedTask(AbstractTask):
+    """
+    A completed task moved out of ``Task`` by ``apps.todo.archive``, with
+    the id, timestamps and fields it had there.
+
+    Only the task list's ``include_archived`` reads it, so it is indexed
+    for the default list ordering and the list ETag and nothing else.
+    """
+
+    # Copied from the task rather than stamped on insert.
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["owner", "created_at"], name="archived_owner_created_idx"
+            ),
+            models.Index(
+                fields=["owner", "updated_at"], name="archived_owner_updated_idx"
+            ),
+            models.Index(fields=["created_at"], name="archived_created_idx"),
+            models.Index(fields=["updated_at"], name="archived_updated_idx"),
+            models.Index(fields=["archived_at"], name="archived_at_idx"),
+        ]
+
+
+class TaskImport(models.Model):
+    file = models.FileField(upload_to="imports/")
+    format = models.CharField(
+        max_length=10, choices=[("csv", "CSV"), ("ndjson", "NDJSON")]
+    )
     status = models.CharField(
-        max_length=50,
+        max_length=20,
         choices=[
             ("pending", "Pending"),
-            ("in_progress", "In Progress"),
+            ("running", "Running"),
             ("completed", "Completed"),
+            ("failed", "Failed"),
         ],
         default="pending",
     )
+    file_size = models.PositiveBigIntegerField(default=0)
+    bytes_processed = models.PositiveBigIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_rows = models.PositiveIntegerField(default=0)
+    error_rows = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    due_date = models.DateTimeField(null=True, blank=True)
-    priority = models.CharField(
-        max_length=50,
-        choices=[
-            ("low", "Low"),
-            ("medium", "Medium"),
-            ("high", "High"),
-        ],
-        default="low",
-    )
+    finished_at = models.DateTimeField(null=True, blank=True)
     owner = models.ForeignKey(
         "auth.User",
         on_delete=models.CASCADE,
     )
+
+
+class TaskStats(models.Model):
+    """
+    Per-owner task counts, kept in step with every write to the owner's
+    tasks by ``apps.todo.stats``.
+
+    ``overdue`` can go stale without a write, as due dates pass; it is exact
+    until ``overdue_valid_until``, the earliest due date among open tasks
+    that were not overdue yet (null when there is none). The counts are
+    plain integers so that drift shows up in ``manage.py task_stats
+    --verify`` rather than as failed writes.
+    """
+
+    owner = models.OneToOneField(
+        "auth.User",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_stats",
+    )
+    total = models.IntegerField(default=0)
+    status_pending = models.IntegerField(default=0)
+    status_in_progress = models.IntegerField(default=0)
+    status_completed = models.IntegerField(default=0)
+    priority_low = models.IntegerField(default=0)
+    priority_medium = models.IntegerField(default=0)
+    priority_high = models.IntegerField(default=0)
+    overdue = models.IntegerField(default=0)
+    overdue_valid_until = models.DateTimeField(null=True, blank=True)
+
+
+class TaskReminder(models.Model):
+    """
+    A reminder mailed for a task by ``apps.todo.reminders``: at most one of
+    each kind goes out per task and due date. ``task_id`` is a plain column
+    rather than a foreign key so that deleting tasks stays a single query;
+    rows are pruned once their due date leaves the reminder window.
+    """
+
+    class Kind(CodedChoices):
+        UPCOMING = 1, "Upcoming"
+        OVERDUE = 2, "Overdue"
+
+    task_id = models.BigIntegerField()
+    kind = models.SmallIntegerField(choices=Kind.choices)
+    due_date = models.DateTimeField()
+    sent_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task_id", "kind", "due_date"], name="task_reminder_unique"
+            ),
+        ]
+        indexes = [models.Index(fields=["due_date"], name="task_reminder_due_idx")]
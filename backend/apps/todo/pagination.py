@@ -1,7 +1,260 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def union_rows(querysets, order_by):
+    """
+    The rows of ``querysets``, ``values_list`` querysets selecting the same
+    columns, as one query ordered by ``order_by``.
+    """
+    first, *rest = (queryset.order_by() for queryset in querysets)
+    return first.union(*rest, all=True).order_by(*order_by)
 
 
 class TaskPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
+    # Set by a view that already counted the rows, to skip another COUNT(*).
+    known_count = None
+    # Set by a view to page through the rows of these querysets as well, in
+    # the order of the one it paginates (e.g. archived tasks).
+    extra_querysets = ()
+
+    def combine(self, queryset):
+        if not self.extra_querysets:
+            return queryset
+        return union_rows([queryset, *self.extra_querysets], queryset.query.order_by)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return super().paginate_queryset(self.combine(queryset), request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = Paginator(object_list, per_page)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` through the async ORM; one ``acount`` and one page query."""
+        self.request = request
+        queryset = self.combine(queryset)
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        if self.known_count is None:
+            paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            number = paginator.validate_number(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            )
+        bottom = (number - 1) * page_size
+        rows = [task async for task in queryset[bottom : bottom + page_size]]
+        self.page = Page(rows, number, paginator)
+        return rows
+
+
+class TaskCursorPagination(BasePagination):
+    """
+    Keyset pagination over the orderings allowed by ``TaskViewSet``.
+
+    Pages are addressed by an opaque cursor holding the ordering value and
+    ``id`` of the boundary row, so a page costs one index range scan no matter
+    how deep it is and no ``COUNT(*)`` is issued. Tasks with no ``due_date``
+    come first in a ``due_date`` walk on SQLite and last on PostgreSQL.
+    """
+
+    page_size = TaskPagination.page_size
+    page_size_query_param = TaskPagination.page_size_query_param
+    max_page_size = TaskPagination.max_page_size
+    cursor_query_param = "cursor"
+    ordering_fields = ("created_at", "due_date", "priority")
+    nullable_fields = ("due_date",)
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor."
+    extra_querysets = TaskPagination.extra_querysets
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request)
+        return self.set_page([task async for task in queryset[: self.page_size + 1]])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(queryset)
+        self.vendor = connections[queryset.db].vendor
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor["r"])
+        querysets = [queryset, *self.extra_querysets]
+        if self.cursor:
+            seek = self.get_seek_filter(self.cursor)
+            querysets = [queryset.filter(seek) for queryset in querysets]
+        order_by = self.get_order_by(self.reverse)
+        if len(querysets) == 1:
+            return querysets[0].order_by(*order_by)
+        return union_rows(querysets, order_by)
+
+    def set_page(self, rows):
+        # ``rows`` holds one row past the page to tell whether there is more.
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.has_next = has_more if not self.reverse else self.cursor is not None
+        self.has_previous = has_more if self.reverse else self.cursor is not None
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = queryset.query.order_by
+        ordering = ordering[0] if ordering else self.default_ordering
+        if not isinstance(ordering, str) or ordering.lstrip("-") not in self.ordering_fields:
+            ordering = self.default_ordering
+        return ordering.lstrip("-"), ordering.startswith("-")
+
+    def get_order_by(self, reverse=False):
+        if self.descending != reverse:
+            return (F(self.field).desc(), F("id").desc())
+        return (F(self.field).asc(), F("id").asc())
+
+    def get_seek_filter(self, cursor):
+        value, pk = cursor["v"], cursor["id"]
+        descending = self.descending != cursor["r"]
+        lookup = "lt" if descending else "gt"
+        after_id = Q(**{f"id__{lookup}": pk})
+
+        # The redundant inclusive bound gives the database a range to seek to
+        # in the index; the OR alone would make it walk from the first row.
+        seek = Q(**{f"{self.field}__{lookup}e": value}) & (
+            Q(**{f"{self.field}__{lookup}": value})
+            | (Q(**{self.field: value}) & after_id)
+        )
+        if self.field not in self.nullable_fields:
+            return seek
+
+        # The ordering is left to the database so the (owner, due_date) index
+        # can serve it, which means NULLs sort where the backend puts them:
+        # after every value on PostgreSQL, before them elsewhere.
+        nulls_largest = self.vendor in ("postgresql", "oracle")
+        nulls_at_end = nulls_largest != descending
+        is_null = Q(**{f"{self.field}__isnull": True})
+
+        if value is None:
+            seek = is_null & after_id
+            if not nulls_at_end:
+                seek |= ~is_null
+            return seek
+
+        if nulls_at_end:
+            seek |= is_null
+        return seek
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            value, pk, reverse = cursor["v"], int(cursor["id"]), bool(cursor["r"])
+            if value is None:
+                if self.field not in self.nullable_fields:
+                    raise ValueError
+            elif self.field in ("created_at", "due_date"):
+                value = parse_datetime(value)
+                if value is None:
+                    raise ValueError
+            elif self.field == "priority" and not isinstance(value, int):
+                raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return {"v": value, "id": pk, "r": reverse}
+
+    @staticmethod
+    def make_cursor(value, pk, reverse=False):
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        payload = json.dumps({"v": value, "id": pk, "r": reverse}, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+        return encoded.rstrip("=")
+
+    def encode_cursor(self, row, reverse):
+        # ``row`` is a Task or a named row from ``task_rows``.
+        cursor = self.make_cursor(getattr(row, self.field), row.id, reverse)
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+def get_task_paginator(request):
+    mode = request.query_params.get("pagination")
+    if not mode:
+        if request.query_params.get(TaskCursorPagination.cursor_query_param):
+            mode = "cursor"
+        else:
+            mode = getattr(settings, "TASK_PAGINATION_MODE", "page")
+    if mode == "cursor":
+        return TaskCursorPagination()
+    return TaskPagination()
@@ -0,0 +1,167 @@
+"""
+Due-date reminder digests, sent by the ``send_task_reminders`` beat task.
+
+Each tick reads the open tasks due between ``TASK_REMINDER_OVERDUE_DAYS``
+ago and ``TASK_REMINDER_LEAD_HOURS`` ahead that have no reminder of their
+kind yet, as one range scan of the due-date index streamed in owner
+order. Every owner gets one digest, sent on its own over one SMTP
+connection held for the tick. Only the tasks of digests that went out get
+``TaskReminder`` rows, so a rerun skips them and retries the rest: a digest
+the server refuses is logged and left for the next tick, and any other
+send error ends the tick after recording what was already sent. Rows are
+written every ``TASK_REMINDER_BATCH_SIZE`` digests, which makes delivery
+at-least-once: a worker that dies between a send and the next write
+resends up to that many digests. Memory is bounded by the largest digest,
+which lists at most ``TASK_REMINDER_MAX_LISTED`` tasks.
+"""
+
+import datetime
+import itertools
+import logging
+from operator import itemgetter
+from smtplib import SMTPRecipientsRefused
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Task, TaskReminder
+from .routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+RECORD_CHUNK_SIZE = 2000
+
+
+def window(now):
+    lead = getattr(settings, "TASK_REMINDER_LEAD_HOURS", 24)
+    overdue_days = getattr(settings, "TASK_REMINDER_OVERDUE_DAYS", 7)
+    return now - datetime.timedelta(days=overdue_days), now + datetime.timedelta(hours=lead)
+
+
+def due_tasks(now):
+    """
+    ``(id, owner_id, email, username, title, due_date)`` of the tasks to
+    remind, in owner order.
+    """
+    start, end = window(now)
+    sent = TaskReminder.objects.filter(task_id=OuterRef("pk"), due_date=OuterRef("due_date"))
+    return (
+        Task.objects.filter(due_date__gte=start, due_date__lt=end)
+        .exclude(status=Task.Status.COMPLETED)
+        .exclude(owner__email="")
+        .filter(
+            Q(~Exists(sent.filter(kind=TaskReminder.Kind.OVERDUE)), due_date__lt=now)
+            | Q(~Exists(sent.filter(kind=TaskReminder.Kind.UPCOMING)), due_date__gte=now)
+        )
+        .order_by("owner_id", "due_date", "pk")
+        .values_list("pk", "owner_id", "owner__email", "owner__username", "title", "due_date")
+    )
+
+
+class Recorder:
+    """Writes ``TaskReminder`` rows in chunks."""
+
+    def __init__(self, now):
+        self.ops = connection.ops
+        self.sent_at = self.ops.adapt_datetimefield_value(now)
+        self.pending = []
+
+    def add(self, task_id, kind, due_date):
+        due_date = self.ops.adapt_datetimefield_value(due_date)
+        self.pending.append((task_id, kind, due_date, self.sent_at))
+        if len(self.pending) >= RECORD_CHUNK_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        # One executemany() rather than bulk_create(): building and preparing
+        # a model instance per row took most of a tick.
+        table = self.ops.quote_name(TaskReminder._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} (task_id, kind, due_date, sent_at) "
+                "VALUES (%s, %s, %s, %s) ON CONFLICT DO NOTHING",
+                self.pending,
+            )
+        self.pending = []
+
+
+def format_due(due_date):
+    return timezone.localtime(due_date).strftime("%Y-%m-%d %H:%M %Z")
+
+
+def digest(rows, now):
+    """
+    The mail for one owner's ``rows``, and the ``(task_id, kind, due_date)``
+    of the reminder it gives for each of them.
+    """
+    max_listed = getattr(settings, "TASK_REMINDER_MAX_LISTED", 20)
+    sections = {TaskReminder.Kind.OVERDUE: [], TaskReminder.Kind.UPCOMING: []}
+    reminders = []
+    for task_id, _, email, username, title, due_date in rows:
+        kind = TaskReminder.Kind.OVERDUE if due_date < now else TaskReminder.Kind.UPCOMING
+        reminders.append((task_id, kind, due_date))
+        if len(reminders) <= max_listed:
+            sections[kind].append(f"- {title} (due {format_due(due_date)})")
+    total = len(reminders)
+
+    lead = getattr(settings, "TASK_REMINDER_LEAD_HOURS", 24)
+    headings = {
+        TaskReminder.Kind.OVERDUE: "Overdue:",
+        TaskReminder.Kind.UPCOMING: f"Due in the next {lead} hours:",
+    }
+    body = [f"Hi {username},", ""]
+    for kind, lines in sections.items():
+        if lines:
+            body += [headings[kind], *lines, ""]
+    if total > max_listed:
+        body += [f"...and {total - max_listed} more.", ""]
+    subject = "1 task needs" if total == 1 else f"{total} tasks need"
+    message = EmailMessage(
+        f"{subject} your attention", "\n".join(body), settings.DEFAULT_FROM_EMAIL, [email]
+    )
+    return message, reminders
+
+
+def send_reminders(now=None):
+    """Send this tick's digests; returns how many were sent."""
+    now = now or timezone.now()
+    batch_size = getattr(settings, "TASK_REMINDER_BATCH_SIZE", 500)
+    TaskReminder.objects.filter(due_date__lt=window(now)[0]).delete()
+
+    # The scan starts outside the batch transactions so that a PostgreSQL
+    # server-side cursor outlives their commits, and on the primary, which
+    # holds the reminders just recorded.
+    rows = due_tasks(now).iterator(chunk_size=RECORD_CHUNK_SIZE)
+    with use_primary():
+        first = next(rows, None)
+    if first is None:
+        return 0
+    owners = itertools.groupby(itertools.chain([first], rows), itemgetter(1))
+    mail_connection = get_connection()
+    recorder = Recorder(now)
+    sent = 0
+    try:
+        for _, owner_rows in owners:
+            message, reminders = digest(owner_rows, now)
+            # Opened for the first digest and reused for the others.
+            mail_connection.open()
+            try:
+                mail_connection.send_messages([message])
+            except SMTPRecipientsRefused as exc:
+                logger.warning("Reminder digest to %s refused: %s", message.to[0], exc)
+                continue
+            for reminder in reminders:
+                recorder.add(*reminder)
+            sent += 1
+            if sent % batch_size == 0:
+                recorder.flush()
+    finally:
+        # Digests sent before an error are recorded all the same.
+        recorder.flush()
+        mail_connection.close()
+    return sent
@@ -0,0 +1,42 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def dumps(data):
+    """
+    ``data`` as the bytes ``JSONRenderer`` would produce, through orjson.
+
+    Types orjson does not handle the same way (datetimes, lazy strings,
+    decimals...) go through DRF's encoder, and U+2028/U+2029 are escaped
+    like DRF does so the output stays valid JavaScript.
+    """
+    content = orjson.dumps(
+        data,
+        default=JSONEncoder().default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+    if b"\xe2\x80" in content:
+        content = content.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+    return content
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` with the same output, rendered by orjson when installed."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,108 @@
+import contextvars
+import logging
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .cache import CACHE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+primary_pinned = contextvars.ContextVar("primary_pinned", default=False)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+@contextmanager
+def use_primary(pinned=True):
+    """Send the task reads made inside the block to the primary, or not."""
+    token = primary_pinned.set(pinned)
+    try:
+        yield
+    finally:
+        primary_pinned.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends ``Task`` reads to a random ``DATABASE_REPLICAS`` alias.
+
+    Reads stay on the primary while ``use_primary`` is active and inside a
+    transaction on the primary, whose uncommitted rows a replica cannot see.
+    Writes and every other model use the primary.
+    """
+
+    def routes(self, model):
+        return model._meta.label_lower == "todo.task"
+
+    def db_for_read(self, model, **hints):
+        replicas = replica_aliases()
+        if not replicas or not self.routes(model):
+            return None
+        if primary_pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if replica_aliases() and self.routes(model):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+# Read-your-writes: after a user writes, their reads stay on the primary for
+# DATABASE_REPLICA_PIN_SECONDS, long enough for the replicas to catch up. The
+# marker lives in the shared cache so it holds across workers.
+
+
+def pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def record_write(user_id):
+    try:
+        caches["default"].set(
+            pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS
+        )
+    except CACHE_ERRORS as exc:
+        logger.warning("Could not record write for replica pinning: %s", exc)
+
+
+def wrote_recently(user_id):
+    try:
+        return bool(caches["default"].get(pin_key(user_id)))
+    except CACHE_ERRORS as exc:
+        # Without the marker a stale read is possible, so play it safe.
+        logger.warning("Could not read replica pin: %s", exc)
+        return True
+
+
+def needs_primary(request):
+    """Whether ``request`` must read from the primary."""
+    if not replica_aliases():
+        return False
+    if request.method not in SAFE_METHODS:
+        return True
+    return request.user.is_authenticated and wrote_recently(request.user.pk)
+
+
+def wrote(request, response):
+    """Record a successful write made by ``request`` for its user."""
+    if (
+        replica_aliases()
+        and request.method not in SAFE_METHODS
+        and response.status_code < 400
+        and request.user.is_authenticated
+    ):
+        record_write(request.user.pk)
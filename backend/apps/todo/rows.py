@@ -0,0 +1,99 @@
+"""
+Read path that turns task rows straight into ``TaskSerializer`` output.
+
+``task_rows`` selects the exposed columns with ``values_list`` instead of
+building model instances, and ``to_records`` maps each row tuple to the
+dict ``TaskSerializer`` would produce. The mapping for a set of fields is
+compiled once into a function returning a dict literal, so a row costs one
+call and no per-field dispatch.
+"""
+
+import datetime
+import functools
+
+from django.utils import timezone
+
+from .models import Task
+
+# Same keys, in the same order, as TaskSerializer.
+TASK_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "created_at",
+    "updated_at",
+    "due_date",
+    "priority",
+    "owner",
+)
+DATETIME_FIELDS = {"created_at", "updated_at", "due_date"}
+CODE_FIELDS = {
+    "status": {status.value: status.code for status in Task.Status},
+    "priority": {priority.value: priority.code for priority in Task.Priority},
+}
+# Read from page boundary rows by TaskCursorPagination, and from every row
+# of a cursor page for its validators.
+CURSOR_FIELDS = ("id", "created_at", "due_date", "priority", "updated_at")
+
+
+def value_fields(fields=TASK_FIELDS):
+    return [field if field != "owner" else "owner_id" for field in fields]
+
+
+def row_columns(fields):
+    """``fields`` plus the columns pagination needs, for ``task_rows``."""
+    return fields + tuple(field for field in CURSOR_FIELDS if field not in fields)
+
+
+def task_rows(tasks, fields=TASK_FIELDS):
+    # Named rows also serve TaskCursorPagination, which reads the boundary
+    # row's ordering value and id by attribute.
+    return tasks.values_list(*value_fields(fields), named=True)
+
+
+def format_datetime(value):
+    # Matches rest_framework.fields.DateTimeField.to_representation.
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def row_encoder(fields=TASK_FIELDS, columns=None):
+    """
+    Compile ``encode(row, fmt)`` producing ``fields`` from rows selected by
+    ``task_rows(tasks, columns)``; ``columns`` defaults to ``fields``.
+    """
+    columns = columns or fields
+    items = []
+    for field in fields:
+        value = f"row[{columns.index(field)}]"
+        if field in DATETIME_FIELDS:
+            if Task._meta.get_field(field).null:
+                value = f"None if {value} is None else fmt({value})"
+            else:
+                value = f"fmt({value})"
+        elif field in CODE_FIELDS:
+            value = f"{field}_codes[{value}]"
+        items.append(f"{field!r}: {value}")
+    source = f"def encode(row, fmt):\n    return {{{', '.join(items)}}}\n"
+    namespace = {f"{field}_codes": codes for field, codes in CODE_FIELDS.items()}
+    exec(source, namespace)
+    return namespace["encode"]
+
+
+def datetime_formatter():
+    # DateTimeField renders in the current time zone; rows come back in UTC,
+    # so only another active zone needs a conversion.
+    tz = timezone.get_current_timezone()
+    if tz is datetime.timezone.utc or getattr(tz, "key", None) == "UTC":
+        return format_datetime
+    return lambda value: format_datetime(value.astimezone(tz))
+
+
+def to_records(rows, fields=TASK_FIELDS, columns=None):
+    encode = row_encoder(tuple(fields), columns and tuple(columns))
+    fmt = datetime_formatter()
+    return [encode(row, fmt) for row in rows]
@@ -0,0 +1,102 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Case, F, Q, TextField, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import Task
+
+FTS_TABLE = "todo_task_fts"
+FTS_WEIGHTS = (("title", 4), ("description", 2), ("status", 1))
+
+# The status words, so searching "pending" keeps working on the integer column.
+STATUS_CODE = Case(
+    *[When(status=status, then=Value(status.code)) for status in Task.Status],
+    default=Value(""),
+    output_field=TextField(),
+)
+
+# Kept in sync with the GIN index created in migration 0005 on PostgreSQL:
+# the planner only uses the index when the query repeats this expression.
+SEARCH_VECTOR = (
+    SearchVector("title", weight="A", config="simple")
+    + SearchVector("description", weight="B", config="simple")
+    + SearchVector(STATUS_CODE, weight="C", config="simple")
+)
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(query):
+    return TERM_RE.findall(query.lower())
+
+
+def search_tasks(queryset, query, rank=True):
+    """
+    Filter ``queryset`` down to tasks matching every word of ``query``.
+
+    Each word matches as a prefix, so results keep up with the frontend's
+    search-as-you-type. SQLite uses the FTS5 table maintained by triggers,
+    PostgreSQL the GIN-indexed ``tsvector``; other backends, and queries with
+    no searchable words, keep the original ``icontains`` filters. With
+    ``rank`` the best matches come first.
+    """
+    terms = search_terms(query)
+    vendor = connections[queryset.db].vendor
+    # The FTS5 table only indexes Task; ArchivedTask is matched by scanning.
+    if not terms or vendor not in ("sqlite", "postgresql") or (
+        vendor == "sqlite" and queryset.model is not Task
+    ):
+        statuses = [status for status in Task.Status if query.lower() in status.code]
+        return queryset.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(status__in=statuses)
+        )
+
+    if vendor == "postgresql":
+        search_query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms), search_type="raw", config="simple"
+        )
+        queryset = queryset.annotate(search_vector=SEARCH_VECTOR).filter(
+            search_vector=search_query
+        )
+        if rank:
+            queryset = queryset.annotate(
+                search_rank=SearchRank(F("search_vector"), search_query)
+            ).order_by("-search_rank", "-id")
+        return queryset
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    queryset = queryset.filter(id__in=fts_match(match))
+    if rank:
+        # bm25() needs the FTS table joined in, and SQLite without ANALYZE
+        # statistics would then drive the join from the owner index and run
+        # the MATCH once per task. Uncorrelated ``IN`` subqueries are
+        # evaluated once instead, so relevance is scored with the same
+        # title > description > status weights as the PostgreSQL vector.
+        scores = [
+            Case(When(id__in=fts_match(f"{column} : ({match})"), then=weight), default=0)
+            for column, weight in FTS_WEIGHTS
+        ]
+        queryset = queryset.annotate(search_rank=sum(scores, Value(0))).order_by(
+            "-search_rank", "-id"
+        )
+    return queryset
+
+
+def fts_match(match):
+    return RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+
+
+def optimize_index(using="default"):
+    """
+    Merge the FTS5 index after a mass delete (SQLite only): deleted rows
+    stay in it as tombstones that every MATCH reads until their segments
+    are merged.
+    """
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('optimize')")
@@ -1,9 +1,82 @@
 from rest_framework import serializers
-from .models import Task
+from .models import Task, TaskImport, TaskStats
+
+
+class ChoiceCodeField(serializers.ChoiceField):
+    """Reads and writes a ``CodedChoices`` field as its codes, e.g. ``"in_progress"``."""
+
+    def __init__(self, choices_class, **kwargs):
+        self.choices_class = choices_class
+        super().__init__(
+            choices=[(member.code, member.label) for member in choices_class], **kwargs
+        )
+
+    def to_internal_value(self, data):
+        return self.choices_class.from_code(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        return self.choices_class(value).code
 
 
 class TaskSerializer(serializers.ModelSerializer):
+    status = ChoiceCodeField(Task.Status, required=False)
+    priority = ChoiceCodeField(Task.Priority, required=False)
+
     class Meta:
         model = Task
-        fields = "__all__"
+        # Listed so the declared code fields keep their place in the output.
+        fields = [
+            "id",
+            "title",
+            "description",
+            "status",
+            "created_at",
+            "updated_at",
+            "due_date",
+            "priority",
+            "owner",
+        ]
         read_only_fields = ("created_at", "updated_at", "owner")
+
+    def __init__(self, *args, fields=None, **kwargs):
+        # ``fields`` limits the output to a subset, as for ``?fields=``.
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields).difference(fields):
+                self.fields.pop(name)
+
+
+class TaskStatsSerializer(serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+    priority = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TaskStats
+        fields = ["total", "status", "priority", "overdue"]
+
+    def get_status(self, stats):
+        return {status.code: getattr(stats, f"status_{status.code}") for status in Task.Status}
+
+    def get_priority(self, stats):
+        return {
+            priority.code: getattr(stats, f"priority_{priority.code}")
+            for priority in Task.Priority
+        }
+
+
+class TaskImportSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TaskImport
+        exclude = ("file", "owner")
+        read_only_fields = [
+            field.name for field in TaskImport._meta.fields if field.name != "file"
+        ]
+
+    def get_progress(self, task_import):
+        if task_import.status == "completed":
+            return 100
+        if not task_import.file_size:
+            return 0
+        return min(99, int(task_import.bytes_processed * 100 / task_import.file_size))
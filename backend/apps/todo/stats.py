@@ -0,0 +1,155 @@
+"""
+Maintenance of the per-owner ``TaskStats`` counters.
+
+Every write to tasks describes what it changed as the ``state`` of the
+affected tasks before and after, and calls ``record`` in the same
+transaction; ``record`` applies the difference to the owner's row with one
+UPDATE. Owners without a row get one built from their tasks, the first time
+they write or read their stats.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Q, Value
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+
+from .models import Task, TaskStats
+
+OPEN = ~Q(status=Task.Status.COMPLETED)
+
+
+def status_column(status):
+    return f"status_{Task.Status(status).code}"
+
+
+def priority_column(priority):
+    return f"priority_{Task.Priority(priority).code}"
+
+
+COUNT_COLUMNS = (
+    ["total"]
+    + [status_column(status) for status in Task.Status]
+    + [priority_column(priority) for priority in Task.Priority]
+    + ["overdue"]
+)
+
+
+def state(task):
+    """What the counters depend on in ``task``."""
+    return (task.status, task.priority, task.due_date)
+
+
+def changes(before, after, now):
+    """
+    Column deltas turning the counts of the ``before`` states into those of
+    the ``after`` states, and the earliest due date an ``after`` state will
+    become overdue at.
+    """
+    deltas = Counter()
+    next_overdue = None
+    for sign, states in ((-1, before), (1, after)):
+        for status, priority, due_date in states:
+            deltas["total"] += sign
+            deltas[status_column(status)] += sign
+            deltas[priority_column(priority)] += sign
+            if due_date is None or status == Task.Status.COMPLETED:
+                continue
+            if due_date < now:
+                deltas["overdue"] += sign
+            elif sign > 0 and (next_overdue is None or due_date < next_overdue):
+                next_overdue = due_date
+    return {column: delta for column, delta in deltas.items() if delta}, next_overdue
+
+
+def record(owner_id, before=(), after=(), now=None):
+    """Apply a write that turned ``before`` task states into ``after`` ones."""
+    now = now or timezone.now()
+    deltas, next_overdue = changes(before, after, now)
+    updates = {column: F(column) + delta for column, delta in deltas.items()}
+    if next_overdue is not None:
+        # LEAST() is NULL on SQLite when either side is.
+        updates["overdue_valid_until"] = Coalesce(
+            Least("overdue_valid_until", Value(next_overdue)), Value(next_overdue)
+        )
+    if updates and not TaskStats.objects.filter(owner_id=owner_id).update(**updates):
+        rebuild(owner_id, now)
+
+
+def overdue_counts(now):
+    return {
+        "overdue": Count("pk", filter=OPEN & Q(due_date__lt=now)),
+        "overdue_valid_until": Min("due_date", filter=OPEN & Q(due_date__gte=now)),
+    }
+
+
+def compute(owner_id, now=None):
+    """``TaskStats`` values for ``owner_id`` counted from scratch, in one query."""
+    now = now or timezone.now()
+    counts = {"total": Count("pk")}
+    for status in Task.Status:
+        counts[status_column(status)] = Count("pk", filter=Q(status=status))
+    for priority in Task.Priority:
+        counts[priority_column(priority)] = Count("pk", filter=Q(priority=priority))
+    counts.update(overdue_counts(now))
+    return Task.objects.filter(owner_id=owner_id).aggregate(**counts)
+
+
+def rebuild(owner_id, now=None):
+    with transaction.atomic():
+        # Counted under the row lock, as in refresh_overdue; the row is
+        # created first so that there is one to lock.
+        TaskStats.objects.get_or_create(owner_id=owner_id)
+        stats = TaskStats.objects.select_for_update().get(owner_id=owner_id)
+        for field, value in compute(owner_id, now).items():
+            setattr(stats, field, value)
+        stats.save()
+    return stats
+
+
+def differences(stats, now=None):
+    """
+    ``(field, stored, counted)`` for each field of ``stats`` that disagrees
+    with the owner's tasks. A stale ``overdue`` is not a difference, and an
+    ``overdue_valid_until`` earlier than needed only costs a refresh.
+    """
+    now = now or timezone.now()
+    counted = compute(stats.owner_id, now)
+    fields = list(COUNT_COLUMNS)
+    valid_until = stats.overdue_valid_until
+    if valid_until is not None and valid_until <= now:
+        fields.remove("overdue")
+    elif counted["overdue_valid_until"] is not None and (
+        valid_until is None or valid_until > counted["overdue_valid_until"]
+    ):
+        fields.append("overdue_valid_until")
+    return [
+        (field, getattr(stats, field), counted[field])
+        for field in fields
+        if getattr(stats, field) != counted[field]
+    ]
+
+
+def refresh_overdue(owner_id, now):
+    # The row lock keeps a concurrent write from applying its delta between
+    # the count and the update; one that has not committed yet is not in
+    # the count and applies its delta afterwards.
+    with transaction.atomic():
+        stats = TaskStats.objects.select_for_update().get(owner_id=owner_id)
+        values = Task.objects.filter(owner_id=owner_id).aggregate(**overdue_counts(now))
+        for field, value in values.items():
+            setattr(stats, field, value)
+        stats.save(update_fields=list(values))
+    return stats
+
+
+def owner_stats(owner_id, now=None):
+    """The owner's ``TaskStats``; one primary-key lookup unless a due date passed."""
+    now = now or timezone.now()
+    stats = TaskStats.objects.filter(owner_id=owner_id).first()
+    if stats is None:
+        return rebuild(owner_id, now)
+    if stats.overdue_valid_until is not None and stats.overdue_valid_until <= now:
+        return refresh_overdue(owner_id, now)
+    return stats
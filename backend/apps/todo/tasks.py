@@ -0,0 +1,29 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from .archive import archive_completed
+from .imports import run_import
+from .models import TaskImport
+from .reminders import send_reminders
+
+
+@shared_task
+def import_tasks(import_id):
+    task_import = TaskImport.objects.get(pk=import_id)
+    run_import(task_import)
+
+
+@shared_task
+def archive_completed_tasks():
+    return archive_completed()
+
+
+@shared_task
+def send_task_reminders():
+    # Overlapping ticks would both mail the tasks neither has recorded yet.
+    if not cache.add("todo:reminders:lock", True, timeout=30 * 60):
+        return 0
+    try:
+        return send_reminders()
+    finally:
+        cache.delete("todo:reminders:lock")
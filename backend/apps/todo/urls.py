@@ -1,7 +1,34 @@
 from django.urls import path
-from .views import TaskViewSet
+from django.views.decorators.csrf import csrf_exempt
+from .views import (
+    AsyncTaskView,
+    TaskBulkView,
+    TaskEventsView,
+    TaskExportView,
+    TaskImportView,
+    TaskStatsView,
+    TaskViewSet,
+)
 
 urlpatterns = [
     path("tasks/", TaskViewSet.as_view(), name="tasks"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="tasks_bulk"),
+    path(
+        "tasks/export/<str:export_format>/",
+        TaskExportView.as_view(),
+        name="tasks_export",
+    ),
+    path("tasks/stats/", TaskStatsView.as_view(), name="task_stats"),
+    path("tasks/events/", TaskEventsView.as_view(), name="task_events"),
+    path("tasks/imports/", TaskImportView.as_view(), name="task_imports"),
+    path(
+        "tasks/imports/<int:pk>/", TaskImportView.as_view(), name="task_import_detail"
+    ),
     path("tasks/<int:pk>/", TaskViewSet.as_view(), name="task_detail"),
+    path("async/tasks/", csrf_exempt(AsyncTaskView.as_view()), name="async_tasks"),
+    path(
+        "async/tasks/<int:pk>/",
+        csrf_exempt(AsyncTaskView.as_view()),
+        name="async_task_detail",
+    ),
 ]
@@ -1,15 +1,78 @@
+from asgiref.sync import sync_to_async
 from rest_framework.views import APIView
 from rest_framework import status
 from rest_framework import permissions
 from rest_framework import filters
+from rest_framework import exceptions
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.request import Request
 from rest_framework.response import Response
-from django.db.models import Q
-from .pagination import TaskPagination
-from .models import Task
-from .serializers import TaskSerializer
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views import View
+from apps.users.authentication import LazyUserJWTAuthentication
+from .cache import task_cache
+from .conditional import (
+    detail_etag,
+    list_etag,
+    merge,
+    page_summary,
+    precondition_failed,
+    precondition_response,
+    summarize,
+    summary_rows,
+    validator_headers,
+)
+from .export import ENCODERS, astream_export, stream_export
+from .imports import detect_format
+from .pagination import TaskCursorPagination, TaskPagination, get_task_paginator
+from .renderers import FastJSONRenderer
+from .rows import TASK_FIELDS, row_columns, task_rows, to_records
+from .routers import needs_primary, primary_pinned, replica_aliases, use_primary, wrote
+from .models import ArchivedTask, Task, TaskImport
+from .serializers import TaskImportSerializer, TaskSerializer, TaskStatsSerializer
+from .tasks import import_tasks
+from .filters import filter_tasks, include_archived, requested_fields
+from . import events, stats
 
 
-class TaskViewSet(APIView):
+def select_fields(data, fields):
+    if fields == TASK_FIELDS:
+        return data
+    return {field: data[field] for field in fields}
+
+
+class ReadYourWritesMixin:
+    """
+    Keeps a request's task reads on the primary database when it writes, or
+    when its user wrote recently; other reads go to the replicas.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with use_primary(False):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        # Runs after authentication, so the user is known here. dispatch
+        # resets the flag once the request is done.
+        super().initial(request, *args, **kwargs)
+        if needs_primary(request):
+            primary_pinned.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        wrote(request, response)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class TaskViewSet(ReadYourWritesMixin, APIView):
+    renderer_classes = [FastJSONRenderer, BrowsableAPIRenderer]
     pagination_class = TaskPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["title", "description", "status", "priority"]
@@ -25,83 +88,626 @@ class TaskViewSet(APIView):
     def post(self, request):
         serializer = TaskSerializer(data=request.data)
         if serializer.is_valid():
-            task = serializer.save(owner=request.user)
-            return Response(TaskSerializer(task).data, status=status.HTTP_201_CREATED)
+            with transaction.atomic():
+                task = serializer.save(owner=request.user)
+                stats.record(task.owner_id, after=[stats.state(task)])
+            task_cache.invalidate(task.owner_id)
+            data = TaskSerializer(task).data
+            events.publish(task.owner_id, "created", {"tasks": [data]})
+            return Response(data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def get(self, request, pk=None):
+        fields = requested_fields(request.query_params)
         if pk:
+            cache_key = task_cache.detail_key(pk)
+            data = task_cache.get(cache_key)
+            if data is not None:
+                updated_at = parse_datetime(data["updated_at"])
+            else:
+                try:
+                    task = Task.objects.only(*fields, "updated_at").get(pk=pk)
+                except Task.DoesNotExist:
+                    return Response(
+                        {"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND
+                    )
+                updated_at = task.updated_at
+
+            etag = detail_etag(pk, updated_at, fields)
+            response = precondition_response(request, etag, updated_at)
+            if response is not None:
+                return response
+            if data is None:
+                data = TaskSerializer(task, fields=fields).data
+                # Every reader shares the entry, and a replica may not have
+                # the write that last cleared it yet: only the primary fills it.
+                if fields == TASK_FIELDS and task._state.db == DEFAULT_DB_ALIAS:
+                    task_cache.set(cache_key, data)
+            return Response(
+                select_fields(data, fields), headers=validator_headers(etag, updated_at)
+            )
+
+        if request.user.is_authenticated:
+            owner_id = request.user.pk
+            tasks = Task.objects.filter(owner=request.user)
+            archived = ArchivedTask.objects.filter(owner=request.user)
+        else:
+            owner_id = None
+            tasks = Task.objects.all()
+            archived = ArchivedTask.objects.all()
+        with_archived = include_archived(request.query_params)
+        cache_key = task_cache.list_key(request, owner_id)
+        cached = task_cache.get(cache_key)
+        if cached is not None:
+            etag, data = cached
+            return precondition_response(request, etag) or Response(
+                data, headers=validator_headers(etag)
+            )
+
+        # Search ranks only exist for Task rows, so both tables keep the
+        # default ordering when they are combined.
+        tasks = filter_tasks(tasks, request.GET, rank=not with_archived)
+        paginator = get_task_paginator(request)
+        # Rows and a compiled encoder instead of TaskSerializer(many=True);
+        # the output is the same.
+        columns = row_columns(fields)
+        if with_archived:
+            archived = filter_tasks(archived, request.GET, rank=False)
+            paginator.extra_querysets = [task_rows(archived, columns)]
+        if isinstance(paginator, TaskCursorPagination):
+            # Validated by its own rows; a summary would count every task.
+            page = paginator.paginate_queryset(task_rows(tasks, columns), request, view=self)
+            summary = page_summary(paginator, page)
+        else:
+            page = None
+            summary = summarize(summary_rows(tasks).first())
+            if with_archived:
+                summary = merge(summary, summarize(summary_rows(archived).first()))
+        etag = list_etag(request, owner_id, paginator, summary)
+        response = precondition_response(request, etag)
+        if response is not None:
+            return response
+
+        if page is None:
+            paginator.known_count = summary["count"]
+            page = paginator.paginate_queryset(task_rows(tasks, columns), request, view=self)
+
+        data = paginator.get_paginated_response(to_records(page, fields, columns)).data
+        task_cache.set(cache_key, (etag, data))
+        return Response(data, headers=validator_headers(etag))
+
+    def patch(self, request, pk=None):
+        fields = requested_fields(request.query_params)
+        serializer = TaskSerializer(data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        task, changed = update_task(
+            pk, request.user, serializer.validated_data, write_precondition(request, fields)
+        )
+        data = TaskSerializer(task).data
+        if changed:
+            task_cache.invalidate(task.owner_id, task.pk)
+            events.publish(task.owner_id, "updated", {"tasks": [data]})
+        etag = detail_etag(pk, task.updated_at, fields)
+        return Response(
+            select_fields(data, fields), headers=validator_headers(etag, task.updated_at)
+        )
+
+    def delete(self, request, pk=None):
+        with transaction.atomic():
             try:
-                task = Task.objects.get(pk=pk)
+                task = Task.objects.select_for_update().get(pk=pk, owner=request.user)
             except Task.DoesNotExist:
                 return Response(
                     {"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND
                 )
-            serializer = TaskSerializer(task)
-            return Response(serializer.data)
+            task.delete()
+            stats.record(task.owner_id, before=[stats.state(task)])
+        task_cache.invalidate(task.owner_id, pk)
+        events.publish(task.owner_id, "deleted", {"ids": [pk]})
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+# Writes of AsyncTaskView; the async ORM has no transactions, so these run
+# in a worker thread to update the task and its owner's stats atomically.
+
+
+@transaction.atomic
+def create_task(data, owner):
+    task = Task.objects.create(**data, owner=owner)
+    stats.record(task.owner_id, after=[stats.state(task)])
+    return task
+
+
+class PreconditionFailed(exceptions.APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The task has changed since it was read."
+    default_code = "precondition_failed"
+
+
+def write_precondition(request, fields):
+    """Whether ``request``'s conditional headers rule out editing a task."""
+
+    def failed(task):
+        etag = detail_etag(task.pk, task.updated_at, fields)
+        return precondition_failed(request, etag, task.updated_at)
+
+    return failed
+
+
+@transaction.atomic
+def update_task(pk, owner, data, failed=None):
+    """
+    Apply the validated ``data`` to ``owner``'s task ``pk``, unless
+    ``failed(task)`` vetoes it. Returns the task and the fields that changed,
+    the only ones written.
+    """
+    # Locked so that the precondition holds until the write, and concurrent
+    # edits apply their stats deltas one after the other.
+    task = Task.objects.select_for_update().filter(pk=pk, owner=owner).first()
+    if task is None:
+        if Task.objects.filter(pk=pk).exists():
+            raise exceptions.PermissionDenied("You do not have permission to edit this task.")
+        raise exceptions.NotFound("Task not found.")
+    if failed is not None and failed(task):
+        raise PreconditionFailed()
+    changed = [field for field, value in data.items() if getattr(task, field) != value]
+    if changed:
+        before = stats.state(task)
+        for field in changed:
+            setattr(task, field, data[field])
+        task.save(update_fields=[*changed, "updated_at"])
+        stats.record(task.owner_id, [before], [stats.state(task)])
+    return task, changed
+
+
+@transaction.atomic
+def delete_task(pk, owner):
+    task = Task.objects.select_for_update().filter(pk=pk, owner=owner).first()
+    if task is not None:
+        task.delete()
+        stats.record(task.owner_id, before=[stats.state(task)])
+    return task
+
+
+class AsyncTaskView(View):
+    """
+    Native async counterpart of ``TaskViewSet`` for ASGI deployments.
+
+    Handlers run on the event loop and reach the database through the async
+    ORM, so a request does not tie up a worker thread while it waits on a
+    query. Permissions, pagination, caching and the JSON output are the same
+    as ``TaskViewSet``; deleting also requires authentication here.
+    """
+
+    authentication = LazyUserJWTAuthentication()
+    renderer = FastJSONRenderer()
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, parsers=[JSONParser()])
+        try:
+            auth = await self.authentication.aauthenticate(request._request)
+            request.user = auth[0] if auth else AnonymousUser()
+            if request.method in ("POST", "PATCH", "DELETE") and not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            if not replica_aliases():
+                return await super().dispatch(request, *args, **kwargs)
+            with use_primary(await sync_to_async(needs_primary)(request)):
+                response = await super().dispatch(request, *args, **kwargs)
+            await sync_to_async(wrote)(request, response)
+            return response
+        except exceptions.APIException as exc:
+            return self.handle_exception(request, exc)
+
+    def handle_exception(self, request, exc):
+        # Mirrors rest_framework.views.exception_handler.
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            headers["WWW-Authenticate"] = self.authentication.authenticate_header(request)
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        return self.render(data, exc.status_code, headers)
+
+    def render(self, data, status_code=status.HTTP_200_OK, headers=None):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status_code,
+            content_type="application/json",
+            headers=headers,
+        )
+
+    async def post(self, request, pk=None):
+        serializer = TaskSerializer(data=request.data)
+        if not serializer.is_valid():
+            return self.render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        task = await sync_to_async(create_task)(serializer.validated_data, request.user)
+        await sync_to_async(task_cache.invalidate)(task.owner_id)
+        data = TaskSerializer(task).data
+        await sync_to_async(events.publish)(task.owner_id, "created", {"tasks": [data]})
+        return self.render(data, status.HTTP_201_CREATED)
+
+    async def get(self, request, pk=None):
+        fields = requested_fields(request.query_params)
+        if pk:
+            cache_key = await sync_to_async(task_cache.detail_key)(pk)
+            data = await sync_to_async(task_cache.get)(cache_key)
+            if data is not None:
+                updated_at = parse_datetime(data["updated_at"])
+            else:
+                try:
+                    task = await Task.objects.only(*fields, "updated_at").aget(pk=pk)
+                except Task.DoesNotExist:
+                    return self.render({"detail": "Task not found."}, status.HTTP_404_NOT_FOUND)
+                updated_at = task.updated_at
+
+            etag = detail_etag(pk, updated_at, fields)
+            response = precondition_response(request, etag, updated_at)
+            if response is not None:
+                return response
+            if data is None:
+                data = TaskSerializer(task, fields=fields).data
+                if fields == TASK_FIELDS and task._state.db == DEFAULT_DB_ALIAS:
+                    await sync_to_async(task_cache.set)(cache_key, data)
+            return self.render(
+                select_fields(data, fields), headers=validator_headers(etag, updated_at)
+            )
 
         if request.user.is_authenticated:
+            owner_id = request.user.pk
             tasks = Task.objects.filter(owner=request.user)
+            archived = ArchivedTask.objects.filter(owner=request.user)
         else:
+            owner_id = None
             tasks = Task.objects.all()
+            archived = ArchivedTask.objects.all()
+        with_archived = include_archived(request.query_params)
+        cache_key = await sync_to_async(task_cache.list_key)(request, owner_id)
+        cached = await sync_to_async(task_cache.get)(cache_key)
+        if cached is not None:
+            etag, data = cached
+            return precondition_response(request, etag) or self.render(
+                data, headers=validator_headers(etag)
+            )
 
-        search_query = request.GET.get("search")
-        if search_query:
-            tasks = tasks.filter(
-                Q(title__icontains=search_query)
-                | Q(description__icontains=search_query)
-                | Q(status__icontains=search_query)
+        tasks = filter_tasks(tasks, request.GET, rank=not with_archived)
+        paginator = get_task_paginator(request)
+        columns = row_columns(fields)
+        if with_archived:
+            archived = filter_tasks(archived, request.GET, rank=False)
+            paginator.extra_querysets = [task_rows(archived, columns)]
+        if isinstance(paginator, TaskCursorPagination):
+            page = await paginator.apaginate_queryset(
+                task_rows(tasks, columns), request, view=self
             )
+            summary = page_summary(paginator, page)
+        else:
+            page = None
+            summary = summarize(await summary_rows(tasks).afirst())
+            if with_archived:
+                summary = merge(summary, summarize(await summary_rows(archived).afirst()))
+        etag = list_etag(request, owner_id, paginator, summary)
+        response = precondition_response(request, etag)
+        if response is not None:
+            return response
+
+        if page is None:
+            paginator.known_count = summary["count"]
+            page = await paginator.apaginate_queryset(
+                task_rows(tasks, columns), request, view=self
+            )
+
+        data = paginator.get_paginated_response(to_records(page, fields, columns)).data
+        await sync_to_async(task_cache.set)(cache_key, (etag, data))
+        return self.render(data, headers=validator_headers(etag))
 
-        status_filter = request.GET.get("status")
-        if status_filter:
-            tasks = tasks.filter(status=status_filter)
+    async def patch(self, request, pk=None):
+        fields = requested_fields(request.query_params)
+        serializer = TaskSerializer(data=request.data, partial=True)
+        if not serializer.is_valid():
+            return self.render(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        task, changed = await sync_to_async(update_task)(
+            pk, request.user, serializer.validated_data, write_precondition(request, fields)
+        )
+        data = TaskSerializer(task).data
+        if changed:
+            await sync_to_async(task_cache.invalidate)(task.owner_id, task.pk)
+            await sync_to_async(events.publish)(task.owner_id, "updated", {"tasks": [data]})
+        etag = detail_etag(pk, task.updated_at, fields)
+        return self.render(
+            select_fields(data, fields), headers=validator_headers(etag, task.updated_at)
+        )
 
-        priority_filter = request.GET.get("priority")
-        if priority_filter:
-            tasks = tasks.filter(priority=priority_filter)
+    async def delete(self, request, pk=None):
+        task = await sync_to_async(delete_task)(pk, request.user)
+        if task is None:
+            return self.render({"detail": "Task not found."}, status.HTTP_404_NOT_FOUND)
+        await sync_to_async(task_cache.invalidate)(task.owner_id, pk)
+        await sync_to_async(events.publish)(task.owner_id, "deleted", {"ids": [pk]})
+        return self.render(None, status.HTTP_204_NO_CONTENT)
 
-        ordering = request.GET.get("ordering")
-        allowed_ordering_fields = ["created_at", "due_date", "priority"]
-        if ordering:
-            order_field = ordering.lstrip("-")
-            if order_field in allowed_ordering_fields:
-                tasks = tasks.order_by(ordering)
+
+def is_task_id(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class TaskBulkView(ReadYourWritesMixin, APIView):
+    """
+    Batch create, update and delete for the authenticated user's tasks.
+
+    Each request takes a JSON array and touches the database a constant
+    number of times regardless of its size. Items are validated one by one:
+    valid ones are applied, invalid ones come back under ``errors`` with
+    their index, and the status is 207 when only part of the batch applied.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_items(self, request):
+        items = request.data
+        if isinstance(items, dict) and "ids" in items:
+            items = items["ids"]
+        if not isinstance(items, list) or not items:
+            return None, Response(
+                {"detail": "Expected a non-empty list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        max_items = getattr(settings, "TASK_BULK_MAX_ITEMS", 1000)
+        if len(items) > max_items:
+            return None, Response(
+                {"detail": f"A batch can hold at most {max_items} items."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return items, None
+
+    def bulk_response(self, results, errors, success_status=status.HTTP_200_OK):
+        if not errors:
+            response_status = success_status
+        elif results:
+            response_status = status.HTTP_207_MULTI_STATUS
         else:
-            tasks = tasks.order_by("-created_at")
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({"results": results, "errors": errors}, status=response_status)
+
+    def post(self, request):
+        items, error_response = self.get_items(request)
+        if error_response:
+            return error_response
 
-        paginator = self.pagination_class()
-        page = paginator.paginate_queryset(tasks, request, view=self)
+        tasks, errors = [], []
+        for index, item in enumerate(items):
+            serializer = TaskSerializer(data=item)
+            if serializer.is_valid():
+                tasks.append(Task(**serializer.validated_data, owner=request.user))
+            else:
+                errors.append({"index": index, "errors": serializer.errors})
 
-        serializer = TaskSerializer(page, many=True)
-        return paginator.get_paginated_response(serializer.data)
+        if tasks:
+            with transaction.atomic():
+                Task.objects.bulk_create(tasks)
+                stats.record(request.user.pk, after=[stats.state(task) for task in tasks])
+            task_cache.invalidate(request.user.pk)
+        results = TaskSerializer(tasks, many=True).data
+        if results:
+            events.publish(request.user.pk, "created", {"tasks": results})
+        return self.bulk_response(results, errors, status.HTTP_201_CREATED)
 
-    def patch(self, request, pk=None):
+    def patch(self, request):
+        items, error_response = self.get_items(request)
+        if error_response:
+            return error_response
+
+        ids = [item.get("id") for item in items if isinstance(item, dict)]
+        ids = [pk for pk in ids if is_task_id(pk)]
+        with transaction.atomic():
+            owned = (
+                Task.objects.select_for_update()
+                .filter(owner=request.user, pk__in=ids)
+                .in_bulk()
+            )
+            tasks, before, fields, errors, seen = [], [], set(), [], set()
+            for index, item in enumerate(items):
+                pk = item.get("id") if isinstance(item, dict) else None
+                task = owned.get(pk) if is_task_id(pk) else None
+                if task is None or pk in seen:
+                    detail = "Task not found." if task is None else "Duplicate task id."
+                    errors.append({"index": index, "id": pk, "errors": {"detail": detail}})
+                    continue
+                seen.add(pk)
+
+                serializer = TaskSerializer(task, data=item, partial=True)
+                if not serializer.is_valid():
+                    errors.append({"index": index, "id": pk, "errors": serializer.errors})
+                    continue
+                before.append(stats.state(task))
+                for field, value in serializer.validated_data.items():
+                    setattr(task, field, value)
+                    fields.add(field)
+                tasks.append(task)
+
+            if tasks:
+                # bulk_update() skips auto_now, so stamp it like save() would.
+                now = timezone.now()
+                for task in tasks:
+                    task.updated_at = now
+                Task.objects.bulk_update(tasks, sorted(fields | {"updated_at"}))
+                stats.record(request.user.pk, before, [stats.state(task) for task in tasks])
+        if tasks:
+            task_cache.invalidate(request.user.pk, *(task.pk for task in tasks))
+        results = TaskSerializer(tasks, many=True).data
+        if results:
+            events.publish(request.user.pk, "updated", {"tasks": results})
+        return self.bulk_response(results, errors)
+
+    def delete(self, request):
+        ids, error_response = self.get_items(request)
+        if error_response:
+            return error_response
+
+        owned = Task.objects.select_for_update().filter(
+            owner=request.user, pk__in=[pk for pk in ids if is_task_id(pk)]
+        )
+        with transaction.atomic():
+            rows = owned.values_list("pk", "status", "priority", "due_date")
+            found = {pk: state for pk, *state in rows}
+            if found:
+                Task.objects.filter(pk__in=found).delete()
+                stats.record(request.user.pk, before=found.values())
+        if found:
+            task_cache.invalidate(request.user.pk, *found)
+            events.publish(request.user.pk, "deleted", {"ids": sorted(found)})
+
+        errors = [
+            {"index": index, "id": pk, "errors": {"detail": "Task not found."}}
+            for index, pk in enumerate(ids)
+            if not is_task_id(pk) or pk not in found
+        ]
+        return self.bulk_response(sorted(found), errors)
+
+
+class TaskEventsView(View):
+    """
+    Server-Sent Events stream of the user's task changes, see
+    ``apps.todo.events``; clients apply them instead of polling the list.
+
+    EventSource cannot set headers, so the access token may also be passed
+    as ``?token=``. The stream ends when the token expires. It needs the
+    ASGI application: under WSGI an open stream holds a worker thread.
+    """
+
+    authentication = LazyUserJWTAuthentication()
+    renderer = FastJSONRenderer()
+    http_method_names = ["get"]
+
+    async def authenticate(self, request):
+        raw_token = request.GET.get("token")
+        if raw_token is None:
+            auth = await self.authentication.aauthenticate(request)
+            if auth is None:
+                raise exceptions.NotAuthenticated()
+            return auth
+        validated_token = self.authentication.get_validated_token(raw_token.encode())
+        return await self.authentication.aget_user(validated_token), validated_token
+
+    async def get(self, request):
         try:
-            task = Task.objects.get(pk=pk)
-            if task.owner != request.user:
-                return Response(
-                    {"detail": "You do not have permission to edit this task."},
-                    status=status.HTTP_403_FORBIDDEN,
-                )
-        except Task.DoesNotExist:
+            user, token = await self.authenticate(request)
+        except exceptions.APIException as exc:
+            return HttpResponse(
+                self.renderer.render({"detail": exc.detail}),
+                status=exc.status_code,
+                content_type="application/json",
+                headers={"WWW-Authenticate": self.authentication.authenticate_header(request)},
+            )
+        response = StreamingHttpResponse(
+            events.stream(user.pk, token.get("exp")), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Keeps nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class TaskStatsView(APIView):
+    """
+    Counts of the user's tasks by status and priority, and of overdue ones
+    (due and not completed), read from their ``TaskStats`` row.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(TaskStatsSerializer(stats.owner_stats(request.user.pk)).data)
+
+
+class FirstRendererNegotiation(BaseContentNegotiation):
+    # Exports pick their format from the URL; errors still render as JSON
+    # whatever the client put in Accept.
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class TaskExportView(APIView):
+    """
+    Stream the user's tasks as NDJSON or CSV, filtered like the task list.
+
+    Rows are read in chunks straight from ``values_list()``, so memory use
+    does not grow with the number of tasks. Under ASGI the body is an async
+    generator over the async ORM instead of a sync iterator.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    content_negotiation_class = FirstRendererNegotiation
+
+    def get(self, request, export_format):
+        encoder_class = ENCODERS.get(export_format)
+        if encoder_class is None:
             return Response(
-                {"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND
+                {"detail": "Unsupported export format."},
+                status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = TaskSerializer(task, data=request.data, partial=True)
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        tasks = filter_tasks(Task.objects.filter(owner=request.user), request.GET)
+        encoder = encoder_class()
+        if isinstance(request._request, ASGIRequest):
+            content = astream_export(tasks, encoder)
+        else:
+            content = stream_export(tasks, encoder)
 
-    def delete(self, request, pk=None):
-        try:
-            task = Task.objects.get(pk=pk, owner=request.user)
-        except Task.DoesNotExist:
+        response = StreamingHttpResponse(content, content_type=encoder.content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{encoder.extension}"'
+        )
+        return response
+
+
+class TaskImportView(APIView):
+    """
+    Upload a CSV or NDJSON file of tasks and follow the import's progress.
+
+    The file is parsed and inserted by the ``import_tasks`` Celery task; the
+    upload returns 202 right away with the import to poll.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": ["No file was submitted."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        import_format = detect_format(upload.name)
+        if import_format is None:
             return Response(
-                {"detail": "Task not found."}, status=status.HTTP_404_NOT_FOUND
+                {"file": ["Upload a .csv, .ndjson or .jsonl file."]},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
-        task.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        task_import = TaskImport.objects.create(
+            owner=request.user,
+            file=upload,
+            format=import_format,
+            file_size=upload.size,
+        )
+        transaction.on_commit(lambda: import_tasks.delay(task_import.pk))
+        return Response(
+            TaskImportSerializer(task_import).data, status=status.HTTP_202_ACCEPTED
+        )
+
+    def get(self, request, pk=None):
+        if pk is None:
+            imports = TaskImport.objects.filter(owner=request.user).order_by("-created_at")
+            return Response(TaskImportSerializer(imports[:20], many=True).data)
+        try:
+            task_import = TaskImport.objects.get(pk=pk, owner=request.user)
+        except TaskImport.DoesNotExist:
+            return Response(
+                {"detail": "Import not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(TaskImportSerializer(task_import).data)
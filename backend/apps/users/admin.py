@@ -1,3 +1,60 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
 
-# Register your models here.
+from .deletion import request_deletion
+from .models import AccountDeletion
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class AccountUserAdmin(UserAdmin):
+    """
+    Deleting a user deactivates them and leaves the rest to the
+    ``delete_account`` Celery task, instead of cascading in the request.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        # The default summary collects every row that would cascade.
+        opts = self.model._meta
+        deleted = [f"{opts.verbose_name.capitalize()}: {obj}" for obj in objs]
+        perms_needed = set() if self.has_delete_permission(request) else {opts.verbose_name}
+        return deleted, {opts.verbose_name_plural: len(deleted)}, perms_needed, []
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, [obj])
+
+    def delete_queryset(self, request, queryset):
+        for user in queryset:
+            request_deletion(user)
+        self.message_user(
+            request,
+            "Deactivated; the account data is being deleted in the background.",
+            messages.INFO,
+        )
+
+
+@admin.register(AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    list_display = [
+        "username",
+        "user_id",
+        "status",
+        "progress",
+        "deleted_rows",
+        "total_rows",
+        "created_at",
+        "finished_at",
+    ]
+    list_filter = ["status"]
+    search_fields = ["username"]
+    readonly_fields = [field.name for field in AccountDeletion._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.display(description="Progress (%)")
+    def progress(self, deletion):
+        return deletion.progress
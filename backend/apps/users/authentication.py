@@ -0,0 +1,183 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .models import LazyUser
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` for async views.
+
+    Token parsing and validation are CPU-only and reused as they are; the
+    user is loaded with ``aget`` so authenticating never blocks the event
+    loop.
+    """
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = await self.user_model.objects.aget(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+
+class UserStateCache:
+    """
+    Per-process cache of the ``(pk, is_active, password hash)`` of users.
+
+    Entries expire after ``JWT_USER_STATE_TIMEOUT`` seconds and are dropped
+    as soon as the user is saved or deleted in this process, so other
+    workers see a deactivation or password change within the timeout.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def timeout(self):
+        return getattr(settings, "JWT_USER_STATE_TIMEOUT", 30)
+
+    @property
+    def max_size(self):
+        return getattr(settings, "JWT_USER_STATE_MAX_SIZE", 10000)
+
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(str(user_id))
+            if entry is None:
+                return None
+            stored_at, state = entry
+            if time.monotonic() - stored_at >= self.timeout:
+                del self.entries[str(user_id)]
+                return None
+            return state
+
+    def set(self, user_id, row):
+        pk, is_active, password = row
+        state = (pk, is_active, get_md5_hash_password(password))
+        with self.lock:
+            # Claims may carry the id as a string, signals as an int.
+            self.entries[str(user_id)] = (time.monotonic(), state)
+            self.entries.move_to_end(str(user_id))
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return state
+
+    def discard(self, user_id):
+        with self.lock:
+            self.entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_states = UserStateCache()
+
+
+class LazyUserJWTAuthentication(AsyncJWTAuthentication):
+    """
+    JWT authentication that does not load the user on every request.
+
+    The user comes back as a ``LazyUser`` holding only ``id`` and
+    ``is_active``, which is all ``owner=request.user`` needs; any other field
+    is fetched on first access. The active flag and the revocation check
+    rely on ``user_states``, so a given user costs one small query per
+    worker per ``JWT_USER_STATE_TIMEOUT`` instead of one per request.
+    """
+
+    state_fields = ("pk", "is_active", "password")
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+    def state_queryset(self, user_id):
+        return self.user_model.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list(*self.state_fields)
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        state = user_states.get(user_id)
+        if state is None:
+            state = self.store_state(user_id, self.state_queryset(user_id).first())
+        return self.build_user(validated_token, state)
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        state = user_states.get(user_id)
+        if state is None:
+            row = await self.state_queryset(user_id).afirst()
+            state = self.store_state(user_id, row)
+        return self.build_user(validated_token, state)
+
+    def store_state(self, user_id, row):
+        if row is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user_states.set(user_id, row)
+
+    def build_user(self, validated_token, state):
+        pk, is_active, password_hash = state
+        if api_settings.CHECK_USER_IS_ACTIVE and not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_hash:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return LazyUser.from_db(
+            router.db_for_read(LazyUser), ["id", "is_active"], [pk, is_active]
+        )
@@ -0,0 +1,122 @@
+"""
+Deleting user accounts without Django's cascade collector.
+
+``User.delete()`` deletes everything that cascades from the user in one
+transaction: for an account with hundreds of thousands of tasks that
+locks the database for every other worker for seconds, and any related
+model with signals or dependents of its own gets loaded into memory whole.
+``request_deletion`` instead deactivates the user at once, which stops
+their tokens and sessions working, and hands the rest to the
+``delete_account`` Celery task. ``run_deletion`` empties the tables that
+cascade from the user in batches of ``ACCOUNT_DELETION_BATCH_SIZE`` rows,
+one short statement each, recording progress on the ``AccountDeletion`` as
+it goes; the user row goes last, when nothing is left to cascade. What the
+rows leave outside the database goes with them: cached tasks, and the
+files of uploads. A run can stop anywhere and be started again.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.todo import events
+from apps.todo.cache import task_cache
+from apps.todo.models import Task
+
+from .models import AccountDeletion
+
+
+def owned_rows(user_id):
+    """Querysets of the rows deleting user ``user_id`` would cascade to."""
+    for relation in User._meta.related_objects:
+        if relation.on_delete is models.CASCADE and not relation.many_to_many:
+            yield relation.related_model._base_manager.filter(
+                **{relation.field.attname: user_id}
+            )
+
+
+def request_deletion(user):
+    """Deactivate ``user`` and schedule the deletion of their account."""
+    from .tasks import delete_account
+
+    with transaction.atomic():
+        deletion = (
+            AccountDeletion.objects.filter(user_id=user.pk)
+            .exclude(status__in=["completed", "failed"])
+            .first()
+        )
+        if deletion is not None:
+            return deletion
+        user.is_active = False
+        user.save(update_fields=["is_active"])
+        deletion = AccountDeletion.objects.create(user_id=user.pk, username=user.username)
+    transaction.on_commit(lambda: delete_account.delay(deletion.pk))
+    return deletion
+
+
+def delete_batch(rows, size):
+    """Delete up to ``size`` of ``rows``; returns how many rows went."""
+    batch = rows.model._base_manager.filter(pk__in=rows.values("pk")[:size])
+    # When nothing cascades from these rows, as for tasks, this is a single
+    # DELETE ... WHERE id IN (SELECT ... LIMIT) that loads no instances;
+    # otherwise the collector only ever holds one batch.
+    deleted, _ = batch.delete()
+    return deleted
+
+
+def file_fields(model):
+    return [field for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+
+
+def delete_owned_batch(user_id, rows, size):
+    """
+    ``delete_batch`` for rows of user ``user_id`` that leave something behind
+    outside the database: tasks in the task cache, files in storage.
+    """
+    files = file_fields(rows.model)
+    if rows.model is not Task and not files:
+        return delete_batch(rows, size)
+    batch = list(rows.values_list("pk", *(field.attname for field in files))[:size])
+    pks = [row[0] for row in batch]
+    deleted = delete_batch(rows.filter(pk__in=pks), size)
+    if rows.model is Task:
+        task_cache.invalidate(user_id, *pks)
+    for row in batch:
+        for field, name in zip(files, row[1:]):
+            if name:
+                field.storage.delete(name)
+    return deleted
+
+
+def run_deletion(deletion):
+    """Delete the account of ``deletion`` in bounded batches."""
+    size = getattr(settings, "ACCOUNT_DELETION_BATCH_SIZE", 1000)
+    querysets = list(owned_rows(deletion.user_id))
+    total = sum(rows.count() for rows in querysets)
+    AccountDeletion.objects.filter(pk=deletion.pk).update(
+        status="running", total_rows=F("deleted_rows") + total
+    )
+    try:
+        for rows in querysets:
+            deleted = size
+            while deleted == size:
+                deleted = delete_owned_batch(deletion.user_id, rows, size)
+                if deleted:
+                    AccountDeletion.objects.filter(pk=deletion.pk).update(
+                        deleted_rows=F("deleted_rows") + deleted
+                    )
+        # Drops the archived tasks and stats from the owner's cached pages
+        # too; the tasks' own entries went with their batches.
+        task_cache.invalidate(deletion.user_id)
+        events.publish(deletion.user_id, "refresh", {})
+        User.objects.filter(pk=deletion.user_id).delete()
+    except Exception as exc:
+        AccountDeletion.objects.filter(pk=deletion.pk).update(
+            status="failed", error=str(exc), finished_at=timezone.now()
+        )
+        raise
+    AccountDeletion.objects.filter(pk=deletion.pk).update(
+        status="completed", finished_at=timezone.now()
+    )
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2 hasher with the work factor read from
+    ``PASSWORD_PBKDF2_ITERATIONS``.
+
+    The algorithm name is unchanged, so existing hashes keep verifying, and
+    ``User.check_password`` rehashes them on the next successful login
+    whenever the configured iteration count differs from the stored one.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(
+            settings,
+            "PASSWORD_PBKDF2_ITERATIONS",
+            hashers.PBKDF2PasswordHasher.iterations,
+        )
@@ -0,0 +1,63 @@
+from django.db import IntegrityError, migrations
+from django.db.models import Count, Value
+from django.db.models.functions import Lower, NullIf
+
+# How many clashing addresses to list when refusing to migrate.
+SHOWN_DUPLICATES = 20
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Refuse to build the index over emails that differ only by case, naming
+    the accounts to fix, rather than failing on the bare CREATE INDEX.
+    """
+    User = apps.get_model("auth", "User")
+    users = User.objects.using(schema_editor.connection.alias).annotate(
+        normalized_email=NullIf(Lower("email"), Value(""))
+    )
+    duplicates = list(
+        users.filter(normalized_email__isnull=False)
+        .values("normalized_email")
+        .annotate(accounts=Count("pk"))
+        .filter(accounts__gt=1)
+        .order_by("normalized_email")
+        .values_list("normalized_email", flat=True)[: SHOWN_DUPLICATES + 1]
+    )
+    if not duplicates:
+        return
+    lines = []
+    for email in duplicates[:SHOWN_DUPLICATES]:
+        accounts = users.filter(normalized_email=email).order_by("pk")
+        names = ", ".join(f"{user.pk} ({user.username})" for user in accounts)
+        lines.append(f"  {email}: users {names}")
+    if len(duplicates) > SHOWN_DUPLICATES:
+        lines.append("  ...")
+    raise IntegrityError(
+        "Cannot make auth_user.email unique ignoring case: these addresses are "
+        "used by several accounts. Change or clear the email of all but one "
+        "account for each, then run migrate again.\n" + "\n".join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+    """
+    Case-insensitive unique index on auth_user.email.
+
+    auth.User belongs to django.contrib.auth, so the index is created with
+    raw SQL; the expression must stay in sync with ``NormalizedEmail``.
+    """
+
+    dependencies = [
+        ("users", "0001_lazyuser"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX auth_user_email_ci_uniq "
+                "ON auth_user (NULLIF(LOWER(email), ''))"
+            ),
+            reverse_sql="DROP INDEX auth_user_email_ci_uniq",
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import EmailField, Func
+
+
+class LazyUser(User):
+    """
+    A user built from a token's claims without touching the database.
+
+    Only ``id`` and ``is_active`` are set; the first access to any other
+    field loads all of them in one query.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.issuperset(fields):
+            fields = deferred
+        super().refresh_from_db(using, fields, from_queryset)
+
+
+class NormalizedEmail(Func):
+    # Spelled exactly like the auth_user_email_ci_uniq index expression so
+    # the database can answer lookups from it; blank emails become NULL
+    # and stay out of the uniqueness check.
+    template = "NULLIF(LOWER(%(expressions)s), '')"
+    output_field = EmailField()
+
+
+def users_by_email(email):
+    """Users whose email matches ``email`` case-insensitively, via the unique index."""
+    return User.objects.annotate(normalized_email=NormalizedEmail("email")).filter(
+        normalized_email=email.strip().lower()
+    )
+
+
+class AccountDeletion(models.Model):
+    """
+    The deletion of a user's account by ``apps.users.deletion``, and its
+    progress. ``user_id`` is a plain column rather than a foreign key so that
+    the record outlives the user.
+    """
+
+    user_id = models.IntegerField(db_index=True)
+    username = models.CharField(max_length=150)
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ("pending", "Pending"),
+            ("running", "Running"),
+            ("completed", "Completed"),
+            ("failed", "Failed"),
+        ],
+        default="pending",
+    )
+    total_rows = models.PositiveBigIntegerField(default=0)
+    deleted_rows = models.PositiveBigIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def progress(self):
+        if self.status == "completed":
+            return 100
+        if not self.total_rows:
+            return 0
+        return min(99, self.deleted_rows * 100 // self.total_rows)
@@ -1,28 +1,50 @@
 from rest_framework import serializers
-from rest_framework.validators import UniqueValidator
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 import re
+from .models import NormalizedEmail, users_by_email
+from .tasks import send_welcome_email
+
+UNIQUE_MESSAGES = {
+    "username": "Username already exists",
+    "email": "Email already exists",
+}
 
 
 class RegisterSerializer(serializers.Serializer):
-    username = serializers.CharField(
-        max_length=255,
-        validators=[
-            UniqueValidator(
-                queryset=User.objects.all(), message="Username already exists"
-            )
-        ],
-    )
-    email = serializers.EmailField(
-        validators=[
-            UniqueValidator(queryset=User.objects.all(), message="Email already exists")
-        ],
-    )
+    username = serializers.CharField(max_length=255)
+    email = serializers.EmailField()
     password1 = serializers.CharField(write_only=True, max_length=255)
     password2 = serializers.CharField(write_only=True, max_length=255)
 
+    def find_conflicts(self, username, email):
+        """Fields already taken, found with one query over both unique indexes."""
+        email = email.strip().lower()
+        taken = (
+            User.objects.annotate(normalized_email=NormalizedEmail("email"))
+            .filter(Q(username=username) | Q(normalized_email=email))
+            .values_list("username", "normalized_email")
+        )
+        conflicts = set()
+        for taken_username, taken_email in taken:
+            if taken_username == username:
+                conflicts.add("username")
+            if taken_email == email:
+                conflicts.add("email")
+        return conflicts
+
+    def unique_error(self, conflicts):
+        return serializers.ValidationError(
+            {field: [UNIQUE_MESSAGES[field]] for field in sorted(conflicts)}
+        )
+
     def validate(self, data):
+        conflicts = self.find_conflicts(data["username"], data["email"])
+        if conflicts:
+            raise self.unique_error(conflicts)
+
         password1 = data.get("password1")
         password2 = data.get("password2")
 
@@ -41,9 +63,18 @@ class RegisterSerializer(serializers.Serializer):
         email = validated_data.get("email")
         password = validated_data.get("password1")
 
-        user = User.objects.create_user(
-            username=username, email=email, password=password
-        )
+        # The unique indexes settle races between concurrent registrations
+        # that both passed validate().
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=username, email=email, password=password
+                )
+        except IntegrityError:
+            raise self.unique_error(
+                self.find_conflicts(username, email) or set(UNIQUE_MESSAGES)
+            )
+        transaction.on_commit(lambda: send_welcome_email.delay(user.pk))
         return user
 
 
@@ -56,7 +87,7 @@ class LoginSerializer(serializers.Serializer):
         password = data.get("password")
 
         try:
-            user = User.objects.get(email=email)
+            user = users_by_email(email).get()
         except User.DoesNotExist:
             raise serializers.ValidationError("User not found.")
 
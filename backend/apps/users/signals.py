@@ -0,0 +1,12 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_states
+from .models import LazyUser
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender=LazyUser)
+def forget_user_state(sender, instance, **kwargs):
+    user_states.discard(instance.pk)
@@ -0,0 +1,36 @@
+from smtplib import SMTPException
+
+from celery import shared_task
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import send_mail
+
+from .deletion import run_deletion
+from .models import AccountDeletion
+
+
+@shared_task(
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=True,
+    max_retries=5,
+)
+def send_welcome_email(user_id):
+    user = User.objects.filter(pk=user_id).only("username", "email").first()
+    if user is None or not user.email:
+        return
+    send_mail(
+        subject="Welcome to ALL-IN-ONE",
+        message=(
+            f"Hi {user.username},\n\n"
+            "Your account is ready. Sign in with this email address to start "
+            "organising your tasks.\n"
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
+
+
+@shared_task
+def delete_account(deletion_id):
+    deletion = AccountDeletion.objects.get(pk=deletion_id)
+    run_deletion(deletion)
@@ -0,0 +1,113 @@
+import hashlib
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+from apps.todo.cache import CACHE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Parse DRF-style rates such as ``"10/min"`` into ``(requests, seconds)``."""
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window rate limit over the default cache.
+
+    Each key keeps one counter per fixed window; the request rate is the
+    current window's count plus the previous one's weighted by how much of
+    it still overlaps the sliding window. With Redis behind the cache that
+    is an atomic ``INCR`` and one ``GET`` per check, shared by all workers.
+    Each attempt is counted before it is checked, so concurrent attempts
+    cannot all slip under the limit; rejected attempts count too.
+    """
+
+    prefix = "ratelimit"
+
+    def __init__(self, scope, num_requests, duration):
+        self.scope = scope
+        self.num_requests = num_requests
+        self.duration = duration
+
+    def keys(self, ident, now):
+        window = int(now // self.duration)
+        base = f"{self.prefix}:{self.scope}:{ident}"
+        return f"{base}:{window}", f"{base}:{window - 1}"
+
+    def hit(self, ident, now=None):
+        """Count one attempt; returns the seconds to wait, or 0 if it is allowed."""
+        now = time.time() if now is None else now
+        current_key, previous_key = self.keys(ident, now)
+        try:
+            cache.add(current_key, 0, timeout=self.duration * 2)
+            current = cache.incr(current_key)
+            previous = cache.get(previous_key, 0)
+            elapsed = (now % self.duration) / self.duration
+            # ``current`` includes this attempt; the ones before it decide.
+            if previous * (1 - elapsed) + current - 1 >= self.num_requests:
+                return self.wait(current, previous, elapsed)
+        except ValueError:
+            # incr() found no counter: it was evicted, or the cache keeps
+            # nothing (DummyCache).
+            pass
+        except CACHE_ERRORS as exc:
+            # Fail open: an unavailable cache must not lock everybody out.
+            logger.warning("Rate limit cache unavailable: %s", exc)
+        return 0
+
+    def wait(self, current, previous, elapsed):
+        if current >= self.num_requests or not previous:
+            # Only the next window frees up room.
+            return math.ceil((1 - elapsed) * self.duration)
+        # Wait until enough of the previous window has slid out.
+        overlap = 1 - (self.num_requests - current) / previous
+        return max(1, math.ceil((overlap - elapsed) * self.duration))
+
+
+class LoginRateThrottle(BaseThrottle):
+    """
+    Limits login attempts per client IP and per email address.
+
+    Runs before the view, so throttled credential-stuffing traffic never
+    reaches the user lookup or the password hasher. Rates come from
+    ``LOGIN_RATE_LIMITS``, e.g. ``{"ip": "30/min", "email": "10/min"}``.
+    """
+
+    default_rates = {"ip": "30/min", "email": "10/min"}
+
+    def get_limiters(self):
+        rates = getattr(settings, "LOGIN_RATE_LIMITS", self.default_rates)
+        return {
+            scope: SlidingWindowLimiter(f"login:{scope}", *parse_rate(rate))
+            for scope, rate in rates.items()
+            if rate
+        }
+
+    def get_idents(self, request):
+        idents = {"ip": self.get_ident(request)}
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        if isinstance(email, str) and email.strip():
+            normalized = email.strip().lower().encode()
+            idents["email"] = hashlib.sha256(normalized).hexdigest()
+        return idents
+
+    def allow_request(self, request, view):
+        idents = self.get_idents(request)
+        self.retry_after = 0
+        for scope, limiter in self.get_limiters().items():
+            if scope in idents:
+                self.retry_after = max(self.retry_after, limiter.hit(idents[scope]))
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
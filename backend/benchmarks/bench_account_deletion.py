@@ -0,0 +1,93 @@
+"""
+Deleting an account with many tasks: ``User.delete()``, which cascades in
+one transaction, against the background pipeline of apps/users/deletion.py.
+Reports the wall time, the peak Python memory and the longest the database
+write lock was held: the whole run for the cascade, the slowest statement
+for the pipeline, which commits after each batch.
+
+    python -m benchmarks.bench_account_deletion --tasks 10000 100000 500000
+"""
+
+import argparse
+import contextlib
+import time
+import tracemalloc
+
+from benchmarks.utils import create_user, report, seed_tasks, setup, test_database
+
+
+@contextlib.contextmanager
+def slowest_statement():
+    from django.db import connection
+
+    slowest = [0.0]
+
+    def timed(execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            slowest[0] = max(slowest[0], time.perf_counter() - start)
+
+    with connection.execute_wrapper(timed):
+        yield slowest
+
+
+def seed_account(username, count):
+    from apps.todo import stats
+
+    user = create_user(username)
+    seed_tasks(user, count)
+    stats.rebuild(user.pk)
+    return user
+
+
+def run(volumes):
+    from django.contrib.auth.models import User
+    from django.test.utils import override_settings
+
+    from apps.todo.models import Task
+    from apps.users.deletion import request_deletion
+    from apps.users.models import AccountDeletion
+
+    results = {}
+    for count in volumes:
+        for method in ("cascade", "pipeline"):
+            user = seed_account(f"{method}{count}", count)
+            tracemalloc.start()
+            start = time.perf_counter()
+            with slowest_statement() as slowest:
+                if method == "cascade":
+                    User.objects.get(pk=user.pk).delete()
+                else:
+                    # Celery runs the job inline, once the request commits.
+                    with override_settings(CELERY_TASK_ALWAYS_EAGER=True):
+                        request_deletion(user)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert not Task.objects.filter(owner_id=user.pk).exists()
+            results[f"{count} tasks, {method}"] = {
+                "seconds": round(elapsed, 2),
+                "peak_mib": round(peak / 2**20, 1),
+                "longest_lock_ms": round(
+                    (elapsed if method == "cascade" else slowest[0]) * 1000, 1
+                ),
+            }
+        AccountDeletion.objects.all().delete()
+    report("Deleting one account", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.tasks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Latency of the task list (first page plus count) and of a search as the
+number of old completed tasks grows, with those tasks left in ``Task``
+against moved to ``ArchivedTask`` by the archival job. The hot tasks are
+the same in every run.
+
+    python -m benchmarks.bench_archive --hot 5000 --cold 0 100000 500000
+"""
+
+import argparse
+import datetime
+
+from benchmarks.utils import create_user, measure, report, seed_tasks, setup, test_database
+
+
+def run(hot, cold_volumes, repeat):
+    from django.urls import reverse
+    from django.utils import timezone
+    from rest_framework.test import APIClient
+
+    from apps.todo import archive
+    from apps.todo.models import ArchivedTask, Task
+
+    user = create_user()
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("tasks")
+
+    def get(params):
+        response = client.get(url, params)
+        assert response.status_code == 200, response.status_code
+        return response
+
+    results = {}
+    for cold in cold_volumes:
+        Task.objects.all().delete()
+        ArchivedTask.objects.all().delete()
+        seed_tasks(user, cold)
+        Task.objects.update(
+            status=Task.Status.COMPLETED,
+            updated_at=timezone.now() - datetime.timedelta(days=365),
+        )
+        seed_tasks(user, hot)
+
+        for layout in ("in Task", "archived"):
+            if layout == "archived":
+                archive.archive_completed()
+            label = f"{cold} cold, {layout}"
+            results[f"{label}: list"] = measure(lambda: get({}), repeat)
+            results[f"{label}: search"] = measure(lambda: get({"search": "report"}), repeat)
+        results[f"{cold} cold, include_archived"] = measure(
+            lambda: get({"include_archived": "true"}), repeat
+        )
+    report(f"Task list with {hot} hot tasks as completed ones pile up", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hot", type=int, default=5000)
+    parser.add_argument("--cold", type=int, nargs="+", default=[0, 100_000, 500_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.hot, args.cold, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
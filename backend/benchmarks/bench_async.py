@@ -0,0 +1,150 @@
+"""
+Requests per second and latency percentiles of the sync (TaskViewSet) and
+async (AsyncTaskView) task endpoints served by uvicorn, under concurrent
+keep-alive clients.
+
+    python -m benchmarks.bench_async --rows 10000 --concurrency 50 --seconds 10
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(path, rows):
+    """Migrate and seed a file database; returns an access token for its user."""
+    os.environ["SQLITE_PATH"] = str(path)
+    os.environ["DJANGO_SETTINGS_MODULE"] = "benchmarks.settings"
+
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from apps.todo.models import Task
+    from benchmarks.utils import create_user, seed_tasks
+
+    call_command("migrate", verbosity=0)
+    user = create_user()
+    seed_tasks(user, rows)
+    detail_id = Task.objects.filter(owner=user).values_list("pk", flat=True).first()
+    return str(RefreshToken.for_user(user).access_token), detail_id
+
+
+def start_server(port, workers):
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "config.asgi:application",
+            "--port", str(port), "--workers", str(workers),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def client(port, request, stop_at, latencies, errors):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0])
+    finally:
+        writer.close()
+
+
+async def load(port, path, token, concurrency, seconds):
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+        f"Authorization: Bearer {token}\r\n\r\n"
+    ).encode()
+    latencies, errors = [], []
+    stop_at = time.monotonic() + seconds
+    await asyncio.gather(
+        *(client(port, request, stop_at, latencies, errors) for _ in range(concurrency))
+    )
+    latencies.sort()
+    return {
+        "rps": round(len(latencies) / seconds),
+        "p50_ms": round(latencies[len(latencies) // 2], 2),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+        "errors": len(errors),
+    }
+
+
+def run(rows, concurrency, seconds, workers):
+    from benchmarks.utils import report
+
+    with tempfile.TemporaryDirectory() as directory:
+        token, detail_id = prepare_database(Path(directory) / "bench.sqlite3", rows)
+        port = free_port()
+        server = start_server(port, workers)
+        try:
+            endpoints = {
+                "list": ("/api/tasks/", "/api/async/tasks/"),
+                "detail": (f"/api/tasks/{detail_id}/", f"/api/async/tasks/{detail_id}/"),
+            }
+            results = {}
+            for name, paths in endpoints.items():
+                for mode, path in zip(("sync", "async"), paths):
+                    asyncio.run(load(port, path, token, concurrency, 1))  # warm up
+                    results[f"{name} {mode}"] = asyncio.run(
+                        load(port, path, token, concurrency, seconds)
+                    )
+        finally:
+            server.terminate()
+            server.wait()
+    report(
+        f"{concurrency} concurrent clients for {seconds}s, {rows} tasks, "
+        f"{workers} uvicorn worker(s)",
+        results,
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--seconds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    run(args.rows, args.concurrency, args.seconds, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Throughput of /api/tasks/bulk/ against one request per task for creating,
+completing and deleting a batch of tasks.
+
+    python -m benchmarks.bench_bulk --items 500
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import create_user, report, setup, test_database
+
+
+def run(items, rounds):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from apps.todo.models import Task
+
+    user = create_user()
+    client = APIClient()
+    client.force_authenticate(user)
+    tasks_url, bulk_url = reverse("tasks"), reverse("tasks_bulk")
+    payload = [
+        {"title": f"Task {i}", "description": "Imported", "status": "pending", "priority": "low"}
+        for i in range(items)
+    ]
+
+    def one_at_a_time():
+        for item in payload:
+            client.post(tasks_url, item, format="json")
+        ids = list(Task.objects.filter(owner=user).values_list("pk", flat=True))
+        for pk in ids:
+            client.patch(reverse("task_detail", kwargs={"pk": pk}), {"status": "completed"}, format="json")
+        for pk in ids:
+            client.delete(reverse("task_detail", kwargs={"pk": pk}))
+
+    def bulk():
+        client.post(bulk_url, payload, format="json")
+        ids = list(Task.objects.filter(owner=user).values_list("pk", flat=True))
+        client.patch(bulk_url, [{"id": pk, "status": "completed"} for pk in ids], format="json")
+        client.delete(bulk_url, {"ids": ids}, format="json")
+
+    results = {}
+    for name, func in [("one at a time", one_at_a_time), ("bulk", bulk)]:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            func()
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "seconds": round(elapsed, 3),
+            "tasks_per_second": round(items * rounds * 3 / elapsed),
+        }
+    report(f"Create + complete + delete {items} tasks x {rounds} rounds", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.items, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Index size and sort/filter time for Task.status and Task.priority stored
+as small integers, against a copy of the table holding the old strings
+("pending", "high", ...) with the same indexes. SQLite only (dbstat).
+
+    python -m benchmarks.bench_choices --rows 1000000
+"""
+
+import argparse
+
+from benchmarks.utils import create_user, measure, report, seed_tasks, setup, test_database
+
+TEXT_TABLE = "bench_task_text"
+
+# (name, columns) of the indexes that contain status or priority.
+INDEXES = [
+    ("task_owner_status_created_idx", "owner_id, status, created_at"),
+    ("task_owner_status_due_idx", "owner_id, status, due_date"),
+    ("task_owner_status_prio_idx", "owner_id, status, priority"),
+    ("task_owner_prio_idx", "owner_id, priority"),
+]
+
+
+def code_case(column, choices):
+    whens = " ".join(f"WHEN {member.value} THEN '{member.code}'" for member in choices)
+    return f"CASE {column} {whens} END"
+
+
+def create_text_table(cursor):
+    from apps.todo.models import Task
+
+    cursor.execute(
+        f"""
+        CREATE TABLE {TEXT_TABLE} AS
+        SELECT id, owner_id, created_at, due_date,
+               {code_case("status", Task.Status)} AS status,
+               {code_case("priority", Task.Priority)} AS priority
+        FROM todo_task
+        """
+    )
+    for name, columns in INDEXES:
+        cursor.execute(f"CREATE INDEX text_{name} ON {TEXT_TABLE} ({columns})")
+
+
+def index_bytes(cursor, names):
+    placeholders = ", ".join(["%s"] * len(names))
+    cursor.execute(
+        f"SELECT SUM(pgsize) FROM dbstat WHERE name IN ({placeholders})", names
+    )
+    return cursor.fetchone()[0]
+
+
+def run(rows, repeat):
+    from django.db import connection
+
+    from apps.todo.models import Task
+
+    user = create_user()
+    seed_tasks(user, rows)
+
+    with connection.cursor() as cursor:
+        create_text_table(cursor)
+        cursor.execute("ANALYZE")
+
+        names = [name for name, _ in INDEXES]
+        integer_bytes = index_bytes(cursor, names)
+        text_bytes = index_bytes(cursor, [f"text_{name}" for name in names])
+        report(
+            f"Size of the {len(names)} status/priority indexes, {rows} rows",
+            {
+                "integer": {"mb": round(integer_bytes / 2**20, 2)},
+                "text": {"mb": round(text_bytes / 2**20, 2)},
+            },
+        )
+
+        def query(sql, params=()):
+            return lambda: cursor.execute(sql, params).fetchall()
+
+        tables = {
+            "integer": ("todo_task", Task.Status.IN_PROGRESS, Task.Priority.HIGH),
+            "text": (TEXT_TABLE, "in_progress", "high"),
+        }
+        results = {}
+        for kind, (table, status, priority) in tables.items():
+            # NOT INDEXED forces a full sort, the cost an unindexed ordering pays.
+            results[f"{kind} full sort by priority"] = measure(
+                query(
+                    f"SELECT id FROM {table} NOT INDEXED "
+                    "ORDER BY priority DESC, id DESC LIMIT 10 OFFSET %s",
+                    [rows // 2],
+                ),
+                repeat=repeat,
+                warmup=1,
+            )
+            results[f"{kind} count by status"] = measure(
+                query(
+                    f"SELECT COUNT(*) FROM {table} WHERE owner_id = %s AND status = %s",
+                    [user.pk, status],
+                ),
+                repeat=repeat,
+                warmup=1,
+            )
+            results[f"{kind} page by priority"] = measure(
+                query(
+                    f"SELECT id FROM {table} WHERE owner_id = %s AND priority = %s "
+                    "ORDER BY priority LIMIT 10",
+                    [user.pk, priority],
+                ),
+                repeat=repeat,
+                warmup=1,
+            )
+        report("Query time", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Throughput and tail latency of a mixed read/write workload run by many
+threads at once, the way gunicorn's workers x threads hit one database.
+
+Each mode runs in its own process so it gets its own settings:
+
+    sqlite          the default SQLite configuration
+    sqlite-tuned    SQLITE_TUNED=1 (WAL, synchronous=NORMAL, busy timeout, mmap)
+    postgresql      DATABASE_ENGINE=postgresql, reading POSTGRES_* as in prod;
+                    runs in a throwaway test database
+
+    python -m benchmarks.bench_concurrency --threads 16 --seconds 10
+    POSTGRES_HOST=localhost python -m benchmarks.bench_concurrency \\
+        --modes sqlite-tuned,postgresql
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "sqlite": {"DATABASE_ENGINE": "sqlite", "SQLITE_TUNED": "0"},
+    "sqlite-tuned": {"DATABASE_ENGINE": "sqlite", "SQLITE_TUNED": "1"},
+    "postgresql": {"DATABASE_ENGINE": "postgresql"},
+}
+
+
+def percentile(timings, fraction):
+    return round(timings[min(len(timings) - 1, int(len(timings) * fraction))], 3)
+
+
+def worker(owner, task_ids, write_ratio, stop_at, seed, results):
+    from django.db import OperationalError, connection, transaction
+
+    from apps.todo.models import Task
+
+    rng = random.Random(seed)
+    timings, writes, errors = [], 0, {}
+    try:
+        while time.monotonic() < stop_at:
+            is_write = rng.random() < write_ratio
+            start = time.perf_counter()
+            try:
+                if is_write:
+                    # Read, then write in the same transaction, like the
+                    # update view; this is where a deferred SQLite
+                    # transaction fails to upgrade its lock.
+                    with transaction.atomic():
+                        task = Task.objects.get(pk=rng.choice(task_ids))
+                        task.title = f"Task {rng.random()}"
+                        task.save(update_fields=["title", "updated_at"])
+                        Task.objects.create(title="New", description="Bench", owner=owner)
+                    writes += 1
+                else:
+                    list(Task.objects.filter(owner=owner).order_by("-created_at")[:20])
+            except OperationalError as e:
+                errors[str(e)] = errors.get(str(e), 0) + 1
+                continue
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        connection.close()
+    results.append((timings, writes, errors))
+
+
+def run_mode(rows, threads, seconds, write_ratio):
+    """Body of the per-mode subprocess; prints one JSON line of results."""
+    import contextlib
+
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+
+    from apps.todo.models import Task
+    from benchmarks.utils import create_user, seed_tasks, test_database
+
+    if connection.vendor == "sqlite":
+        call_command("migrate", verbosity=0)
+        database = contextlib.nullcontext()
+    else:
+        database = test_database()
+
+    with database:
+        owner = create_user()
+        seed_tasks(owner, rows)
+        task_ids = list(Task.objects.values_list("pk", flat=True))
+        connection.close()
+
+        results = []
+        stop_at = time.monotonic() + seconds
+        pool = [
+            threading.Thread(
+                target=worker,
+                args=(owner, task_ids, write_ratio, stop_at, seed, results),
+            )
+            for seed in range(threads)
+        ]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+
+    timings = sorted(t for result in results for t in result[0])
+    errors = {}
+    for result in results:
+        for message, count in result[2].items():
+            errors[message] = errors.get(message, 0) + count
+    print(json.dumps({
+        "ops_per_s": round(len(timings) / seconds, 1),
+        "writes_per_s": round(sum(result[1] for result in results) / seconds, 1),
+        "p50_ms": percentile(timings, 0.50) if timings else None,
+        "p99_ms": percentile(timings, 0.99) if timings else None,
+        "errors": sum(errors.values()),
+        "error_messages": sorted(errors),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", default="sqlite,sqlite-tuned")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--run-mode", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_mode:
+        run_mode(args.rows, args.threads, args.seconds, args.write_ratio)
+        return
+
+    print(
+        f"{args.threads} threads, {args.seconds}s, "
+        f"{args.write_ratio:.0%} writes, {args.rows} rows"
+    )
+    for mode in args.modes.split(","):
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                **os.environ,
+                **MODES[mode],
+                "SQLITE_PATH": str(Path(tmp) / "bench.sqlite3"),
+                "DJANGO_SETTINGS_MODULE": "benchmarks.settings",
+            }
+            output = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.bench_concurrency",
+                    "--run-mode", mode,
+                    "--rows", str(args.rows),
+                    "--threads", str(args.threads),
+                    "--seconds", str(args.seconds),
+                    "--write-ratio", str(args.write_ratio),
+                ],
+                cwd=BACKEND_DIR,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        messages = stats.pop("error_messages")
+        values = "  ".join(f"{key}={value}" for key, value in stats.items())
+        print(f"  {mode.ljust(12)}  {values}")
+        for message in messages:
+            print(f"  {' ' * 12}  error: {message}")
+
+
+if __name__ == "__main__":
+    main()
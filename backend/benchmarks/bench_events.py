@@ -0,0 +1,131 @@
+"""
+Idle task event streams held by one uvicorn worker: the worker's memory
+per open stream, and how long one write takes to reach all of them.
+
+Every stream belongs to the same user, the worst case for fan-out. The
+benchmark settings use the in-process MemoryBroker, so writes go to the
+same worker; memory is read from /proc and needs Linux.
+
+    python -m benchmarks.bench_events --connections 1000 2000 5000
+"""
+
+import argparse
+import asyncio
+import resource
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_async import free_port, prepare_database, start_server
+
+
+def rss_kib(pid):
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    raise RuntimeError("VmRSS not found")
+
+
+async def open_stream(port, token):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET /api/tasks/events/?token={token} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n".encode()
+    )
+    await writer.drain()
+    await reader.readuntil(b"event: ready")
+    return reader, writer
+
+
+async def create_task(port, token):
+    body = b'{"title": "Fan-out", "description": "x"}'
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        (
+            f"POST /api/async/tasks/ HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Authorization: Bearer {token}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        ).encode()
+        + body
+    )
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+
+async def fan_out(port, token, streams):
+    async def receive(reader):
+        await reader.readuntil(b"event: created")
+        return time.perf_counter()
+
+    waiters = [asyncio.create_task(receive(reader)) for reader, _ in streams]
+    start = time.perf_counter()
+    await create_task(port, token)
+    received = await asyncio.gather(*waiters)
+    return [(at - start) * 1000 for at in received]
+
+
+async def measure(port, pid, token, connections, rounds):
+    # One stream and one write first, so lazy imports are not counted.
+    streams = [await open_stream(port, token)]
+    await fan_out(port, token, streams)
+    baseline = rss_kib(pid)
+    for start in range(0, connections, 100):
+        streams += await asyncio.gather(
+            *(open_stream(port, token) for _ in range(min(100, connections - start)))
+        )
+    await asyncio.sleep(1)
+    held = rss_kib(pid)
+
+    latencies = []
+    for _ in range(rounds):
+        latencies.append(sorted(await fan_out(port, token, streams)))
+    for _, writer in streams:
+        writer.close()
+    middle = statistics.median(times[len(times) // 2] for times in latencies)
+    last = statistics.median(times[-1] for times in latencies)
+    return {
+        "rss_mib": round(held / 1024, 1),
+        "kib_per_stream": round((held - baseline) / connections, 1),
+        "fan_out_p50_ms": round(middle, 2),
+        "fan_out_last_ms": round(last, 2),
+    }
+
+
+def run(connections, rounds):
+    from benchmarks.utils import report
+
+    # Each stream is a socket on both ends.
+    _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    needed = 2 * max(connections) + 100
+    if hard < needed:
+        raise SystemExit(f"Needs {needed} open files, the limit is {hard}.")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        token, _ = prepare_database(Path(directory) / "bench.sqlite3", 0)
+        for count in connections:
+            port = free_port()
+            server = start_server(port, 1)
+            try:
+                results[f"{count} streams"] = asyncio.run(
+                    measure(port, server.pid, token, count, rounds)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+    report(f"Idle event streams on 1 uvicorn worker, {rounds} write(s) fanned out", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    run(args.connections, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
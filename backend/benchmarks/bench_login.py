@@ -0,0 +1,101 @@
+"""
+Logins per second for one worker on POST /api/login/: email lookup cost
+with and without the case-insensitive index, full logins at a few PBKDF2
+work factors, and how cheaply throttled attempts are turned away.
+
+    python -m benchmarks.bench_login --users 20000
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.utils import measure, report, setup, test_database
+
+PASSWORD = "Bench#123"
+
+
+def logins_per_second(client, url, payload, seconds):
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        response = client.post(url, payload, format="json")
+        count += 1
+    elapsed = time.perf_counter() - start
+    return {"logins_per_second": round(count / elapsed, 1), "status": response.status_code}
+
+
+def run(users, iterations, seconds):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from apps.users.models import users_by_email
+
+    # The test settings use the MD5 hasher; measure what production runs.
+    hashers = override_settings(
+        PASSWORD_HASHERS=["apps.users.hashers.PBKDF2PasswordHasher"],
+        LOGIN_RATE_LIMITS={},
+    )
+    hashers.enable()
+    try:
+        password = make_password(PASSWORD)
+        User.objects.bulk_create(
+            User(username=f"user{i}", email=f"user{i}@example.com", password=password)
+            for i in range(users)
+        )
+        email = f"User{users // 2}@Example.com"
+
+        results = {
+            "lookup email= (no index)": measure(
+                lambda: User.objects.filter(email=email.lower()).first(), repeat=50
+            ),
+            "lookup iexact": measure(
+                lambda: User.objects.filter(email__iexact=email).first(), repeat=50
+            ),
+            "lookup NormalizedEmail index": measure(
+                lambda: users_by_email(email).first(), repeat=50
+            ),
+        }
+        report(f"Email lookup among {users} users", results)
+
+        client, url = APIClient(), reverse("login")
+        payload = {"email": email, "password": PASSWORD}
+        results = {}
+        for count in iterations:
+            with override_settings(PASSWORD_PBKDF2_ITERATIONS=count):
+                client.post(url, payload, format="json")  # rehash to this cost
+                results[f"pbkdf2 {count} iterations"] = logins_per_second(
+                    client, url, payload, seconds
+                )
+
+        with override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+            LOGIN_RATE_LIMITS={"ip": "1/min"},
+        ):
+            logging.getLogger("django.request").setLevel(logging.ERROR)
+            client.post(url, payload, format="json")
+            results["throttled (429)"] = logins_per_second(client, url, payload, seconds)
+        report("Logins per second, one worker", results)
+    finally:
+        hashers.disable()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument(
+        "--iterations", type=int, nargs="+", default=[1_000_000, 600_000, 260_000]
+    )
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.users, args.iterations, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
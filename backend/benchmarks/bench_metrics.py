@@ -0,0 +1,59 @@
+"""
+Per-request overhead of MetricsMiddleware on GET /api/tasks/ and
+/api/tasks/<pk>/: without the middleware, and with sample rates 0, 0.1 and 1.
+
+    python -m benchmarks.bench_metrics --rows 1000 --repeat 500
+"""
+
+import argparse
+
+from benchmarks.utils import create_user, measure, report, seed_tasks, setup, test_database
+
+
+def run(rows, repeat):
+    from django.conf import settings
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from apps.metrics.registry import registry
+    from apps.todo.models import Task
+
+    user = create_user()
+    seed_tasks(user, rows)
+    task_id = Task.objects.values_list("pk", flat=True).first()
+    detail_url = reverse("task_detail", kwargs={"pk": task_id})
+    without = [m for m in settings.MIDDLEWARE if m != "apps.metrics.middleware.MetricsMiddleware"]
+
+    configurations = {
+        "no middleware": {"MIDDLEWARE": without},
+        "sample rate 0": {"METRICS_SAMPLE_RATE": 0},
+        "sample rate 0.1": {"METRICS_SAMPLE_RATE": 0.1},
+        "sample rate 1": {"METRICS_SAMPLE_RATE": 1},
+    }
+    results = {}
+    for name, overrides in configurations.items():
+        with override_settings(**overrides):
+            # A new client builds its middleware chain from the overrides.
+            client = APIClient()
+            client.force_authenticate(user)
+            for label, url in (("list", reverse("tasks")), ("detail", detail_url)):
+                results[f"{label}, {name}"] = measure(lambda: client.get(url), repeat)
+    registry.reset()
+    report(f"MetricsMiddleware overhead, {rows} rows", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
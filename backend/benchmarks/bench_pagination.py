@@ -0,0 +1,64 @@
+"""
+Page 1 vs page 10,000 latency of GET /api/tasks/ with numbered and cursor
+pagination.
+
+    python -m benchmarks.bench_pagination --rows 100000
+"""
+
+import argparse
+
+from benchmarks.utils import create_user, measure, report, seed_tasks, setup, test_database
+
+
+def run(rows, page_size, deep_page, repeat):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from apps.todo.models import Task
+    from apps.todo.pagination import TaskCursorPagination
+
+    user = create_user()
+    seed_tasks(user, rows)
+    client = APIClient()
+    client.force_authenticate(user)
+    url = reverse("tasks")
+
+    # The cursor for the deep page is built from the boundary row directly so
+    # that only the page fetch itself is timed.
+    boundary = (
+        Task.objects.filter(owner=user)
+        .order_by("-created_at", "-id")
+        .values_list("created_at", "id")[(deep_page - 1) * page_size - 1]
+    )
+    deep_cursor = TaskCursorPagination.make_cursor(*boundary)
+
+    def get(params):
+        response = client.get(url, {"page_size": page_size, **params})
+        assert response.status_code == 200, response.status_code
+        return response
+
+    results = {
+        "page=1": measure(lambda: get({"page": 1}), repeat),
+        f"page={deep_page}": measure(lambda: get({"page": deep_page}), repeat),
+        "cursor first page": measure(lambda: get({"pagination": "cursor"}), repeat),
+        f"cursor page {deep_page}": measure(lambda: get({"cursor": deep_cursor}), repeat),
+    }
+    report(f"Task list pagination, {rows} rows, page_size={page_size}", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=10)
+    parser.add_argument("--deep-page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.page_size, args.deep_page, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Registrations per second for one worker on POST /api/register/, with the
+production PBKDF2 hasher and with MD5 to show the cost of everything but
+hashing. Welcome mails are queued through Celery; under the test settings
+they run eagerly into the locmem outbox.
+
+    python -m benchmarks.bench_register --users 20000
+"""
+
+import argparse
+import itertools
+import logging
+import time
+
+from benchmarks.utils import report, setup, test_database
+
+PASSWORD = "Bench#123"
+
+
+def run(users, seconds):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import override_settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    password = make_password(PASSWORD)
+    User.objects.bulk_create(
+        User(username=f"user{i}", email=f"user{i}@example.com", password=password)
+        for i in range(users)
+    )
+    client, url = APIClient(), reverse("register")
+    counter = itertools.count()
+
+    def register():
+        n = next(counter)
+        payload = {
+            "username": f"new{n}",
+            "email": f"new{n}@example.com",
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+        }
+        return client.post(url, payload, format="json")
+
+    def count_queries(func):
+        # CaptureQueriesContext would lose them: request_started resets the log.
+        queries = []
+        with connection.execute_wrapper(
+            lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)
+        ):
+            func()
+        return len(queries)
+
+    new_user_queries = count_queries(register)
+    duplicate = {
+        "username": "user1",
+        "email": "USER1@example.com",
+        "password1": PASSWORD,
+        "password2": PASSWORD,
+    }
+    logging.getLogger("django.request").setLevel(logging.ERROR)
+    duplicate_queries = count_queries(lambda: client.post(url, duplicate, format="json"))
+
+    results = {}
+    hashers = {
+        "pbkdf2 (production)": ["apps.users.hashers.PBKDF2PasswordHasher"],
+        "md5 (hashing excluded)": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+    }
+    for name, hasher in hashers.items():
+        with override_settings(PASSWORD_HASHERS=hasher):
+            count, start = 0, time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                response = register()
+                count += 1
+            elapsed = time.perf_counter() - start
+        results[name] = {
+            "registrations_per_second": round(count / elapsed, 1),
+            "status": response.status_code,
+        }
+    results["queries"] = {
+        "new_user": new_user_queries,
+        "duplicate": duplicate_queries,
+    }
+    report(f"Registrations, one worker, {users} existing users", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--seconds", type=float, default=3)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.users, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Time and peak Python memory of one reminder tick as the number of due
+tasks grows; memory should stay flat. Mail goes to the dummy backend.
+
+    python -m benchmarks.bench_reminders --due 10000 100000 --owners 1000
+"""
+
+import argparse
+import datetime
+import time
+import tracemalloc
+
+from benchmarks.utils import create_user, report, setup, test_database
+
+
+def seed_due(users, count, now):
+    from apps.todo.models import Task
+
+    for start in range(0, count, 5000):
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="Due soon",
+                due_date=now + datetime.timedelta(seconds=(i * 37) % 86000 - 3600),
+                owner=users[i % len(users)],
+            )
+            for i in range(start, min(start + 5000, count))
+        )
+
+
+def run(due_counts, owners):
+    from django.test import override_settings
+    from django.utils import timezone
+
+    from apps.todo.models import Task, TaskReminder
+    from apps.todo.reminders import send_reminders
+
+    users = [create_user(f"bench{i}") for i in range(owners)]
+    results = {}
+    for count in due_counts:
+        Task.objects.all().delete()
+        TaskReminder.objects.all().delete()
+        now = timezone.now()
+        seed_due(users, count, now)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        with override_settings(EMAIL_BACKEND="django.core.mail.backends.dummy.EmailBackend"):
+            sent = send_reminders(now)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert sent == min(count, owners), sent
+        results[f"{count} due tasks"] = {
+            "seconds": round(elapsed, 2),
+            "peak_mib": round(peak / 2**20, 1),
+            "digests": sent,
+        }
+    report(f"One reminder tick, {owners} owners", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--due", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--owners", type=int, default=1000)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.due, args.owners)
+
+
+if __name__ == "__main__":
+    main()
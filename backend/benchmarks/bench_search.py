@@ -0,0 +1,58 @@
+"""
+Task search latency: the old chained ``icontains`` filters against the
+full-text backend, first page plus count for one owner.
+
+    python -m benchmarks.bench_search --rows 1000000 --owners 10
+"""
+
+import argparse
+
+from benchmarks.utils import create_user, measure, report, seed_tasks, setup, test_database
+
+
+def run(rows, owners, queries, repeat):
+    from django.db.models import Q
+
+    from apps.todo.models import Task
+    from apps.todo.search import search_tasks
+
+    users = [create_user(f"bench{i}") for i in range(owners)]
+    for user in users:
+        seed_tasks(user, rows // owners)
+    tasks = Task.objects.filter(owner=users[0])
+
+    def icontains(query):
+        matches = tasks.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(status__icontains=query)
+        )
+        return matches.count(), list(matches.order_by("-created_at")[:10])
+
+    def full_text(query):
+        matches = search_tasks(tasks, query)
+        return matches.count(), list(matches[:10])
+
+    results = {}
+    for query in queries:
+        results[f"icontains {query!r}"] = measure(lambda: icontains(query), repeat)
+        results[f"full-text {query!r}"] = measure(lambda: full_text(query), repeat)
+    report(f"Task search, {rows} rows across {owners} owners", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--owners", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--query", action="append", dest="queries")
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.owners, args.queries or ["dentist", "groc", "zzz"], args.repeat)
+
+
+if __name__ == "__main__":
+    main()
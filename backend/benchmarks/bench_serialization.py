@@ -0,0 +1,73 @@
+"""
+Fetching and rendering one page of the task list the old way (Task
+instances, TaskSerializer(many=True), JSONRenderer) against the row path
+(values_list rows, the compiled row encoder, FastJSONRenderer), plus a
+whole GET /api/tasks/ request.
+
+    python -m benchmarks.bench_serialization --page-size 100
+"""
+
+import argparse
+
+from benchmarks.utils import create_user, measure, report, seed_tasks, setup, test_database
+
+
+def run(rows, page_size, repeat):
+    from django.urls import reverse
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from apps.todo.models import Task
+    from apps.todo.renderers import FastJSONRenderer
+    from apps.todo.rows import task_rows, to_records
+    from apps.todo.serializers import TaskSerializer
+
+    user = create_user()
+    seed_tasks(user, rows)
+    tasks = Task.objects.filter(owner=user).order_by("-created_at")
+
+    def serializer_page():
+        page = list(tasks[:page_size])
+        return JSONRenderer().render(TaskSerializer(page, many=True).data)
+
+    def row_page():
+        page = list(task_rows(tasks)[:page_size])
+        return FastJSONRenderer().render(to_records(page))
+
+    assert serializer_page() == row_page()
+
+    page = list(tasks[:page_size])
+    row_list = list(task_rows(tasks)[:page_size])
+    client = APIClient()
+    client.force_authenticate(user)
+    results = {
+        "fetch + serialize + render, TaskSerializer": measure(serializer_page, repeat),
+        "fetch + serialize + render, rows": measure(row_page, repeat),
+        "serialize + render only, TaskSerializer": measure(
+            lambda: JSONRenderer().render(TaskSerializer(page, many=True).data), repeat
+        ),
+        "serialize + render only, rows": measure(
+            lambda: FastJSONRenderer().render(to_records(row_list)), repeat
+        ),
+        "GET /api/tasks/": measure(
+            lambda: client.get(reverse("tasks"), {"page_size": page_size}), repeat
+        ),
+    }
+    report(f"Task list page, page_size={page_size}, {rows} rows", results)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    with test_database():
+        run(args.rows, args.page_size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
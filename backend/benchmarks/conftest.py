@@ -0,0 +1,133 @@
+"""
+pytest plumbing for the regression benchmarks in this directory.
+
+    pytest benchmarks --no-cov                      # compare with baselines.json
+    pytest benchmarks --no-cov --update-baselines   # accept the current numbers
+
+Each benchmark records its median latency and the queries of one request.
+A run fails when a query count goes up at all, or when a median exceeds
+its baseline by more than ``--latency-tolerance`` (50% by default) twice
+in a row; the second measurement absorbs one-off noise.
+Latency baselines depend on the machine; regenerate them where the suite
+is meant to guard against regressions.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from django.db import connection
+
+from benchmarks.utils import create_user, measure, seed_tasks
+
+BASELINES = Path(__file__).resolve().parent / "baselines.json"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmarks")
+    group.addoption("--baselines", default=str(BASELINES), help="Baseline JSON file.")
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        help="Write this run's results to the baseline file instead of comparing.",
+    )
+    group.addoption(
+        "--latency-tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed median slowdown over the baseline, as a fraction.",
+    )
+    group.addoption("--benchmark-rows", type=int, default=20_000)
+    group.addoption("--benchmark-repeat", type=int, default=50)
+    group.addoption("--benchmark-json", help="Also write this run's results here.")
+
+
+def pytest_configure(config):
+    if config.pluginmanager.hasplugin("_cov") and not config.getoption("no_cov"):
+        raise pytest.UsageError(
+            "Run the benchmarks with --no-cov; coverage tracing skews the timings."
+        )
+
+
+class Recorder:
+    def __init__(self, config):
+        self.path = Path(config.getoption("--baselines"))
+        self.update = config.getoption("--update-baselines")
+        self.tolerance = config.getoption("--latency-tolerance")
+        self.repeat = config.getoption("--benchmark-repeat")
+        self.output = config.getoption("--benchmark-json")
+        self.baselines = json.loads(self.path.read_text()) if self.path.exists() else {}
+        self.results = {}
+
+    def __call__(self, name, func, repeat=None):
+        """Time ``func``, count the queries of one call and check the baseline."""
+        repeat = repeat or self.repeat
+        timings = measure(func, repeat)
+        if not self.update and self.too_slow(name, timings):
+            timings = min(timings, measure(func, repeat), key=lambda t: t["median_ms"])
+        # Counted after the timed runs so warm-up queries (such as the first
+        # lookup of the user's state) are not included.
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            func()
+        result = {
+            **timings,
+            "ops_per_s": round(1000 / timings["median_ms"], 1),
+            "queries": len(queries),
+        }
+        self.results[name] = result
+        if not self.update:
+            self.check(name, result)
+        return result
+
+    def latency_limit(self, name):
+        baseline = self.baselines.get(name)
+        return baseline and baseline["median_ms"] * (1 + self.tolerance)
+
+    def too_slow(self, name, timings):
+        limit = self.latency_limit(name)
+        return limit is not None and timings["median_ms"] > limit
+
+    def check(self, name, result):
+        baseline = self.baselines.get(name)
+        if baseline is None:
+            return
+        problems = []
+        if result["queries"] > baseline["queries"]:
+            problems.append(f"queries {baseline['queries']} -> {result['queries']}")
+        if self.too_slow(name, result):
+            problems.append(
+                f"median {baseline['median_ms']}ms -> {result['median_ms']}ms "
+                f"(limit {self.latency_limit(name):.3f}ms)"
+            )
+        if problems:
+            pytest.fail(f"{name} regressed: {'; '.join(problems)}", pytrace=False)
+
+    def save(self):
+        if self.update:
+            baselines = {**self.baselines, **self.results}
+            self.path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        if self.output:
+            Path(self.output).write_text(json.dumps(self.results, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def benchmark(request):
+    recorder = Recorder(request.config)
+    yield recorder
+    recorder.save()
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker, request):
+    # Seeded once per run with bulk_create; every benchmark runs inside a
+    # transaction that is rolled back, so writes do not change the dataset.
+    with django_db_blocker.unblock():
+        owner = create_user()
+        seed_tasks(owner, request.config.getoption("--benchmark-rows"))
+        seed_tasks(create_user("other"), 1000)
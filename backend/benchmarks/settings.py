@@ -0,0 +1,14 @@
+# Settings for benchmarks that run the app in a separate server or worker
+# process, which cannot see the runner's in-memory test database.
+# SQLITE_PATH is required so a benchmark never touches the dev database;
+# DATABASE_ENGINE=postgresql and SQLITE_TUNED apply as in production.
+import os
+
+from config.settings.database import databases_from_env
+from config.settings.test import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+
+DATABASES = databases_from_env("sqlite", os.environ["SQLITE_PATH"])
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
@@ -0,0 +1,144 @@
+"""
+Latency and query-count regression benchmarks for the task and auth APIs.
+See conftest.py for how to run them and how baselines work.
+"""
+
+import itertools
+
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.todo.models import Task
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def owner():
+    return User.objects.get(username="bench")
+
+
+@pytest.fixture
+def client(owner):
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(owner).access_token}"
+    )
+    return client
+
+
+def get(client, url, params=None, expected=200, **extra):
+    def call():
+        response = client.get(url, params or {}, **extra)
+        assert response.status_code == expected, response.content
+        return response
+
+    return call
+
+
+@pytest.mark.parametrize(
+    "name, params",
+    [
+        ("list", {}),
+        ("list_deep_page", {"page": 500}),
+        ("list_cursor", {"pagination": "cursor"}),
+        ("search", {"search": "groceries"}),
+        ("filter", {"status": "completed", "priority": "high"}),
+        ("ordering", {"ordering": "-priority"}),
+        ("list_fields", {"fields": "id,title,status,priority"}),
+    ],
+)
+def test_task_list(benchmark, client, name, params):
+    benchmark(name, get(client, reverse("tasks"), params))
+
+
+def test_task_detail(benchmark, client, owner):
+    task = Task.objects.filter(owner=owner).first()
+    benchmark("detail", get(client, reverse("task_detail", kwargs={"pk": task.pk})))
+
+
+def test_task_stats(benchmark, client):
+    benchmark("stats", get(client, reverse("task_stats")))
+
+
+@pytest.mark.parametrize(
+    "name, url_name",
+    [("list_not_modified", "tasks"), ("detail_not_modified", "task_detail")],
+)
+def test_not_modified(benchmark, client, owner, name, url_name):
+    kwargs = {}
+    if url_name == "task_detail":
+        kwargs["pk"] = Task.objects.filter(owner=owner).first().pk
+    url = reverse(url_name, kwargs=kwargs)
+    etag = client.get(url)["ETag"]
+    benchmark(name, get(client, url, expected=304, HTTP_IF_NONE_MATCH=etag))
+
+
+def test_task_create(benchmark, client):
+    def create():
+        response = client.post(
+            reverse("tasks"), {"title": "New", "description": "Bench"}, format="json"
+        )
+        assert response.status_code == 201, response.content
+
+    benchmark("create", create)
+
+
+def test_task_patch(benchmark, client, owner):
+    task = Task.objects.filter(owner=owner).first()
+    url = reverse("task_detail", kwargs={"pk": task.pk})
+    statuses = itertools.cycle(["completed", "pending"])
+
+    def patch():
+        response = client.patch(url, {"status": next(statuses)}, format="json")
+        assert response.status_code == 200, response.content
+
+    benchmark("patch", patch)
+
+
+def test_task_delete(benchmark, client, owner):
+    ids = iter(Task.objects.filter(owner=owner).values_list("pk", flat=True)[:1000])
+
+    def delete():
+        response = client.delete(reverse("task_detail", kwargs={"pk": next(ids)}))
+        assert response.status_code == 204, response.content
+
+    benchmark("delete", delete)
+
+
+def test_login(benchmark):
+    client = APIClient()
+
+    def login():
+        response = client.post(
+            reverse("login"),
+            {"email": "bench@example.com", "password": "Bench#123"},
+            format="json",
+        )
+        assert response.status_code == 200, response.content
+
+    benchmark("login", login)
+
+
+def test_register(benchmark):
+    client = APIClient()
+    numbers = itertools.count()
+
+    def register():
+        n = next(numbers)
+        response = client.post(
+            reverse("register"),
+            {
+                "username": f"new{n}",
+                "email": f"new{n}@example.com",
+                "password1": "Bench#12345",
+                "password2": "Bench#12345",
+            },
+            format="json",
+        )
+        assert response.status_code == 201, response.content
+
+    benchmark("register", register)
@@ -0,0 +1,92 @@
+import contextlib
+import os
+import statistics
+import time
+
+import django
+
+
+def setup():
+    # The test settings disable the response cache, so the database work is
+    # what gets measured.
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    django.setup()
+
+
+@contextlib.contextmanager
+def test_database():
+    """Run the block against a throwaway test database, like the test runner."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def create_user(username="bench", email=None):
+    from django.contrib.auth.models import User
+
+    return User.objects.create_user(
+        username=username, email=email or f"{username}@example.com", password="Bench#123"
+    )
+
+
+WORDS = (
+    "report invoice meeting groceries kitchen garden email budget review deploy "
+    "dentist laundry tickets flight hotel release backup refactor homework call"
+).split()
+
+
+def seed_tasks(owner, count, batch_size=5000):
+    from apps.todo.models import Task
+
+    statuses = list(Task.Status)
+    priorities = list(Task.Priority)
+    words = len(WORDS)
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {created + i}",
+                description=" ".join(
+                    WORDS[(created + i) * step % words] for step in (1, 7, 13)
+                ),
+                status=statuses[(created + i) % 3],
+                priority=priorities[(created + i) % 3],
+                owner=owner,
+            )
+            for i in range(size)
+        )
+        created += size
+    return created
+
+
+def measure(func, repeat=20, warmup=2):
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+    }
+
+
+def report(title, results):
+    print(f"\n{title}")
+    width = max(len(name) for name in results)
+    for name, stats in results.items():
+        values = "  ".join(f"{key}={value}" for key, value in stats.items())
+        print(f"  {name.ljust(width)}  {values}")
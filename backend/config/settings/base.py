@@ -11,9 +11,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+from celery.schedules import crontab
 from dotenv import load_dotenv
 import os
 
+from .database import databases_from_env
+
 load_dotenv()
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -46,9 +49,11 @@ INSTALLED_APPS = [
     "corsheaders",
     "apps.users",
     "apps.todo",
+    "apps.metrics",
 ]
 
 MIDDLEWARE = [
+    "apps.metrics.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -63,10 +68,18 @@ ROOT_URLCONF = "config.urls"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.LazyUserJWTAuthentication",
     )
 }
 
+# How long a worker trusts its cached copy of a user's active flag and
+# password hash when authenticating JWTs (see LazyUserJWTAuthentication).
+JWT_USER_STATE_TIMEOUT = int(os.getenv("JWT_USER_STATE_TIMEOUT", "30"))
+
+# "page" keeps the numbered TaskPagination, "cursor" switches the task list to
+# keyset pagination. Clients can override it per request with ?pagination=.
+TASK_PAGINATION_MODE = os.getenv("TASK_PAGINATION_MODE", "page")
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -88,17 +101,38 @@ ASGI_APPLICATION = "config.asgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+# SQLite unless DATABASE_ENGINE says otherwise; see config/settings/database.py.
+DATABASES = databases_from_env("sqlite", BASE_DIR / "db.sqlite3")
+
+# Task reads go to the DATABASE_REPLICAS aliases, except in requests that write
+# and for DATABASE_REPLICA_PIN_SECONDS after a user wrote (apps/todo/routers.py).
+DATABASE_ROUTERS = ["apps.todo.routers.ReplicaRouter"]
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_REPLICA_PIN_SECONDS = int(os.getenv("DATABASE_REPLICA_PIN_SECONDS", "5"))
 
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
+# Hashers are tried in order; the first one hashes new passwords and any
+# stored hash made by a later one (or with another iteration count) is
+# upgraded on the user's next successful login.
+PASSWORD_HASHERS = os.getenv(
+    "PASSWORD_HASHERS",
+    "apps.users.hashers.PBKDF2PasswordHasher,"
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher,"
+    "django.contrib.auth.hashers.Argon2PasswordHasher,"
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher,"
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+).split(",")
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", "1000000"))
+
+# Sliding-window limits on POST /api/login/, per client IP and per email.
+LOGIN_RATE_LIMITS = {
+    "ip": os.getenv("LOGIN_RATE_LIMIT_IP", "30/min"),
+    "email": os.getenv("LOGIN_RATE_LIMIT_EMAIL", "10/min"),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -141,10 +175,105 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
-CELERY_BROKER_URL = "redis://redis:6379/0"
-CELERY_RESULT_BACKEND = "redis://redis:6379/0"
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django_redis.cache.RedisCache",
+        "LOCATION": f"{REDIS_URL}/1",
+        "OPTIONS": {
+            "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "SOCKET_CONNECT_TIMEOUT": 0.5,
+            "SOCKET_TIMEOUT": 0.5,
+        },
+    }
+}
+
+# Task API response cache, see apps/todo/cache.py. While Redis is unreachable
+# up to TASK_CACHE_LOCAL_SIZE responses are kept in process and Redis is
+# retried every TASK_CACHE_RETRY_AFTER seconds.
+TASK_CACHE_TIMEOUT = 300
+TASK_CACHE_LOCAL_SIZE = 1024
+TASK_CACHE_RETRY_AFTER = 30
+
+# Task change feed at /api/tasks/events/ (apps/todo/events.py). Events fan out
+# through Redis pub/sub; apps.todo.events.MemoryBroker only reaches streams
+# served by the writing process. A stream more than TASK_EVENTS_QUEUE_SIZE
+# events behind gets a "refresh" event instead, and idle streams get a
+# heartbeat every TASK_EVENTS_HEARTBEAT seconds.
+TASK_EVENTS_BROKER = "apps.todo.events.RedisBroker"
+TASK_EVENTS_BROKER_URL = REDIS_URL
+TASK_EVENTS_QUEUE_SIZE = 100
+TASK_EVENTS_HEARTBEAT = 15
+
+# Request metrics served at /metrics (apps/metrics). Query, database and
+# serializer timings are only taken for METRICS_SAMPLE_RATE of the requests.
+# Set METRICS_DIR to a directory shared by the workers of a host so a scrape
+# sees all of them; gunicorn workers are separate processes. Scrapers send
+# "Authorization: Bearer <METRICS_TOKEN>"; with DEBUG off and no token set,
+# /metrics answers 404.
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "0.1"))
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Largest array accepted by /api/tasks/bulk/.
+TASK_BULK_MAX_ITEMS = 1000
+
+# Rows fetched per round trip by /api/tasks/export/<format>/.
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+CELERY_BROKER_URL = f"{REDIS_URL}/0"
+CELERY_RESULT_BACKEND = f"{REDIS_URL}/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
+# Run Celery tasks inline, without a broker or worker, for local runs.
+# A broker-less worker setup can instead use CELERY_BROKER_URL="filesystem://"
+# with CELERY_BROKER_TRANSPORT_OPTIONS pointing data_folder_in/out at a
+# shared directory.
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER") == "1"
+CELERY_TASK_EAGER_PROPAGATES = True
+# Run by `celery -A config beat`.
+CELERY_BEAT_SCHEDULE = {
+    "archive-completed-tasks": {
+        "task": "apps.todo.tasks.archive_completed_tasks",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "send-task-reminders": {
+        "task": "apps.todo.tasks.send_task_reminders",
+        "schedule": crontab(minute="*/15"),
+    },
+}
+
+# Tasks completed (and not edited since) more than TASK_ARCHIVE_AFTER_DAYS days
+# ago move to the ArchivedTask table, TASK_ARCHIVE_BATCH_SIZE per transaction
+# (apps/todo/archive.py). Task lists only show them with ?include_archived=true.
+TASK_ARCHIVE_AFTER_DAYS = 90
+TASK_ARCHIVE_BATCH_SIZE = 1000
+
+# Due-date reminder digests (apps/todo/reminders.py): open tasks due within
+# TASK_REMINDER_LEAD_HOURS, or overdue by at most TASK_REMINDER_OVERDUE_DAYS,
+# get one reminder of each kind, in digests listing up to TASK_REMINDER_MAX_LISTED
+# tasks. Sent digests are recorded every TASK_REMINDER_BATCH_SIZE, which bounds
+# how many a crashed worker sends again.
+TASK_REMINDER_LEAD_HOURS = 24
+TASK_REMINDER_OVERDUE_DAYS = 7
+TASK_REMINDER_BATCH_SIZE = 500
+TASK_REMINDER_MAX_LISTED = 20
+
+# Rows validated and inserted per transaction by the task import, and the
+# number of row errors kept for the progress endpoint.
+TASK_IMPORT_BATCH_SIZE = 500
+TASK_IMPORT_MAX_ERRORS = 100
+
+# Rows deleted per statement when an account is deleted in the background
+# (apps/users/deletion.py), instead of all at once by User.delete().
+ACCOUNT_DELETION_BATCH_SIZE = 1000
+
+# Tasks changed or deleted per transaction by the task admin's bulk actions
+# (apps/todo/admin.py), so that "select all" over a large changelist never
+# locks or binds every matching row at once.
+TASK_ADMIN_BATCH_SIZE = 1000
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.zoho.eu"
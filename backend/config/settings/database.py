@@ -0,0 +1,113 @@
+"""
+Builders for ``DATABASES`` entries, driven by environment variables.
+
+``DATABASE_ENGINE`` picks ``sqlite`` or ``postgresql``. PostgreSQL reads
+``POSTGRES_DB``, ``POSTGRES_USER``, ``POSTGRES_PASSWORD``, ``POSTGRES_HOST``
+and ``POSTGRES_PORT``, and uses psycopg's connection pool unless
+``DATABASE_POOL=0``, in which case connections persist for
+``DATABASE_CONN_MAX_AGE`` seconds behind health checks. SQLite reads
+``SQLITE_PATH``; ``SQLITE_TUNED=1`` turns on the single-node tuning below.
+
+``DATABASE_REPLICAS`` lists read replicas of that database, as hosts for
+PostgreSQL or file paths for SQLite. They become the ``replica_1``,
+``replica_2``... aliases, which ``apps.todo.routers.ReplicaRouter`` sends
+task reads to.
+"""
+
+import os
+
+# WAL lets readers run alongside the single writer, and synchronous=NORMAL
+# is durable across application crashes in WAL mode (only an OS crash can
+# lose the last commits). mmap serves reads straight from the page cache.
+SQLITE_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size={mmap_size}",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA journal_size_limit=67108864",
+]
+
+
+def env_flag(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def sqlite_database(path, tuned=False):
+    database = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": path,
+    }
+    if tuned:
+        mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 2**20)))
+        database["OPTIONS"] = {
+            "init_command": "; ".join(SQLITE_PRAGMAS).format(mmap_size=mmap_size),
+            # Take the write lock when the transaction starts, so concurrent
+            # writers queue on the busy timeout instead of failing to
+            # upgrade a read lock with "database is locked".
+            "transaction_mode": "IMMEDIATE",
+            "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", "5")),
+        }
+        database["CONN_MAX_AGE"] = int(os.getenv("DATABASE_CONN_MAX_AGE", "60"))
+    return database
+
+
+def postgresql_database():
+    database = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("POSTGRES_DB", "all_in_one"),
+        "USER": os.getenv("POSTGRES_USER", "postgres"),
+        "PASSWORD": os.getenv("POSTGRES_PASSWORD", ""),
+        "HOST": os.getenv("POSTGRES_HOST", "localhost"),
+        "PORT": os.getenv("POSTGRES_PORT", "5432"),
+    }
+    if env_flag("DATABASE_POOL", True):
+        # Django's native psycopg pool; it replaces persistent connections,
+        # which cannot be combined with it and are not reused under ASGI.
+        database["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+                "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+            }
+        }
+    else:
+        database["CONN_MAX_AGE"] = int(os.getenv("DATABASE_CONN_MAX_AGE", "60"))
+        database["CONN_HEALTH_CHECKS"] = True
+    return database
+
+
+def database_from_env(default_engine, sqlite_path, tuned_sqlite=False):
+    engine = os.getenv("DATABASE_ENGINE", default_engine)
+    if engine == "postgresql":
+        return postgresql_database()
+    return sqlite_database(
+        os.getenv("SQLITE_PATH", str(sqlite_path)),
+        tuned=env_flag("SQLITE_TUNED", tuned_sqlite),
+    )
+
+
+def replica_databases(primary):
+    targets = [
+        target.strip()
+        for target in os.getenv("DATABASE_REPLICAS", "").split(",")
+        if target.strip()
+    ]
+    field = "NAME" if primary["ENGINE"].endswith("sqlite3") else "HOST"
+    return {
+        f"replica_{number}": {
+            **primary,
+            field: target,
+            # Under test the replicas are the test database itself.
+            "TEST": {"MIRROR": "default"},
+        }
+        for number, target in enumerate(targets, 1)
+    }
+
+
+def databases_from_env(default_engine, sqlite_path, tuned_sqlite=False):
+    primary = database_from_env(default_engine, sqlite_path, tuned_sqlite)
+    return {"default": primary, **replica_databases(primary)}
@@ -0,0 +1,17 @@
+from .base import *
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    host.strip() for host in os.getenv("DJANGO_ALLOWED_HOSTS", "").split(",") if host.strip()
+]
+CORS_ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOWED_ORIGINS", "").split(",")
+    if origin.strip()
+]
+
+# PostgreSQL by default. DATABASE_ENGINE=sqlite is meant for single-node
+# deployments and gets the WAL/busy-timeout tuning.
+DATABASES = databases_from_env("postgresql", BASE_DIR / "db.sqlite3", tuned_sqlite=True)
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
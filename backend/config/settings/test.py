@@ -0,0 +1,34 @@
+import tempfile
+
+from .dev import *
+
+SECRET_KEY = SECRET_KEY or "test-secret-key"
+
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Tests opt into caching explicitly so state never leaks between test cases.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+TASK_EVENTS_BROKER = "apps.todo.events.MemoryBroker"
+
+EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_BROKER_URL = "memory://"
+CELERY_RESULT_BACKEND = "cache+memory://"
+
+MEDIA_ROOT = Path(tempfile.gettempdir()) / "all-in-one-test-media"
+
+if DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+    # A file rather than SQLite's shared in-memory database, with immediate
+    # write transactions as in the tuned profile, so that tests sending
+    # requests from several threads see writers queue on the lock the way
+    # they do in a deployment.
+    DATABASES["default"]["OPTIONS"] = {"transaction_mode": "IMMEDIATE", "timeout": 20}
+    DATABASES["default"]["TEST"] = {
+        "NAME": str(Path(tempfile.gettempdir()) / "all-in-one-test.sqlite3")
+    }
+
+# A second, separate database for the replica router tests; they opt in with
+# DATABASE_REPLICAS=["replica"], everything else reads from the primary.
+DATABASES["replica"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
@@ -8,6 +8,12 @@ python3 manage.py migrate --noinput
 echo "Collect static files"
 python3 manage.py collectstatic --noinput
 
+# Each worker writes its request metrics here for /metrics to merge; start
+# from an empty directory so totals of a previous run are not carried over.
+export METRICS_DIR="${METRICS_DIR:-/tmp/django-metrics}"
+rm -rf "$METRICS_DIR"
+mkdir -p "$METRICS_DIR"
+
 echo "Starting Django server with Uvicorn..."
 exec gunicorn config.asgi:application \
   -k uvicorn.workers.UvicornWorker \
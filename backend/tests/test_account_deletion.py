@@ -0,0 +1,139 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.todo import archive, stats
+from apps.todo.cache import task_cache
+from apps.todo.models import ArchivedTask, Task, TaskImport, TaskStats
+from apps.users import deletion
+from apps.users.models import AccountDeletion
+from django.contrib.auth.models import User
+
+
+class AccountDeletionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.other = User.objects.create_user(username="other", password="testpass")
+        for owner in (self.user, self.other):
+            Task.objects.bulk_create(
+                Task(title=f"Task {i}", description="x", owner=owner) for i in range(5)
+            )
+            stats.rebuild(owner.pk)
+        task = Task.objects.filter(owner=self.user).first()
+        Task.objects.filter(pk=task.pk).update(status=Task.Status.COMPLETED)
+        archive.copy(task, ArchivedTask).save()
+        self.owned_rows = 5 + 1 + 1  # Tasks, the archived one and the stats row.
+
+    def delete(self, user=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return deletion.request_deletion(user or self.user)
+
+    def test_deletes_the_account_and_what_it_owns(self):
+        record = self.delete()
+        record.refresh_from_db()
+        self.assertEqual(record.status, "completed")
+        self.assertEqual(record.progress, 100)
+        self.assertEqual(record.total_rows, self.owned_rows)
+        self.assertEqual(record.deleted_rows, self.owned_rows)
+        self.assertIsNotNone(record.finished_at)
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+        self.assertFalse(Task.objects.filter(owner_id=self.user.pk).exists())
+        self.assertFalse(ArchivedTask.objects.filter(owner_id=self.user.pk).exists())
+        self.assertFalse(TaskStats.objects.filter(owner_id=self.user.pk).exists())
+        self.assertEqual(Task.objects.filter(owner=self.other).count(), 5)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_drops_cached_tasks_files_and_tells_streams(self):
+        cache.clear()
+        task_cache.reset()
+        task = Task.objects.filter(owner=self.user).first()
+        detail_url = reverse("task_detail", kwargs={"pk": task.pk})
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(reverse("tasks")).data["count"], 10)
+        upload = TaskImport.objects.create(
+            file=SimpleUploadedFile("tasks.csv", b"title\nA\n"), format="csv", owner=self.user
+        )
+        storage, name = upload.file.storage, upload.file.name
+        self.assertTrue(storage.exists(name))
+
+        with mock.patch("apps.todo.events.publish") as publish:
+            self.delete()
+        publish.assert_called_once_with(self.user.pk, "refresh", {})
+        self.assertFalse(storage.exists(name))
+        self.assertEqual(self.client.get(detail_url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(reverse("tasks")).data["count"], 5)
+
+    def test_deactivates_before_the_job_runs(self):
+        token = RefreshToken.for_user(self.user).access_token
+        record = deletion.request_deletion(self.user)
+        self.assertEqual(record.status, "pending")
+        self.assertFalse(User.objects.get(pk=self.user.pk).is_active)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 5)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        # Asking again reuses the deletion in progress.
+        self.assertEqual(deletion.request_deletion(self.user), record)
+
+    @override_settings(ACCOUNT_DELETION_BATCH_SIZE=2)
+    def test_deletes_in_bounded_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.delete()
+        sql = [query["sql"] for query in queries]
+        task_deletes = [query for query in sql if query.startswith('DELETE FROM "todo_task"')]
+        batches = [query for query in task_deletes if query.endswith("LIMIT 2)")]
+        self.assertEqual(len(batches), 3)
+        # Then User.delete() finds nothing left to cascade to.
+        self.assertEqual(len(task_deletes), 4)
+        # Tasks are never loaded, only deleted by id.
+        self.assertFalse(
+            any(query.startswith("SELECT") and '"todo_task"."title"' in query for query in sql)
+        )
+
+    def test_failed_run_can_be_retried(self):
+        with mock.patch.object(deletion, "delete_batch", side_effect=[2, RuntimeError("boom")]):
+            with self.assertRaises(RuntimeError):
+                self.delete()
+        failed = AccountDeletion.objects.get()
+        self.assertEqual((failed.status, failed.error), ("failed", "boom"))
+
+        record = self.delete(User.objects.get(pk=self.user.pk))
+        record.refresh_from_db()
+        self.assertEqual(record.status, "completed")
+        self.assertFalse(User.objects.filter(pk=self.user.pk).exists())
+
+
+class AccountDeletionAdminTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="adminpass")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        Task.objects.bulk_create(
+            Task(title=f"Task {i}", description="x", owner=self.user) for i in range(20)
+        )
+        self.client.force_login(self.admin)
+        self.url = reverse("admin:auth_user_delete", args=[self.user.pk])
+
+    def test_confirmation_does_not_collect_the_tasks(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"todo_task"' in query["sql"] for query in queries))
+
+    def test_delete_schedules_the_deletion(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"post": "yes"})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(AccountDeletion.objects.get().status, "completed")
+        self.assertFalse(Task.objects.exists())
+
+        response = self.client.get(reverse("admin:users_accountdeletion_changelist"))
+        self.assertContains(response, "user")
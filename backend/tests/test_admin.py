@@ -0,0 +1,163 @@
+import re
+import unittest
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from apps.todo import admin as task_admin, stats
+from apps.todo.models import Task, TaskStats
+from django.contrib.auth.models import User
+
+
+class TaskAdminTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="adminpass")
+        self.owners = [
+            User.objects.create_user(username=f"owner{i}", password="testpass") for i in range(2)
+        ]
+        self.add_tasks(4)
+        self.url = reverse("admin:todo_task_changelist")
+        self.client.force_login(self.admin)
+
+    def add_tasks(self, count, owners=None):
+        owners = owners or self.owners
+        Task.objects.bulk_create(
+            Task(
+                title=f"Report {i}",
+                description="x",
+                status=Task.Status.COMPLETED if i % 4 == 0 else Task.Status.PENDING,
+                owner=owners[i % len(owners)],
+            )
+            for i in range(count)
+        )
+        for owner in owners:
+            stats.rebuild(owner.pk)
+
+    def assertStatsCorrect(self):
+        for owner in TaskStats.objects.all():
+            self.assertEqual(stats.differences(owner), [])
+
+    def changelist(self, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query["sql"] for query in queries]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        _, few = self.changelist()
+        owners = [User.objects.create_user(username=f"more{i}") for i in range(20)]
+        self.add_tasks(60, owners)
+        with mock.patch.object(task_admin.TaskAdmin, "list_per_page", 10):
+            response, many = self.changelist()
+        # The session, the admin user, one count and one page with the
+        # owners joined in.
+        self.assertEqual(len(few), 4)
+        self.assertEqual(len(many), 4)
+        self.assertEqual(sum("COUNT(*)" in query for query in many), 1)
+        page = many[-1]
+        self.assertIn('INNER JOIN "auth_user"', page)
+        self.assertIn("LIMIT 10", page)
+        self.assertContains(response, "more19")
+
+    def test_filters_and_search(self):
+        response, queries = self.changelist(
+            {"status__exact": Task.Status.COMPLETED, "q": "report"}
+        )
+        self.assertEqual(response.context["cl"].result_count, 1)
+        self.assertTrue(any("todo_task_fts" in query for query in queries))
+        response, _ = self.changelist({"due_date__isnull": "True", "priority__exact": 1})
+        self.assertEqual(response.context["cl"].result_count, 4)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+    def test_status_filter_follows_the_created_index(self):
+        response, _ = self.changelist({"status__exact": Task.Status.PENDING})
+        sql, params = response.context["cl"].queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("task_created_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_estimated_count(self):
+        queryset = Task.objects.order_by("pk")
+        with mock.patch.object(task_admin, "planner_estimate", return_value=2_000_000):
+            with self.assertNumQueries(0):
+                count = task_admin.EstimatedCountPaginator(queryset, 100).count
+        self.assertEqual(count, 2_000_000)
+        # Small results are counted exactly.
+        with mock.patch.object(task_admin, "planner_estimate", return_value=3):
+            self.assertEqual(task_admin.EstimatedCountPaginator(queryset, 100).count, 4)
+
+    def test_status_action_is_one_update(self):
+        selected = list(Task.objects.values_list("pk", flat=True))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url, {"action": "mark_completed", ACTION_CHECKBOX_NAME: selected}
+            )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        sql = [query["sql"] for query in queries]
+        self.assertEqual(sum(query.startswith('UPDATE "todo_task"') for query in sql), 1)
+        self.assertEqual(Task.objects.filter(status=Task.Status.COMPLETED).count(), 4)
+        self.assertStatsCorrect()
+
+        response = self.client.post(
+            self.url,
+            {"action": "mark_in_progress", ACTION_CHECKBOX_NAME: selected[:2]},
+            follow=True,
+        )
+        self.assertContains(response, "Marked 2 task(s) as in progress.")
+        self.assertStatsCorrect()
+
+    @override_settings(TASK_ADMIN_BATCH_SIZE=3)
+    def test_actions_on_all_rows_go_in_batches(self):
+        self.add_tasks(6)
+        across = {"select_across": "1", "index": "0", ACTION_CHECKBOX_NAME: ["1"]}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {"action": "mark_in_progress", **across})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(Task.objects.exclude(status=Task.Status.IN_PROGRESS).count(), 0)
+        # 10 tasks, 3 at a time; no statement names more than a batch of pks.
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "todo_task"')]
+        self.assertEqual(len(updates), 4)
+        for query in queries:
+            for pks in re.findall(r"IN \(([^()]*)\)", query["sql"]):
+                self.assertLessEqual(len(pks.split(",")), 3)
+        self.assertStatsCorrect()
+
+        self.client.post(self.url, {"action": "delete_selected", "post": "yes", **across})
+        self.assertFalse(Task.objects.exists())
+        self.assertStatsCorrect()
+
+    def test_deletes_and_edits_keep_stats(self):
+        task = Task.objects.filter(owner=self.owners[0]).first()
+        response = self.client.post(
+            reverse("admin:todo_task_change", args=[task.pk]),
+            {
+                "title": "Moved",
+                "description": "x",
+                "status": Task.Status.COMPLETED,
+                "priority": Task.Priority.HIGH,
+                "owner": self.owners[1].pk,
+                "due_date_0": "",
+                "due_date_1": "",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(Task.objects.get(pk=task.pk).owner, self.owners[1])
+        self.assertStatsCorrect()
+
+        self.client.post(
+            self.url,
+            {
+                "action": "delete_selected",
+                "post": "yes",
+                ACTION_CHECKBOX_NAME: list(Task.objects.values_list("pk", flat=True)[:3]),
+            },
+        )
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertStatsCorrect()
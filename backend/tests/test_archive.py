@@ -0,0 +1,181 @@
+import datetime
+import io
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, override_settings
+from django.utils import timezone
+from apps.todo import archive, stats
+from apps.todo.models import ArchivedTask, Task, TaskStats
+from apps.todo.tasks import archive_completed_tasks
+from django.contrib.auth.models import User
+
+
+class ArchiveTestCase(APITestCase):
+    def setUp(self):
+        self.url = reverse("tasks")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.other = User.objects.create_user(username="other", password="testpass")
+        self.now = timezone.now()
+        long_ago = self.now - datetime.timedelta(days=200)
+        self.old = [
+            self.create(f"Old {i}", Task.Status.COMPLETED, long_ago, self.user) for i in range(3)
+        ]
+        self.old_other = self.create("Old other", Task.Status.COMPLETED, long_ago, self.other)
+        self.old_open = self.create("Old open", Task.Status.PENDING, long_ago, self.user)
+        self.recent = self.create(
+            "Recent", Task.Status.COMPLETED, self.now - datetime.timedelta(days=1), self.user
+        )
+        stats.rebuild(self.user.pk)
+        self.client.force_authenticate(self.user)
+
+    def create(self, title, task_status, updated_at, owner):
+        task = Task.objects.create(
+            title=title, description="Archive me", status=task_status, owner=owner
+        )
+        Task.objects.filter(pk=task.pk).update(created_at=updated_at, updated_at=updated_at)
+        task.refresh_from_db()
+        return task
+
+    def assertStatsCorrect(self):
+        self.assertEqual(stats.differences(TaskStats.objects.get(owner=self.user)), [])
+
+
+class ArchiveCompletedTests(ArchiveTestCase):
+    @override_settings(TASK_ARCHIVE_BATCH_SIZE=2)
+    def test_moves_old_completed_tasks_in_batches(self):
+        self.assertEqual(archive.archive_completed(self.now), 4)
+
+        archived_ids = {task.pk for task in self.old} | {self.old_other.pk}
+        self.assertEqual(set(ArchivedTask.objects.values_list("pk", flat=True)), archived_ids)
+        self.assertFalse(Task.objects.filter(pk__in=archived_ids).exists())
+        self.assertEqual(
+            set(Task.objects.values_list("pk", flat=True)), {self.old_open.pk, self.recent.pk}
+        )
+        copied = ArchivedTask.objects.get(pk=self.old[0].pk)
+        for field in ("title", "description", "status", "priority", "owner_id", "due_date"):
+            self.assertEqual(getattr(copied, field), getattr(self.old[0], field))
+        self.assertEqual(copied.created_at, self.old[0].created_at)
+        self.assertEqual(copied.updated_at, self.old[0].updated_at)
+        self.assertEqual(copied.archived_at, self.now)
+        self.assertStatsCorrect()
+
+        self.assertEqual(archive.archive_completed(self.now), 0)
+
+    @override_settings(TASK_ARCHIVE_AFTER_DAYS=365)
+    def test_celery_task_uses_the_age_setting(self):
+        self.assertEqual(archive_completed_tasks.delay().get(), 0)
+        self.assertFalse(ArchivedTask.objects.exists())
+
+
+class IncludeArchivedTests(ArchiveTestCase):
+    def setUp(self):
+        super().setUp()
+        archive.archive_completed(self.now)
+
+    def titles(self, response):
+        return [task["title"] for task in response.data["results"]]
+
+    def test_hidden_by_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(self.titles(response), ["Recent", "Old open"])
+        self.assertEqual(response.data["count"], 2)
+
+    def test_lists_both_tables(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"include_archived": "true"})
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(
+            set(self.titles(response)), {"Recent", "Old open", "Old 0", "Old 1", "Old 2"}
+        )
+        self.assertEqual(self.titles(response)[0], "Recent")
+        archived = next(task for task in response.data["results"] if task["title"] == "Old 0")
+        self.assertEqual(archived["id"], self.old[0].pk)
+        self.assertEqual(archived["status"], "completed")
+
+        response = self.client.get(
+            self.url, {"include_archived": "1", "page_size": 2, "page": 3, "fields": "title"}
+        )
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_filters_apply_to_both_tables(self):
+        response = self.client.get(
+            self.url, {"include_archived": "true", "status": "completed", "ordering": "created_at"}
+        )
+        self.assertEqual(self.titles(response)[-1], "Recent")
+        self.assertEqual(response.data["count"], 4)
+
+        response = self.client.get(self.url, {"include_archived": "true", "search": "old"})
+        self.assertEqual(response.data["count"], 4)
+
+    def test_cursor_pages_through_both_tables(self):
+        params = {"include_archived": "true", "pagination": "cursor", "page_size": 2}
+        response = self.client.get(self.url, params)
+        titles = self.titles(response)
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            titles += self.titles(response)
+        self.assertEqual(len(titles), 5)
+        self.assertEqual(set(titles), {"Recent", "Old open", "Old 0", "Old 1", "Old 2"})
+
+    def test_etag_covers_archived_tasks(self):
+        params = {"include_archived": "true"}
+        response = self.client.get(self.url, params)
+        ArchivedTask.objects.filter(pk=self.old[0].pk).delete()
+        changed = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data["count"], 4)
+
+    def test_invalid_switch(self):
+        response = self.client.get(self.url, {"include_archived": "maybe"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"detail": "include_archived must be true or false."})
+
+    async def test_async_view(self):
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        response = await AsyncClient().get(
+            reverse("async_tasks"), {"include_archived": "yes"}, headers=headers
+        )
+        self.assertEqual(response.json()["count"], 5)
+
+
+class RestoreTasksCommandTests(ArchiveTestCase):
+    def setUp(self):
+        super().setUp()
+        archive.archive_completed(self.now)
+
+    def call(self, *args):
+        out = io.StringIO()
+        call_command("restore_tasks", *args, stdout=out)
+        return out.getvalue()
+
+    def test_restore_by_task_and_owner(self):
+        self.assertIn("Restored 1 task(s).", self.call("--task", str(self.old[0].pk)))
+        restored = Task.objects.get(pk=self.old[0].pk)
+        self.assertEqual(restored.title, "Old 0")
+        self.assertEqual(restored.created_at, self.old[0].created_at)
+        self.assertGreater(restored.updated_at, self.old[0].updated_at)
+        self.assertFalse(ArchivedTask.objects.filter(pk=self.old[0].pk).exists())
+        self.assertStatsCorrect()
+
+        self.assertIn("Restored 2 task(s).", self.call("--owner", str(self.user.pk)))
+        self.assertEqual(
+            list(ArchivedTask.objects.values_list("pk", flat=True)), [self.old_other.pk]
+        )
+        self.assertStatsCorrect()
+        # Restored tasks count as just edited.
+        self.assertEqual(archive.archive_completed(), 0)
+
+    @override_settings(TASK_ARCHIVE_BATCH_SIZE=2)
+    def test_restore_all(self):
+        self.assertIn("Restored 4 task(s).", self.call("--all"))
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertEqual(Task.objects.count(), 6)
+
+    def test_requires_a_selection(self):
+        with self.assertRaises(CommandError):
+            self.call()
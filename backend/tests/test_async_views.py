@@ -0,0 +1,146 @@
+import asyncio
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.test import AsyncClient
+from apps.todo.cache import task_cache
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+class AsyncTaskViewTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="testpass")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.task = Task.objects.create(
+            title="Pay rent",
+            description="Monthly",
+            priority=Task.Priority.HIGH,
+            owner=self.admin,
+        )
+        for i in range(12):
+            Task.objects.create(title=f"Task {i}", description="Other", owner=self.admin)
+        Task.objects.create(title="Theirs", description="Other", owner=self.user)
+        self.async_client = AsyncClient()
+
+    def headers(self, user):
+        access = str(RefreshToken.for_user(user).access_token)
+        return {"Authorization": f"Bearer {access}"}
+
+    async def test_list_matches_sync_view(self):
+        for params in [{}, {"page": 2}, {"pagination": "cursor", "ordering": "-priority"}]:
+            sync_response = await self.async_client.get(
+                reverse("tasks"), params, headers=self.headers(self.admin)
+            )
+            response = await self.async_client.get(
+                reverse("async_tasks"), params, headers=self.headers(self.admin)
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.json()["results"], sync_response.json()["results"]
+            )
+        self.assertEqual(response.json()["results"][0]["title"], "Pay rent")
+
+        response = await self.async_client.get(reverse("async_tasks"), {"page": 9})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_cache_lookups_leave_the_event_loop(self):
+        loops = []
+
+        def generation(owner):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return 0
+
+        with mock.patch.object(task_cache, "generation", side_effect=generation):
+            response = await self.async_client.get(reverse("async_tasks"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Redis is only called from worker threads, never on the loop.
+        self.assertEqual(loops, [None])
+
+    async def test_detail(self):
+        response = await self.async_client.get(
+            reverse("async_task_detail", kwargs={"pk": self.task.pk})
+        )
+        self.assertEqual(response.json()["title"], "Pay rent")
+        response = await self.async_client.get(
+            reverse("async_task_detail", kwargs={"pk": 999999})
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"detail": "Task not found."})
+
+    async def test_create_update_delete(self):
+        headers = self.headers(self.admin)
+        response = await self.async_client.post(
+            reverse("async_tasks"),
+            {"title": "New", "description": "Async"},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()["owner"], self.admin.pk)
+        url = reverse("async_task_detail", kwargs={"pk": response.json()["id"]})
+
+        response = await self.async_client.patch(
+            url, {"status": "completed"}, content_type="application/json", headers=headers
+        )
+        self.assertEqual(response.json()["status"], "completed")
+        task = await Task.objects.aget(pk=response.json()["id"])
+        self.assertEqual(task.status, Task.Status.COMPLETED)
+
+        response = await self.async_client.delete(url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await Task.objects.filter(pk=task.pk).aexists())
+
+    async def test_validation_errors(self):
+        headers = self.headers(self.admin)
+        response = await self.async_client.post(
+            reverse("async_tasks"),
+            {"title": ""},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("title", response.json())
+
+        response = await self.async_client.post(
+            reverse("async_tasks"), "{", content_type="application/json", headers=headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_permissions(self):
+        url = reverse("async_task_detail", kwargs={"pk": self.task.pk})
+        response = await self.async_client.patch(
+            url, {"status": "completed"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("WWW-Authenticate", response.headers)
+
+        response = await self.async_client.patch(
+            url,
+            {"status": "completed"},
+            content_type="application/json",
+            headers=self.headers(self.user),
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = await self.async_client.delete(url, headers=self.headers(self.user))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await self.async_client.get(
+            reverse("async_tasks"), headers={"Authorization": "Bearer invalid"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_sync_client(self):
+        # Under WSGI the view still works, wrapped by Django in async_to_sync.
+        response = self.client.get(
+            reverse("async_tasks"), headers=self.headers(self.user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["count"], 1)
@@ -0,0 +1,81 @@
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.test import override_settings
+from apps.todo import stats
+from apps.todo.models import Task
+from apps.todo.views import TaskViewSet
+from apps.users.authentication import LazyUserJWTAuthentication, user_states
+from django.contrib.auth.models import User
+
+
+class LazyUserJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_states.clear()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="testpass"
+        )
+        Task.objects.create(title="Pay rent", description="Monthly", owner=self.user)
+        stats.rebuild(self.user.pk)
+        self.token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_task_list_skips_user_query(self):
+        url = reverse("tasks")
+        self.client.get(url)
+
+        # The count/latest-edit summary and the page; the user is not loaded.
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data["count"], 1)
+
+        with mock.patch.object(
+            TaskViewSet, "authentication_classes", [JWTAuthentication]
+        ), self.assertNumQueries(3):
+            self.client.get(url)
+
+    def test_create_uses_token_user_as_owner(self):
+        self.client.get(reverse("tasks"))
+        # The insert and the stats update, in a savepoint; no user lookup.
+        with self.assertNumQueries(4):
+            response = self.client.post(
+                reverse("tasks"), {"title": "New", "description": "Task"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.get(pk=response.data["id"]).owner, self.user)
+
+    def test_full_user_is_loaded_on_demand(self):
+        user = LazyUserJWTAuthentication().get_user(self.token)
+        self.assertEqual(user, self.user)
+        self.assertTrue(user.is_authenticated)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, "user@example.com")
+            self.assertEqual(user.username, "user")
+        self.assertEqual(JWTAuthentication().get_user(self.token).email, user.email)
+
+    def test_deactivation_is_seen_immediately_in_process(self):
+        url = reverse("tasks")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_state_is_cached_until_timeout(self):
+        url = reverse("tasks")
+        self.client.get(url)
+        # Like a deactivation made by another worker: no signal reaches us.
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        with override_settings(JWT_USER_STATE_TIMEOUT=0):
+            self.client.get(url)
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.user.delete()
+        response = self.client.get(reverse("tasks"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
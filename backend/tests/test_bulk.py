@@ -0,0 +1,94 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.test import override_settings
+from apps.todo import stats
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("tasks_bulk")
+        self.admin = User.objects.create_user(username="admin", password="testpass")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.tasks = Task.objects.bulk_create(
+            Task(title=f"Task {i}", description="Description", owner=self.admin)
+            for i in range(3)
+        )
+        self.foreign = Task.objects.create(
+            title="Foreign", description="Description", owner=self.user
+        )
+        stats.rebuild(self.admin.pk)
+        self.client.force_authenticate(self.admin)
+
+    def task_data(self, title):
+        return {"title": title, "description": "Description", "status": "pending", "priority": "low"}
+
+    def test_bulk_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.post(self.url, [self.task_data("New")], format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_create(self):
+        data = [self.task_data(f"New {i}") for i in range(5)]
+        # The insert and the stats update, in a savepoint.
+        with self.assertNumQueries(4):
+            response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data["results"]), 5)
+        self.assertTrue(all(task["id"] for task in response.data["results"]))
+        self.assertEqual(Task.objects.filter(owner=self.admin).count(), 8)
+
+    def test_bulk_create_reports_item_errors(self):
+        data = [self.task_data("Valid"), {"title": "", "status": "invalid"}]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        self.assertIn("title", response.data["errors"][0]["errors"])
+
+    def test_bulk_rejects_non_lists(self):
+        response = self.client.post(self.url, self.task_data("New"), format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(TASK_BULK_MAX_ITEMS=2)
+    def test_bulk_limits_batch_size(self):
+        data = [self.task_data(f"New {i}") for i in range(3)]
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update(self):
+        data = [{"id": task.pk, "status": "completed"} for task in self.tasks]
+        # Lock, update and stats update, in a savepoint.
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            Task.objects.filter(owner=self.admin, status=Task.Status.COMPLETED).count(), 3
+        )
+        self.assertGreater(Task.objects.get(pk=self.tasks[0].pk).updated_at, self.tasks[0].updated_at)
+
+    def test_bulk_update_checks_owner(self):
+        data = [
+            {"id": self.tasks[0].pk, "title": "Mine"},
+            {"id": self.foreign.pk, "title": "Not mine"},
+            {"id": self.tasks[1].pk, "status": "invalid"},
+            {"id": self.tasks[0].pk, "title": "Again"},
+        ]
+        response = self.client.patch(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2, 3])
+        self.assertEqual(Task.objects.get(pk=self.foreign.pk).title, "Foreign")
+        self.assertEqual(Task.objects.get(pk=self.tasks[0].pk).title, "Mine")
+
+    def test_bulk_delete(self):
+        ids = [self.tasks[0].pk, self.tasks[1].pk, self.foreign.pk, "x"]
+        # Lock, delete and stats update, in a savepoint.
+        with self.assertNumQueries(5):
+            response = self.client.delete(self.url, {"ids": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data["results"], [self.tasks[0].pk, self.tasks[1].pk])
+        self.assertEqual([error["index"] for error in response.data["errors"]], [2, 3])
+        self.assertTrue(Task.objects.filter(pk=self.foreign.pk).exists())
+        self.assertEqual(Task.objects.filter(owner=self.admin).count(), 1)
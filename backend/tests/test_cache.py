@@ -0,0 +1,122 @@
+from unittest import mock
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import override_settings
+from apps.todo.cache import task_cache
+from apps.todo.models import Task
+from apps.todo.serializers import TaskSerializer
+from django.contrib.auth.models import User
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+class TaskCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        task_cache.reset()
+        self.tasks_url = reverse("tasks")
+        self.admin = User.objects.create_user(username="admin", password="testpass")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.task = Task.objects.create(
+            title="Test task", description="Test description", owner=self.admin
+        )
+        self.other_task = Task.objects.create(
+            title="Other task", description="Other description", owner=self.user
+        )
+        self.detail_url = reverse("task_detail", kwargs={"pk": self.task.pk})
+
+    def test_list_is_served_from_cache(self):
+        self.client.force_authenticate(self.admin)
+        first = self.client.get(self.tasks_url, {"page_size": 5})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.tasks_url, {"page_size": 5})
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(task_cache.stats()["hits"], 1)
+
+    def test_cache_key_includes_filters(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get(self.tasks_url)
+        response = self.client.get(self.tasks_url, {"status": "completed"})
+        self.assertEqual(response.data["count"], 0)
+
+    def test_detail_is_served_from_cache(self):
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.data["title"], "Test task")
+
+    def test_create_invalidates_only_the_owner(self):
+        self.client.force_authenticate(self.user)
+        self.client.get(self.tasks_url)
+        self.client.force_authenticate(self.admin)
+        self.client.get(self.tasks_url)
+
+        data = {"title": "New", "description": "New", "status": "pending", "priority": "low"}
+        self.client.post(self.tasks_url, data, format="json")
+
+        self.assertEqual(self.client.get(self.tasks_url).data["count"], 2)
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(0):
+            self.client.get(self.tasks_url)
+
+    def test_anonymous_list_is_invalidated_by_any_owner(self):
+        self.assertEqual(self.client.get(self.tasks_url).data["count"], 2)
+        self.client.force_authenticate(self.user)
+        self.client.delete(reverse("task_detail", kwargs={"pk": self.other_task.pk}))
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get(self.tasks_url).data["count"], 1)
+
+    def test_update_invalidates_detail_and_list(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get(self.detail_url)
+        self.client.get(self.tasks_url)
+        self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+        self.assertEqual(self.client.get(self.detail_url).data["title"], "Changed")
+        self.assertEqual(
+            self.client.get(self.tasks_url).data["results"][0]["title"], "Changed"
+        )
+
+    def test_late_fill_cannot_outlive_an_invalidation(self):
+        # A reader fetches the task, a PATCH invalidates it, and only then
+        # does the reader store what it fetched.
+        self.client.force_authenticate(self.admin)
+        key = task_cache.detail_key(self.task.pk)
+        stale = TaskSerializer(self.task).data
+        self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+        task_cache.set(key, stale)
+        self.assertEqual(self.client.get(self.detail_url).data["title"], "Changed")
+
+    def test_delete_invalidates_detail(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get(self.detail_url)
+        self.client.delete(self.detail_url)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_falls_back_to_local_cache_when_backend_is_down(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get(self.detail_url)
+
+        down = RedisConnectionError("down")
+        with mock.patch.object(LocMemCache, "get", side_effect=down), mock.patch.object(
+            LocMemCache, "set", side_effect=down
+        ):
+            self.client.get(self.tasks_url)
+            with self.assertNumQueries(0):
+                response = self.client.get(self.tasks_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertFalse(task_cache.stats()["backend_available"])
+
+            self.client.patch(self.detail_url, {"title": "Changed"}, format="json")
+
+        # Once the backend answers again the invalidation made during the
+        # outage is replayed, so the detail cached before it is not served.
+        task_cache.down_until = 0
+        self.assertEqual(self.client.get(self.detail_url).data["title"], "Changed")
+        self.assertEqual(task_cache.stats()["errors"], 1)
@@ -0,0 +1,409 @@
+import datetime
+import random
+import threading
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+from apps.todo.cache import task_cache
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.tasks_url = reverse("tasks")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}", description="A long description", owner=self.user
+            )
+            for i in range(3)
+        ]
+        self.detail_url = reverse("task_detail", kwargs={"pk": self.tasks[0].pk})
+        self.client.force_authenticate(self.user)
+
+    def test_list_returns_and_selects_only_the_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.tasks_url, {"fields": "priority,title, status"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.data["results"][0]), ["title", "status", "priority"]
+        )
+        self.assertEqual(response.data["count"], 3)
+        for query in queries:
+            self.assertNotIn('"description"', query["sql"])
+
+    def test_cursor_pages_without_ordering_fields(self):
+        response = self.client.get(
+            self.tasks_url, {"pagination": "cursor", "page_size": 2, "fields": "title"}
+        )
+        self.assertEqual(response.data["results"], [{"title": "Task 2"}, {"title": "Task 1"}])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"], [{"title": "Task 0"}])
+
+    def test_detail_returns_and_selects_only_the_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.detail_url, {"fields": "id,title"})
+        self.assertEqual(response.data, {"id": self.tasks[0].pk, "title": "Task 0"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"description"', queries[0]["sql"])
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_detail_subset_of_cached_task(self):
+        cache.clear()
+        task_cache.reset()
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.detail_url, {"fields": "status"})
+        self.assertEqual(response.data, {"status": "pending"})
+
+    def test_unknown_field(self):
+        for url in (self.tasks_url, self.detail_url):
+            response = self.client.get(url, {"fields": "title,secret"})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data, {"detail": "Unknown fields: secret."})
+
+    async def test_async_view(self):
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        client = AsyncClient()
+        response = await client.get(
+            reverse("async_tasks"), {"fields": "title", "page_size": 1}, headers=headers
+        )
+        self.assertEqual(response.json()["results"], [{"title": "Task 2"}])
+        response = await client.get(
+            reverse("async_task_detail", kwargs={"pk": self.tasks[0].pk}),
+            {"fields": "description"},
+            headers=headers,
+        )
+        self.assertEqual(response.json(), {"description": "A long description"})
+        response = await client.get(reverse("async_tasks"), {"fields": "nope"}, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.tasks_url = reverse("tasks")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.task = Task.objects.create(title="Task", description="Desc", owner=self.user)
+        Task.objects.create(title="Other", description="Desc", owner=self.user)
+        self.detail_url = reverse("task_detail", kwargs={"pk": self.task.pk})
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url, response, params=None):
+        return self.client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    def test_detail_validators(self):
+        response = self.client.get(self.detail_url)
+        self.task.refresh_from_db()
+        self.assertEqual(response["Last-Modified"], http_date(self.task.updated_at.timestamp()))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        with self.assertNumQueries(1):
+            not_modified = self.revalidate(self.detail_url, response)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified.content, b"")
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+        since = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(since.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_etag_changes_with_task_and_fields(self):
+        response = self.client.get(self.detail_url)
+        narrowed = self.client.get(self.detail_url, {"fields": "title"})
+        self.assertNotEqual(narrowed["ETag"], response["ETag"])
+
+        self.client.patch(self.detail_url, {"title": "Renamed"}, format="json")
+        changed = self.revalidate(self.detail_url, response)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertEqual(changed.data["title"], "Renamed")
+
+    def test_list_not_modified(self):
+        response = self.client.get(self.tasks_url)
+        self.assertIn("ETag", response)
+        self.assertNotIn("Last-Modified", response)
+        # Only the count/latest-edit summary runs; no page is built.
+        with self.assertNumQueries(1):
+            not_modified = self.revalidate(self.tasks_url, response)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_page_reuses_the_summary_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.tasks_url)
+        self.assertEqual(len(queries), 2)
+
+    def test_list_etag_changes_with_tasks_and_params(self):
+        response = self.client.get(self.tasks_url)
+        other_page = self.client.get(self.tasks_url, {"page_size": 1})
+        self.assertNotEqual(other_page["ETag"], response["ETag"])
+
+        self.client.delete(self.detail_url)
+        deleted = self.revalidate(self.tasks_url, response)
+        self.assertEqual(deleted.status_code, status.HTTP_200_OK)
+        self.assertEqual(deleted.data["count"], 1)
+
+        Task.objects.filter(owner=self.user).update(
+            updated_at=datetime.datetime(2030, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+        edited = self.revalidate(self.tasks_url, deleted)
+        self.assertEqual(edited.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_is_per_owner(self):
+        response = self.client.get(self.tasks_url)
+        other = User.objects.create_user(username="other", password="testpass")
+        self.client.force_authenticate(other)
+        response = self.revalidate(self.tasks_url, response)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_cached_list_revalidates_without_queries(self):
+        cache.clear()
+        task_cache.reset()
+        response = self.client.get(self.tasks_url)
+        with self.assertNumQueries(0):
+            not_modified = self.revalidate(self.tasks_url, response)
+            cached = self.client.get(self.tasks_url)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], response["ETag"])
+        self.assertEqual(cached.data, response.data)
+
+    async def test_async_view(self):
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        client = AsyncClient()
+        for url in (
+            reverse("async_tasks"),
+            reverse("async_task_detail", kwargs={"pk": self.task.pk}),
+        ):
+            response = await client.get(url, headers=headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            not_modified = await client.get(
+                url, headers={**headers, "If-None-Match": response["ETag"]}
+            )
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ConditionalWriteTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.task = Task.objects.create(title="Task", description="0", owner=self.user)
+        self.detail_url = reverse("task_detail", kwargs={"pk": self.task.pk})
+        self.client.force_authenticate(self.user)
+
+    def patch(self, data, url=None, **headers):
+        return self.client.patch(url or self.detail_url, data, format="json", **headers)
+
+    def test_writes_only_the_changed_fields(self):
+        # The lock, which also checks the owner, and one UPDATE; the owner is
+        # not loaded and the unchanged columns are not rewritten.
+        with CaptureQueriesContext(connection) as queries, self.assertNumQueries(4):
+            response = self.patch({"title": "Renamed", "description": "0"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        update = next(query["sql"] for query in queries if query["sql"].startswith("UPDATE"))
+        self.assertIn('"title"', update)
+        self.assertIn('"updated_at"', update)
+        self.assertNotIn('"description"', update)
+
+        updated_at = Task.objects.get(pk=self.task.pk).updated_at
+        with CaptureQueriesContext(connection) as queries:
+            self.patch({"title": "Renamed"})
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in queries))
+        self.assertEqual(Task.objects.get(pk=self.task.pk).updated_at, updated_at)
+
+    def test_if_match(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        response = self.patch({"title": "First"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["ETag"], self.client.get(self.detail_url)["ETag"])
+
+        stale = self.patch({"title": "Second"}, HTTP_IF_MATCH=etag)
+        self.assertEqual(stale.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(stale.data, {"detail": "The task has changed since it was read."})
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, "First")
+
+        response = self.patch({"title": "Second"}, HTTP_IF_MATCH=f'"nope", {response["ETag"]}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.patch({"title": "Third"}, HTTP_IF_MATCH="*").status_code, 200)
+
+    def test_if_match_with_fields(self):
+        url = f"{self.detail_url}?fields=title"
+        etag = self.client.get(url)["ETag"]
+        full_etag = self.client.get(self.detail_url)["ETag"]
+        stale = self.patch({"title": "Renamed"}, url=url, HTTP_IF_MATCH=full_etag)
+        self.assertEqual(stale.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        response = self.patch({"title": "Renamed"}, url=url, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.data, {"title": "Renamed"})
+        self.assertEqual(response["ETag"], self.client.get(url)["ETag"])
+
+    def test_if_unmodified_since(self):
+        last_modified = self.client.get(self.detail_url)["Last-Modified"]
+        response = self.patch({"title": "Renamed"}, HTTP_IF_UNMODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        earlier = http_date((self.task.updated_at - datetime.timedelta(hours=1)).timestamp())
+        response = self.patch({"title": "Again"}, HTTP_IF_UNMODIFIED_SINCE=earlier)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_interleaved_writers_lose_no_updates(self):
+        # Writers read a counter, then write it back incremented, in a random
+        # interleaving. Without If-Match most increments are lost; with it a
+        # writer that read a stale copy gets a 412 and starts over.
+        def writer(increments, conditional, conflicts):
+            while increments:
+                read = self.client.get(self.detail_url)
+                yield
+                headers = {"HTTP_IF_MATCH": read["ETag"]} if conditional else {}
+                count = int(read.data["description"]) + 1
+                response = self.patch({"description": str(count)}, **headers)
+                if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+                    conflicts.append(count)
+                else:
+                    self.assertEqual(response.status_code, status.HTTP_200_OK)
+                    increments -= 1
+                yield
+
+        def run(conditional):
+            Task.objects.filter(pk=self.task.pk).update(description="0")
+            rng = random.Random(0)
+            conflicts = []
+            writers = [writer(10, conditional, conflicts) for _ in range(5)]
+            while writers:
+                current = rng.choice(writers)
+                if next(current, StopIteration) is StopIteration:
+                    writers.remove(current)
+            return int(Task.objects.get(pk=self.task.pk).description), len(conflicts)
+
+        count, conflicts = run(conditional=False)
+        self.assertLess(count, 50)
+        self.assertEqual(conflicts, 0)
+        count, conflicts = run(conditional=True)
+        self.assertEqual(count, 50)
+        self.assertGreater(conflicts, 0)
+
+    async def test_async_view(self):
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        client = AsyncClient()
+        url = reverse("async_task_detail", kwargs={"pk": self.task.pk})
+        etag = (await client.get(url, headers=headers))["ETag"]
+        response = await client.patch(
+            url,
+            {"title": "First"},
+            content_type="application/json",
+            headers={**headers, "If-Match": etag},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "First")
+        stale = await client.patch(
+            url,
+            {"title": "Second"},
+            content_type="application/json",
+            headers={**headers, "If-Match": etag},
+        )
+        self.assertEqual(stale.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(stale.json(), {"detail": "The task has changed since it was read."})
+        other = await sync_to_async(User.objects.create_user)(username="other", password="x")
+        other_headers = {"Authorization": f"Bearer {RefreshToken.for_user(other).access_token}"}
+        forbidden = await client.patch(
+            url, {"title": "Theirs"}, content_type="application/json", headers=other_headers
+        )
+        self.assertEqual(forbidden.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConcurrentWriteTests(APITransactionTestCase):
+    # Real requests from several threads, each with its own connection to the
+    # (file-backed) test database, so the writes genuinely race.
+    writers = 6
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.task = Task.objects.create(title="Task", description="0", owner=self.user)
+        self.detail_url = reverse("task_detail", kwargs={"pk": self.task.pk})
+
+    def run_writers(self, target):
+        barrier = threading.Barrier(self.writers)
+        errors = []
+
+        def run(number):
+            client = APIClient()
+            client.force_authenticate(self.user)
+            try:
+                barrier.wait()
+                target(number, client)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(self.writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_one_writer_wins_per_etag(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        statuses = []
+
+        def write(number, client):
+            response = client.patch(
+                self.detail_url, {"title": f"Writer {number}"}, format="json", HTTP_IF_MATCH=etag
+            )
+            statuses.append((number, response.status_code))
+
+        self.run_writers(write)
+        winners = [number for number, code in statuses if code == status.HTTP_200_OK]
+        self.assertEqual(len(winners), 1)
+        self.assertEqual(
+            Counter(code for _, code in statuses),
+            {status.HTTP_200_OK: 1, status.HTTP_412_PRECONDITION_FAILED: self.writers - 1},
+        )
+        self.assertEqual(Task.objects.get(pk=self.task.pk).title, f"Writer {winners[0]}")
+
+    def test_concurrent_writers_lose_no_updates(self):
+        # Each writer increments the counter in description 5 times, and
+        # appends its number to the title once, with read-modify-write
+        # cycles retried on 412.
+        increments = 5
+        wins = []
+
+        def write(number, client):
+            todo = [("description", None)] * increments + [("title", number)]
+            while todo:
+                field, value = todo[0]
+                read = client.get(self.detail_url)
+                if field == "description":
+                    value = str(int(read.data["description"]) + 1)
+                else:
+                    value = f"{read.data['title']} {value}"
+                response = client.patch(
+                    self.detail_url, {field: value}, format="json", HTTP_IF_MATCH=read["ETag"]
+                )
+                if response.status_code == status.HTTP_200_OK:
+                    wins.append(read["ETag"])
+                    todo.pop(0)
+                elif response.status_code != status.HTTP_412_PRECONDITION_FAILED:
+                    raise AssertionError(response.status_code)
+
+        self.run_writers(write)
+        task = Task.objects.get(pk=self.task.pk)
+        self.assertEqual(task.description, str(self.writers * increments))
+        self.assertEqual(
+            sorted(map(int, task.title.split()[1:])), list(range(self.writers))
+        )
+        # Every version was written over by exactly one writer.
+        self.assertEqual(len(wins), self.writers * (increments + 1))
+        self.assertEqual(len(set(wins)), len(wins))
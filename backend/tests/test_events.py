@@ -0,0 +1,186 @@
+import asyncio
+import json
+import time
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncClient, override_settings
+from apps.todo import events, renderers
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+def parse(chunk):
+    """``(event, data)`` of each event frame in ``chunk``."""
+    parsed = []
+    for frame in chunk.decode().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines() if ": " in line)
+        if "event" in lines:
+            parsed.append((lines["event"], json.loads(lines["data"])))
+    return parsed
+
+
+class TaskEventsTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("task_events")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.other = User.objects.create_user(username="other", password="testpass")
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+    async def open_stream(self, client, **kwargs):
+        response = await client.get(self.url, **kwargs)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = response.streaming_content
+        self.assertEqual(await anext(content), events.READY_FRAME)
+        return content
+
+    async def next_events(self, content):
+        return parse(await asyncio.wait_for(anext(content), 5))
+
+    def test_renders_the_same_frame_without_orjson(self):
+        data = {"tasks": [{"id": 1, "title": "Caf\u00e9 \u2028"}]}
+        with mock.patch.object(renderers, "orjson", None):
+            frame = events.render("created", data)
+        self.assertEqual(frame, events.render("created", data))
+        self.assertEqual(parse(frame), [("created", data)])
+
+    async def test_requires_a_valid_token(self):
+        client = AsyncClient()
+        for kwargs in ({}, {"data": {"token": "garbage"}}):
+            response = await client.get(self.url, **kwargs)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertIn("detail", response.json())
+            self.assertIn("WWW-Authenticate", response)
+
+    async def test_streams_the_users_changes(self):
+        client = AsyncClient()
+        content = await self.open_stream(client, data={"token": self.token})
+
+        other_headers = {
+            "Authorization": f"Bearer {RefreshToken.for_user(self.other).access_token}"
+        }
+        await client.post(
+            reverse("async_tasks"),
+            {"title": "Not mine", "description": "x"},
+            content_type="application/json",
+            headers=other_headers,
+        )
+        response = await client.post(
+            reverse("async_tasks"),
+            {"title": "Mine", "description": "x"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        task = response.json()
+        self.assertEqual(await self.next_events(content), [("created", {"tasks": [task]})])
+
+        detail_url = reverse("async_task_detail", kwargs={"pk": task["id"]})
+        response = await client.patch(
+            detail_url,
+            {"status": "completed"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+        self.assertEqual(
+            await self.next_events(content), [("updated", {"tasks": [response.json()]})]
+        )
+        await client.delete(detail_url, headers=self.headers)
+        self.assertEqual(await self.next_events(content), [("deleted", {"ids": [task["id"]]})])
+        await content.aclose()
+
+    @override_settings(TASK_EVENTS_QUEUE_SIZE=2)
+    async def test_slow_reader_gets_a_refresh(self):
+        content = await self.open_stream(AsyncClient(), headers=self.headers)
+        for i in range(5):
+            events.publish(self.user.pk, "deleted", {"ids": [i]})
+        self.assertEqual(await self.next_events(content), [("refresh", {})])
+
+        events.publish(self.user.pk, "deleted", {"ids": [5]})
+        self.assertEqual(await self.next_events(content), [("deleted", {"ids": [5]})])
+        await content.aclose()
+
+    @override_settings(TASK_EVENTS_HEARTBEAT=0.01)
+    async def test_heartbeat(self):
+        content = await self.open_stream(AsyncClient(), headers=self.headers)
+        self.assertEqual(await anext(content), events.HEARTBEAT_FRAME)
+        await content.aclose()
+
+    async def test_stream_ends_when_the_token_expires(self):
+        stream = events.stream(self.user.pk, expires_at=time.time() - 1)
+        self.assertEqual(await anext(stream), events.READY_FRAME)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+    async def test_closed_streams_unsubscribe(self):
+        first = events.stream(self.user.pk)
+        second = events.stream(self.user.pk)
+        await anext(first)
+        await anext(second)
+        hub = events.get_hub()
+        self.assertEqual(hub.connections(), 2)
+        await first.aclose()
+        self.assertEqual(hub.connections(), 1)
+        await second.aclose()
+        self.assertIsNone(hub.subscription)
+
+    def test_sync_and_bulk_writes_publish(self):
+        self.client.force_authenticate(self.user)
+        with mock.patch("apps.todo.events.publish") as publish:
+            task = self.client.post(
+                reverse("tasks"), {"title": "A", "description": "x"}, format="json"
+            ).data
+            detail_url = reverse("task_detail", kwargs={"pk": task["id"]})
+            self.client.patch(detail_url, {"title": "B"}, format="json")
+            self.client.delete(detail_url)
+            created = self.client.post(
+                reverse("tasks_bulk"), [{"title": "C", "description": "x"}], format="json"
+            ).data["results"]
+            self.client.delete(reverse("tasks_bulk"), [created[0]["id"]], format="json")
+        self.assertEqual(
+            [(owner, event) for (owner, event, data), _ in publish.call_args_list],
+            [
+                (self.user.pk, event)
+                for event in ("created", "updated", "deleted", "created", "deleted")
+            ],
+        )
+        self.assertEqual(publish.call_args_list[1].args[2]["tasks"][0]["title"], "B")
+        self.assertEqual(publish.call_args_list[4].args[2], {"ids": [created[0]["id"]]})
+
+    def test_import_publishes_one_refresh(self):
+        self.client.force_authenticate(self.user)
+        upload = SimpleUploadedFile("tasks.csv", b"title,description\nA,x\nB,x\n")
+        with mock.patch("apps.todo.events.publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse("task_imports"), {"file": upload}, format="multipart")
+        publish.assert_called_once_with(self.user.pk, "refresh", {})
+
+    @override_settings(
+        TASK_EVENTS_BROKER="apps.todo.events.RedisBroker",
+        TASK_EVENTS_BROKER_URL="redis://127.0.0.1:1",
+    )
+    def test_broker_errors_do_not_fail_writes(self):
+        self.client.force_authenticate(self.user)
+        with self.assertLogs("apps.todo.events", "WARNING"):
+            response = self.client.post(
+                reverse("tasks"), {"title": "A", "description": "x"}, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Task.objects.filter(owner=self.user).count(), 1)
+
+
+class ListenerTests(APITestCase):
+    async def test_overflow_is_replaced_by_one_refresh(self):
+        listener = events.Listener(3)
+        for i in range(3):
+            listener.put(b"frame %d" % i)
+        self.assertEqual(listener.drain(), [b"frame 0", b"frame 1", b"frame 2"])
+        for i in range(4):
+            listener.put(b"frame %d" % i)
+        self.assertEqual(listener.drain(), [events.REFRESH_FRAME])
+        self.assertEqual(listener.dropped, 3)
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.test import AsyncClient
+from apps.todo.models import Task
+from apps.todo.serializers import TaskSerializer
+from django.contrib.auth.models import User
+
+
+class TaskExportTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="testpass")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.tasks = [
+            Task.objects.create(
+                title="Pay rent",
+                description='Line one\nwith "quotes", commas',
+                status=Task.Status.PENDING,
+                priority=Task.Priority.HIGH,
+                due_date="2025-12-31T10:00:00Z",
+                owner=self.admin,
+            ),
+            Task.objects.create(
+                title="Water plants",
+                description="Ünïcode",
+                status=Task.Status.COMPLETED,
+                priority=Task.Priority.LOW,
+                owner=self.admin,
+            ),
+        ]
+        Task.objects.create(title="Other", description="Other", owner=self.user)
+        self.client.force_authenticate(self.admin)
+
+    def export(self, export_format, **params):
+        url = reverse("tasks_export", kwargs={"export_format": export_format})
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content).decode()
+
+    def expected(self, tasks):
+        return [
+            json.loads(json.dumps(TaskSerializer(task).data))
+            for task in Task.objects.filter(pk__in=[t.pk for t in tasks]).order_by("-created_at")
+        ]
+
+    def test_ndjson_matches_serializer(self):
+        lines = self.export("ndjson").splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.expected(self.tasks))
+
+    def test_csv_export(self):
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"))))
+        self.assertEqual(len(rows), 2)
+        expected = self.expected(self.tasks)
+        self.assertEqual(list(rows[0]), list(expected[0]))
+        self.assertEqual(rows[1]["description"], expected[1]["description"])
+        self.assertEqual(rows[1]["due_date"], expected[1]["due_date"])
+        self.assertEqual(rows[0]["due_date"], "")
+
+    def test_export_applies_filters(self):
+        lines = self.export("ndjson", status="pending", ordering="due_date").splitlines()
+        self.assertEqual([json.loads(line)["title"] for line in lines], ["Pay rent"])
+
+    def test_unsupported_format(self):
+        url = reverse("tasks_export", kwargs={"export_format": "xml"})
+        response = self.client.get(url, HTTP_ACCEPT="application/xml")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_requires_authentication(self):
+        self.client.force_authenticate(None)
+        url = reverse("tasks_export", kwargs={"export_format": "csv"})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        access = str(RefreshToken.for_user(self.admin).access_token)
+        response = await AsyncClient().get(
+            reverse("tasks_export", kwargs={"export_format": "ndjson"}),
+            headers={"Authorization": f"Bearer {access}"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.decode().splitlines()), 2)
@@ -0,0 +1,75 @@
+import json
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from apps.todo.models import Task, TaskImport
+from django.contrib.auth.models import User
+
+
+class TaskImportTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("task_imports")
+        self.admin = User.objects.create_user(username="admin", password="testpass")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, name, content):
+        upload = SimpleUploadedFile(name, content.encode())
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        detail_url = reverse("task_import_detail", kwargs={"pk": response.data["id"]})
+        return self.client.get(detail_url).data
+
+    def test_csv_import(self):
+        content = (
+            "title,description,status,priority,due_date\n"
+            "Pay rent,Monthly,pending,high,2025-12-31T10:00:00Z\n"
+            "Water plants,,completed,low,\n"
+            "Call mom,Weekly,,,\n"
+        )
+        result = self.upload("tasks.csv", content)
+        self.assertEqual(result["status"], "completed")
+        self.assertEqual(result["progress"], 100)
+        self.assertEqual(result["processed_rows"], 3)
+        self.assertEqual(result["created_rows"], 2)
+        self.assertEqual(result["error_rows"], 1)
+        self.assertEqual(result["errors"][0]["line"], 3)
+        self.assertIn("description", result["errors"][0]["errors"])
+
+        task = Task.objects.get(title="Call mom")
+        self.assertEqual((task.owner, task.status, task.priority), (self.admin, Task.Status.PENDING, Task.Priority.LOW))
+
+    @override_settings(TASK_IMPORT_BATCH_SIZE=2, TASK_IMPORT_MAX_ERRORS=1)
+    def test_ndjson_import_in_batches(self):
+        lines = [
+            json.dumps({"title": f"Task {i}", "description": "Imported"}) for i in range(5)
+        ]
+        lines += ["not json", json.dumps({"title": "", "description": "x"}), "", "[1]"]
+        result = self.upload("tasks.ndjson", "\n".join(lines))
+        self.assertEqual(result["created_rows"], 5)
+        self.assertEqual(result["error_rows"], 3)
+        self.assertEqual(result["errors"], [{"line": 6, "errors": "Invalid JSON object."}])
+        self.assertEqual(Task.objects.filter(owner=self.admin).count(), 5)
+
+    def test_rejects_unknown_file_types(self):
+        upload = SimpleUploadedFile("tasks.xlsx", b"data")
+        response = self.client.post(self.url, {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {}, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_imports_are_private(self):
+        result = self.upload("tasks.csv", "title,description\nA,B\n")
+        self.client.force_authenticate(self.user)
+        response = self.client.get(reverse("task_import_detail", kwargs={"pk": result["id"]}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.url).data, [])
+
+    def test_import_file_is_removed_after_completion(self):
+        result = self.upload("tasks.csv", "title,description\nA,B\n")
+        task_import = TaskImport.objects.get(pk=result["id"])
+        self.assertFalse(task_import.file.storage.exists(task_import.file.name))
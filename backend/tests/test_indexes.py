@@ -0,0 +1,78 @@
+import itertools
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+class TaskIndexCoverageTests(APITestCase):
+    """
+    Replays every filter/ordering combination ``TaskViewSet.get`` can build and
+    fails when SQLite answers one of them with a table scan or a sort.
+    """
+
+    orderings = [None, "created_at", "-created_at", "due_date", "-due_date", "priority", "-priority"]
+    statuses = [None, "pending"]
+    priorities = [None, "high"]
+    paginations = ["page", "cursor"]
+
+    def setUp(self):
+        self.tasks_url = reverse("tasks")
+        self.user = User.objects.create_user(username="admin", password="testpass")
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="Description",
+                status=list(Task.Status)[i % 3],
+                priority=list(Task.Priority)[i % 3],
+                owner=self.user,
+            )
+            for i in range(30)
+        )
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertIndexed(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.tasks_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        task_queries = [q["sql"] for q in queries if 'FROM "todo_task"' in q["sql"]]
+        self.assertTrue(task_queries)
+        for sql in task_queries:
+            for step in self.explain(sql):
+                self.assertNotRegex(step, r"^SCAN todo_task$", sql)
+                self.assertNotIn("TEMP B-TREE", step, sql)
+        return response
+
+    def test_owner_queries_use_indexes(self):
+        self.client.force_authenticate(self.user)
+        combinations = itertools.product(
+            self.orderings, self.statuses, self.priorities, self.paginations
+        )
+        for ordering, status_filter, priority, pagination in combinations:
+            params = {"pagination": pagination}
+            if ordering:
+                params["ordering"] = ordering
+            if status_filter:
+                params["status"] = status_filter
+            if priority:
+                params["priority"] = priority
+            with self.subTest(**params):
+                response = self.assertIndexed(params)
+                if pagination == "cursor" and response.data["next"]:
+                    query = parse_qs(urlparse(response.data["next"]).query)
+                    self.assertIndexed({**params, "cursor": query["cursor"][0]})
+
+    def test_anonymous_list_uses_index(self):
+        self.assertIndexed({})
@@ -1,6 +1,15 @@
+import threading
+import unittest
+from unittest import mock
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from apps.users.models import users_by_email
+from apps.users.throttling import SlidingWindowLimiter
 from django.contrib.auth.models import User
 
 
@@ -29,3 +38,124 @@ class LoginTests(APITestCase):
         response = self.client.post(self.url, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data["non_field_errors"][0], "User not found.")
+
+    def test_login_email_is_case_insensitive(self):
+        data = {"email": " Admin@Gmail.com", "password": "Qwerty1234@"}
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_email_is_unique_ignoring_case(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username="other", email="ADMIN@gmail.com")
+        # Blank emails are not part of the constraint.
+        User.objects.create_user(username="blank1")
+        User.objects.create_user(username="blank2")
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+    def test_email_lookup_uses_index(self):
+        sql, params = users_by_email("admin@gmail.com").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("auth_user_email_ci_uniq", plan)
+
+    @override_settings(
+        PASSWORD_HASHERS=[
+            "apps.users.hashers.PBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.MD5PasswordHasher",
+        ],
+        PASSWORD_PBKDF2_ITERATIONS=1000,
+    )
+    def test_password_is_rehashed_on_login(self):
+        data = {"email": "admin@gmail.com", "password": "Qwerty1234@"}
+        self.assertTrue(self.user.password.startswith("md5$"))
+
+        self.client.post(self.url, data, format="json")
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+        with self.settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    LOGIN_RATE_LIMITS={"ip": "5/min", "email": "3/min"},
+)
+class LoginRateLimitTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("login")
+        User.objects.create_user(
+            username="admin", email="admin@gmail.com", password="Qwerty1234@"
+        )
+
+    def login(self, email, password="wrong", ip="10.0.0.1"):
+        data = {"email": email, "password": password}
+        return self.client.post(self.url, data, format="json", REMOTE_ADDR=ip)
+
+    def test_limits_attempts_per_email(self):
+        for _ in range(3):
+            self.assertEqual(self.login("admin@gmail.com").status_code, 400)
+        response = self.login("ADMIN@gmail.com", "Qwerty1234@", ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response.headers)
+
+        response = self.login("other@gmail.com", ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_limits_attempts_per_ip(self):
+        for i in range(5):
+            self.assertEqual(self.login(f"user{i}@gmail.com").status_code, 400)
+        response = self.login("admin@gmail.com", "Qwerty1234@")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_throttled_requests_skip_the_password_check(self):
+        for _ in range(3):
+            self.login("admin@gmail.com")
+        with mock.patch.object(User, "check_password") as check_password:
+            self.login("admin@gmail.com", ip="10.0.0.2")
+        check_password.assert_not_called()
+
+    def test_fails_open_only_on_cache_errors(self):
+        limiter = SlidingWindowLimiter("test", 1, 60)
+        down = ConnectionError("down")
+        with mock.patch.object(cache, "incr", side_effect=down), self.assertLogs(
+            "apps.users.throttling", "WARNING"
+        ):
+            self.assertEqual(limiter.hit("key"), 0)
+        with mock.patch.object(cache, "incr", side_effect=TypeError("bug")):
+            with self.assertRaises(TypeError):
+                limiter.hit("key")
+
+    def test_window_slides(self):
+        limiter = SlidingWindowLimiter("test", 4, 60)
+        for _ in range(4):
+            self.assertEqual(limiter.hit("key", now=600), 0)
+        self.assertEqual(limiter.hit("key", now=630), 30)
+        # The rejected attempt counted too; half of the previous window
+        # still does: 5 * 0.5 + 2 > 4.
+        self.assertEqual(limiter.hit("key", now=690), 0)
+        self.assertEqual(limiter.hit("key", now=690), 0)
+        # Until 5 * (1 - t) + 3 <= 4, at t = 0.8 (give or take a float rounding).
+        self.assertAlmostEqual(limiter.hit("key", now=690), 18, delta=1)
+        self.assertEqual(limiter.hit("key", now=710), 0)
+
+    def test_concurrent_hits_stay_under_limit(self):
+        limiter = SlidingWindowLimiter("test", 4, 60)
+        barrier = threading.Barrier(10)
+        results = []
+
+        def attempt():
+            barrier.wait()
+            results.append(limiter.hit("key", now=600))
+
+        threads = [threading.Thread(target=attempt) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results.count(0), 4)
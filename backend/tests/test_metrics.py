@@ -0,0 +1,139 @@
+import re
+import tempfile
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.test import SimpleTestCase, override_settings
+from apps.metrics.registry import MetricsRegistry, quantile, registry
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+def sample_value(text, line_prefix):
+    match = re.search(rf"^{re.escape(line_prefix)} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else None
+
+
+@override_settings(METRICS_SAMPLE_RATE=1.0, METRICS_TOKEN="secret")
+class MetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(username="user", password="testpass")
+        for i in range(3):
+            Task.objects.create(title=f"Task {i}", description="x", owner=self.user)
+        self.client.force_authenticate(self.user)
+
+    def scrape(self):
+        response = self.client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return response.content.decode()
+
+    def test_records_per_endpoint(self):
+        for _ in range(2):
+            self.client.get(reverse("tasks"))
+        self.client.get(reverse("task_detail", kwargs={"pk": 999999}))
+        self.client.get("/no-such-page/")
+        text = self.scrape()
+
+        labels = 'endpoint="tasks",method="GET"'
+        self.assertEqual(
+            sample_value(text, f'http_requests_total{{{labels},status="2xx"}}'), 2
+        )
+        self.assertEqual(
+            sample_value(
+                text, 'http_requests_total{endpoint="task_detail",method="GET",status="4xx"}'
+            ),
+            1,
+        )
+        self.assertIn('endpoint="unmatched"', text)
+        self.assertNotIn('endpoint="metrics"', text)
+
+        self.assertEqual(sample_value(text, f"http_request_duration_seconds_count{{{labels}}}"), 2)
+        self.assertEqual(
+            sample_value(text, f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}}'), 2
+        )
+        # COUNT(*) and the page on each request.
+        self.assertEqual(sample_value(text, f"http_request_db_queries_sum{{{labels}}}"), 4)
+        self.assertGreater(sample_value(text, f"http_request_db_duration_seconds_sum{{{labels}}}"), 0)
+        self.assertEqual(
+            sample_value(text, f"http_request_serializer_duration_seconds_count{{{labels}}}"), 2
+        )
+        self.assertGreater(sample_value(text, f"http_response_size_bytes_sum{{{labels}}}"), 0)
+        for q in ("0.5", "0.95", "0.99"):
+            self.assertIsNotNone(
+                sample_value(
+                    text, f'http_request_duration_seconds_quantile{{{labels},quantile="{q}"}}'
+                )
+            )
+
+    def test_login_serializer_time(self):
+        self.client.post(
+            reverse("login"), {"email": "nobody@example.com", "password": "x"}, format="json"
+        )
+        text = self.scrape()
+        labels = 'endpoint="login",method="POST"'
+        self.assertEqual(sample_value(text, f"http_request_serializer_duration_seconds_count{{{labels}}}"), 1)
+        self.assertGreater(
+            sample_value(text, f"http_request_serializer_duration_seconds_sum{{{labels}}}"), 0
+        )
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_still_timed(self):
+        self.client.get(reverse("tasks"))
+        text = self.scrape()
+        labels = 'endpoint="tasks",method="GET"'
+        self.assertEqual(sample_value(text, f"http_request_duration_seconds_count{{{labels}}}"), 1)
+        self.assertIsNone(sample_value(text, f"http_request_db_queries_count{{{labels}}}"))
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_no_token_is_only_served_in_debug(self):
+        with self.assertLogs("apps.metrics.views", "WARNING"):
+            response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, status.HTTP_200_OK)
+
+    async def test_async_view(self):
+        await self.async_client.get(reverse("async_tasks"))
+        text = registry.render()
+        labels = 'endpoint="async_tasks",method="GET"'
+        self.assertEqual(sample_value(text, f"http_request_db_queries_sum{{{labels}}}"), 2)
+
+
+class MetricsRegistryTests(SimpleTestCase):
+    def test_workers_are_merged_through_files(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(
+            METRICS_DIR=directory
+        ):
+            labels = (("endpoint", "tasks"), ("method", "GET"))
+            workers = [MetricsRegistry(), MetricsRegistry()]
+            for worker, duration in zip(workers, (0.002, 0.2)):
+                worker.observe("http_request_duration_seconds", labels, duration)
+                worker.inc("http_requests_total", labels)
+            # Each worker process writes its own file.
+            workers[0].flush()
+            with mock.patch("os.getpid", return_value=-1):
+                workers[1].flush()
+            text = workers[0].render()
+
+        prefix = 'endpoint="tasks",method="GET"'
+        self.assertEqual(sample_value(text, f"http_requests_total{{{prefix}}}"), 2)
+        self.assertEqual(sample_value(text, f"http_request_duration_seconds_count{{{prefix}}}"), 2)
+        self.assertEqual(
+            sample_value(text, f'http_request_duration_seconds_bucket{{{prefix},le="0.0025"}}'), 1
+        )
+
+    def test_quantile(self):
+        buckets = (1, 2, 4)
+        self.assertEqual(quantile(0.5, buckets, [0, 10, 0, 0]), 1.5)
+        self.assertEqual(quantile(0.99, buckets, [0, 0, 0, 5]), 4)
+        self.assertIsNone(quantile(0.5, buckets, [0, 0, 0, 0]))
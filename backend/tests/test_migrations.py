@@ -0,0 +1,89 @@
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.contrib.auth.models import User
+
+
+class TaskChoicesMigrationTests(TransactionTestCase):
+    before = [("todo", "0004_taskimport")]
+    after = [("todo", "0005_task_integer_choices")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def setUp(self):
+        self.latest = MigrationExecutor(connection).loader.graph.leaf_nodes()
+
+    def tearDown(self):
+        self.migrate(self.latest)
+
+    def test_codes_become_integers_and_stay_searchable(self):
+        apps = self.migrate(self.before)
+        owner = User.objects.create_user(username="owner")
+        OldTask = apps.get_model("todo", "Task")
+        for status, priority in [("pending", "high"), ("in_progress", "low"), ("done", "x")]:
+            OldTask.objects.create(
+                title=status,
+                description="",
+                status=status,
+                priority=priority,
+                owner_id=owner.pk,
+            )
+
+        apps = self.migrate(self.after)
+        Task = apps.get_model("todo", "Task")
+        self.assertEqual(
+            list(Task.objects.order_by("id").values_list("title", "status", "priority")),
+            [("pending", 1, 3), ("in_progress", 2, 1), ("done", 1, 1)],
+        )
+
+        from apps.todo.search import search_tasks
+
+        tasks = Task.objects.filter(owner_id=owner.pk)
+        matches = search_tasks(tasks, "progress", rank=False).values_list("title", flat=True)
+        self.assertEqual(list(matches), ["in_progress"])
+
+        apps = self.migrate(self.before)
+        OldTask = apps.get_model("todo", "Task")
+        self.assertEqual(
+            list(OldTask.objects.order_by("id").values_list("status", "priority")),
+            [("pending", "high"), ("in_progress", "low"), ("pending", "low")],
+        )
+
+
+class EmailIndexMigrationTests(TransactionTestCase):
+    before = [("users", "0001_lazyuser")]
+    after = [("users", "0002_user_email_ci_unique")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+
+    def setUp(self):
+        self.latest = MigrationExecutor(connection).loader.graph.leaf_nodes()
+
+    def tearDown(self):
+        self.migrate(self.latest)
+
+    def test_duplicate_emails_are_named_before_indexing(self):
+        self.migrate(self.before)
+        first = User.objects.create_user(username="first", email="Ann@example.com")
+        User.objects.create_user(username="second", email="ann@EXAMPLE.com")
+        User.objects.create_user(username="blank1", email="")
+        User.objects.create_user(username="blank2", email="")
+
+        with self.assertRaisesMessage(IntegrityError, "ann@example.com: users ") as raised:
+            self.migrate(self.after)
+        self.assertIn(f"{first.pk} (first)", str(raised.exception))
+        self.assertIn("(second)", str(raised.exception))
+        self.assertNotIn("blank", str(raised.exception))
+
+        first.email = "ann.first@example.com"
+        first.save()
+        self.migrate(self.after)
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(username="third", email="ANN@example.com")
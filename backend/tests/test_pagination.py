@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.todo.models import Task
+from apps.todo.pagination import TaskCursorPagination
+from django.contrib.auth.models import User
+
+
+class CursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.tasks_url = reverse("tasks")
+        self.user = User.objects.create_user(username="admin", password="testpass")
+        now = timezone.now()
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {i}",
+                description="Description",
+                priority=list(Task.Priority)[i % 3],
+                due_date=None if i % 4 == 0 else now + timedelta(days=i % 5),
+                owner=self.user,
+            )
+            for i in range(25)
+        )
+        self.client.force_authenticate(self.user)
+
+    def walk(self, params, direction="next"):
+        ids = []
+        response = self.client.get(self.tasks_url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids.extend(task["id"] for task in response.data["results"])
+            if not response.data[direction]:
+                return ids, response
+            response = self.client.get(response.data[direction])
+
+    def test_cursor_mode_skips_count(self):
+        response = self.client.get(self.tasks_url, {"pagination": "cursor"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertEqual(len(response.data["results"]), 10)
+        self.assertIsNone(response.data["previous"])
+        self.assertIsNotNone(response.data["next"])
+
+    def test_cursor_page_issues_no_count(self):
+        for authenticated in (True, False):
+            if not authenticated:
+                self.client.force_authenticate(None)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.tasks_url, {"pagination": "cursor"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # The page query alone, which also validates the page.
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn("COUNT", queries[0]["sql"].upper())
+
+            with self.assertNumQueries(1):
+                not_modified = self.client.get(
+                    self.tasks_url, {"pagination": "cursor"}, HTTP_IF_NONE_MATCH=response["ETag"]
+                )
+            self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_async_cursor_page_issues_no_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("async_tasks"), {"pagination": "cursor"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["results"]), 10)
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("COUNT", queries[0]["sql"].upper())
+
+    def test_cursor_page_etag_changes_with_its_rows(self):
+        params = {"pagination": "cursor", "page_size": 5}
+        response = self.client.get(self.tasks_url, params)
+        first = response.data["results"][0]["id"]
+
+        def revalidate():
+            return self.client.get(self.tasks_url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+        # Rows off the page leave it alone.
+        Task.objects.filter(pk=response.data["results"][-1]["id"] - 10).delete()
+        self.assertEqual(revalidate().status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(reverse("task_detail", kwargs={"pk": first}), {"title": "Renamed"})
+        response = revalidate()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "Renamed")
+
+        self.client.delete(reverse("task_detail", kwargs={"pk": first}))
+        response = revalidate()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data["results"][0]["id"], first)
+
+        self.client.post(self.tasks_url, {"title": "Newest", "description": "New"})
+        response = revalidate()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "Newest")
+
+    def test_walk_matches_ordering(self):
+        for ordering in ["created_at", "-created_at", "due_date", "-due_date", "priority", "-priority"]:
+            ids, _ = self.walk({"pagination": "cursor", "ordering": ordering, "page_size": 7})
+            self.assertEqual(len(ids), 25)
+            self.assertEqual(len(set(ids)), 25)
+            tie_breaker = "-id" if ordering.startswith("-") else "id"
+            expected = Task.objects.order_by(ordering, tie_breaker)
+            self.assertEqual(ids, list(expected.values_list("id", flat=True)))
+
+    def test_walk_backwards(self):
+        forward, last = self.walk({"pagination": "cursor", "ordering": "due_date", "page_size": 6})
+        backward = list(reversed([task["id"] for task in last.data["results"]]))
+        response = self.client.get(last.data["previous"])
+        while True:
+            backward.extend(reversed([task["id"] for task in response.data["results"]]))
+            if not response.data["previous"]:
+                break
+            response = self.client.get(response.data["previous"])
+        self.assertEqual(list(reversed(backward)), forward)
+
+    def test_null_due_dates_sort_where_the_database_puts_them(self):
+        # Documented in the README: NULLs come first on SQLite, last on
+        # PostgreSQL, and the cursor follows the database either way.
+        nulls_first = connection.vendor == "sqlite"
+        for ordering, first in (("due_date", nulls_first), ("-due_date", not nulls_first)):
+            ids, _ = self.walk({"pagination": "cursor", "ordering": ordering, "page_size": 4})
+            due_dates = dict(Task.objects.values_list("id", "due_date"))
+            missing = [due_dates[pk] is None for pk in ids]
+            self.assertEqual(missing, sorted(missing, reverse=first))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.tasks_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_null_cursor_value_on_a_required_field(self):
+        cursor = TaskCursorPagination.make_cursor(None, 1)
+        for ordering in ("created_at", "priority"):
+            response = self.client.get(
+                self.tasks_url, {"pagination": "cursor", "ordering": ordering, "cursor": cursor}
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.data, {"detail": "Invalid cursor."})
+        response = self.client.get(
+            self.tasks_url, {"pagination": "cursor", "ordering": "due_date", "cursor": cursor}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TASK_PAGINATION_MODE="cursor")
+    def test_cursor_mode_from_setting(self):
+        response = self.client.get(self.tasks_url)
+        self.assertNotIn("count", response.data)
+        response = self.client.get(self.tasks_url, {"pagination": "page"})
+        self.assertEqual(response.data["count"], 25)
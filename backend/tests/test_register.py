@@ -1,6 +1,10 @@
+from unittest import mock
+
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
+from django.core import mail
+from apps.users.serializers import RegisterSerializer
 from django.contrib.auth.models import User
 
 
@@ -68,3 +72,41 @@ class SimpleRegisterTests(APITestCase):
         response = self.client.post(self.url, self.exist_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("email", response.data)
+
+    def test_register_duplicate_email_ignores_case(self):
+        data = self.valid_data.copy()
+        data["email"] = "Admin@Gmail.com"
+        response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"email": ["Email already exists"]})
+
+    def test_uniqueness_is_checked_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.post(self.url, self.exist_data, format="json")
+        self.assertEqual(
+            response.data,
+            {"email": ["Email already exists"], "username": ["Username already exists"]},
+        )
+
+    def test_integrity_error_maps_to_the_same_message(self):
+        # Another request registered the email between validate() and save().
+        with mock.patch.object(
+            RegisterSerializer, "find_conflicts", side_effect=[set(), {"email"}]
+        ):
+            data = self.valid_data.copy()
+            data["email"] = "admin@gmail.com"
+            response = self.client.post(self.url, data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"email": ["Email already exists"]})
+
+    def test_welcome_email_is_sent_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(self.url, self.valid_data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(mail.outbox, [])
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.valid_data["email"]])
+        self.assertIn(self.valid_data["username"], mail.outbox[0].body)
@@ -0,0 +1,171 @@
+import datetime
+import unittest
+from smtplib import SMTPException, SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
+
+from rest_framework.test import APITestCase
+from django.core import mail
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from apps.todo import reminders
+from apps.todo.models import Task, TaskReminder
+from apps.todo.tasks import send_task_reminders
+from django.contrib.auth.models import User
+
+
+class ReminderTests(APITestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="testpass"
+        )
+        self.other = User.objects.create_user(
+            username="other", email="other@example.com", password="testpass"
+        )
+        self.overdue = self.task("Overdue", hours=-3)
+        self.soon = self.task("Soon", hours=5)
+        self.task("Later", hours=48)
+        self.task("Long overdue", hours=-24 * 30)
+        self.task("Done", hours=2, status=Task.Status.COMPLETED)
+        self.task("Undated", hours=None)
+        self.task("Theirs", hours=1, owner=self.other)
+        no_email = User.objects.create_user(username="nomail", password="testpass")
+        self.task("No email", hours=1, owner=no_email)
+
+    def task(self, title, hours, owner=None, status=Task.Status.PENDING):
+        due_date = None if hours is None else self.now + datetime.timedelta(hours=hours)
+        return Task.objects.create(
+            title=title,
+            description="x",
+            due_date=due_date,
+            status=status,
+            owner=owner or self.user,
+        )
+
+    def send(self, now=None):
+        return reminders.send_reminders(now or self.now)
+
+    def test_one_digest_per_owner(self):
+        self.assertEqual(self.send(), 2)
+        digests = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(set(digests), {"user@example.com", "other@example.com"})
+
+        digest = digests["user@example.com"]
+        self.assertEqual(digest.subject, "2 tasks need your attention")
+        self.assertIn("Overdue:\n- Overdue (due ", digest.body)
+        self.assertIn("Due in the next 24 hours:\n- Soon (due ", digest.body)
+        for title in ("Later", "Long overdue", "Done", "Undated"):
+            self.assertNotIn(title, digest.body)
+        self.assertEqual(digests["other@example.com"].subject, "1 task needs your attention")
+
+    def test_reruns_send_nothing_new(self):
+        self.send()
+        mail.outbox.clear()
+        self.assertEqual(self.send(), 0)
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(TaskReminder.objects.count(), 3)
+
+    def test_reminds_again_when_due_or_moved(self):
+        self.send()
+        mail.outbox.clear()
+        # "Soon" becomes overdue, then "Overdue" gets a new due date.
+        later = self.now + datetime.timedelta(hours=6)
+        self.assertEqual(self.send(later), 2)
+        self.assertIn("Overdue:\n- Soon", mail.outbox[0].body)
+
+        self.overdue.due_date = later + datetime.timedelta(hours=1)
+        self.overdue.save()
+        mail.outbox.clear()
+        self.assertEqual(self.send(later), 1)
+        self.assertIn("Due in the next 24 hours:\n- Overdue", mail.outbox[0].body)
+
+    @override_settings(TASK_REMINDER_BATCH_SIZE=1)
+    def test_batches_share_one_connection(self):
+        real = mail.get_connection()
+        with mock.patch.object(
+            reminders, "get_connection", return_value=real
+        ) as get_connection, mock.patch.object(real, "open", wraps=real.open) as opened:
+            self.assertEqual(self.send(), 2)
+        get_connection.assert_called_once_with()
+        self.assertEqual(opened.call_count, 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_failed_send_is_retried(self):
+        with mock.patch.object(
+            mail.get_connection().__class__, "send_messages", side_effect=SMTPException
+        ):
+            with self.assertRaises(SMTPException):
+                self.send()
+        self.assertFalse(TaskReminder.objects.exists())
+        self.assertEqual(self.send(), 2)
+
+    def failing_send(self, recipient, error):
+        """``send_messages`` that fails with ``error`` for ``recipient``'s digest."""
+        send = mail.get_connection().__class__.send_messages
+
+        def send_messages(connection, messages):
+            if messages[0].to == [recipient]:
+                raise error
+            return send(connection, messages)
+
+        return mock.patch.object(
+            mail.get_connection().__class__,
+            "send_messages",
+            autospec=True,
+            side_effect=send_messages,
+        )
+
+    def test_refused_digest_does_not_stop_the_others(self):
+        error = SMTPRecipientsRefused({"user@example.com": (550, b"No such user")})
+        with self.failing_send("user@example.com", error), self.assertLogs(
+            "apps.todo.reminders", "WARNING"
+        ):
+            self.assertEqual(self.send(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [["other@example.com"]])
+        self.assertEqual(TaskReminder.objects.count(), 1)
+
+        mail.outbox.clear()
+        self.assertEqual(self.send(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [["user@example.com"]])
+
+    def test_partial_send_failure_records_what_was_sent(self):
+        # The connection drops after the first digest: it is not sent again.
+        with self.failing_send("other@example.com", SMTPServerDisconnected()):
+            with self.assertRaises(SMTPServerDisconnected):
+                self.send()
+        self.assertEqual([message.to for message in mail.outbox], [["user@example.com"]])
+        self.assertEqual(
+            set(TaskReminder.objects.values_list("task_id", flat=True)),
+            {self.overdue.pk, self.soon.pk},
+        )
+
+        mail.outbox.clear()
+        self.assertEqual(self.send(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [["other@example.com"]])
+
+    @override_settings(TASK_REMINDER_MAX_LISTED=1)
+    def test_long_digests_are_truncated(self):
+        self.send()
+        digest = next(message for message in mail.outbox if message.to == ["user@example.com"])
+        self.assertIn("- Overdue", digest.body)
+        self.assertNotIn("- Soon", digest.body)
+        self.assertIn("...and 1 more.", digest.body)
+        self.assertEqual(TaskReminder.objects.filter(task_id=self.soon.pk).count(), 1)
+
+    def test_old_reminders_are_pruned(self):
+        self.send()
+        self.send(self.now + datetime.timedelta(days=30))
+        self.assertFalse(TaskReminder.objects.exists())
+
+    def test_celery_task(self):
+        self.assertEqual(send_task_reminders.delay().get(), 2)
+        self.assertEqual(len(mail.outbox), 2)
+
+    @unittest.skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN is SQLite syntax")
+    def test_scan_uses_the_due_date_index(self):
+        sql, params = reminders.due_tasks(self.now).query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        self.assertIn("SEARCH todo_task USING INDEX task_due_idx (due_date>? AND due_date<?)", plan)
@@ -0,0 +1,126 @@
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.core.cache import caches
+from django.db import router, transaction
+from django.test import AsyncClient, override_settings
+from apps.todo.cache import task_cache
+from apps.todo.models import Task, TaskImport
+from apps.todo.routers import use_primary
+from apps.users.authentication import user_states
+from django.contrib.auth.models import User
+
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(
+    DATABASE_REPLICAS=["replica"], DATABASE_REPLICA_PIN_SECONDS=60, CACHES=CACHES
+)
+class ReplicaRoutingTests(APITransactionTestCase):
+    # The replica starts empty and is never written to by the app, like one
+    # that has not caught up yet; tasks only it holds show where a read went.
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        caches["default"].clear()
+        task_cache.reset()
+        user_states.clear()
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.other = User.objects.create_user(username="other", password="testpass")
+        for user in (self.user, self.other):
+            User.objects.using("replica").create(pk=user.pk, username=user.username)
+        self.task = Task.objects.create(title="Primary", description="x", owner=self.user)
+        Task.objects.using("replica").create(
+            pk=self.task.pk, title="Replica", description="x", owner_id=self.user.pk
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization(self.user))
+
+    def authorization(self, user):
+        return f"Bearer {RefreshToken.for_user(user).access_token}"
+
+    def titles(self, response):
+        return sorted(task["title"] for task in response.json()["results"])
+
+    def test_router(self):
+        self.assertEqual(router.db_for_read(Task), "replica")
+        self.assertEqual(router.db_for_write(Task), "default")
+        self.assertEqual(router.db_for_read(User), "default")
+        self.assertEqual(router.db_for_read(TaskImport), "default")
+        with use_primary():
+            self.assertEqual(router.db_for_read(Task), "default")
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(Task), "default")
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(router.db_for_read(Task), "default")
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.titles(self.client.get(reverse("tasks"))), ["Replica"])
+        response = self.client.get(reverse("task_detail", kwargs={"pk": self.task.pk}))
+        self.assertEqual(response.json()["title"], "Replica")
+
+    def test_read_your_writes(self):
+        response = self.client.post(
+            reverse("tasks"), {"title": "New", "description": "y"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Task.objects.using("replica").filter(title="New").exists())
+
+        # The writer now reads from the primary, everyone else still from
+        # the replica.
+        self.assertEqual(
+            self.titles(self.client.get(reverse("tasks"))), ["New", "Primary"]
+        )
+        self.client.credentials()
+        self.assertEqual(self.titles(self.client.get(reverse("tasks"))), ["Replica"])
+
+    def test_replica_reads_do_not_fill_the_shared_detail_cache(self):
+        url = reverse("task_detail", kwargs={"pk": self.task.pk})
+        response = self.client.patch(url, {"title": "Changed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # An unpinned reader still sees the lagging replica...
+        anonymous = self.client_class()
+        self.assertEqual(anonymous.get(url).json()["title"], "Replica")
+        # ...without leaving its copy in the cache for the writer.
+        self.assertEqual(self.client.get(url).json()["title"], "Changed")
+
+        async_url = reverse("async_task_detail", kwargs={"pk": self.task.pk})
+        self.client.patch(async_url, {"title": "Again"}, format="json")
+        self.assertEqual(anonymous.get(async_url).json()["title"], "Replica")
+        self.assertEqual(self.client.get(async_url).json()["title"], "Again")
+
+    def test_pin_expires(self):
+        with override_settings(DATABASE_REPLICA_PIN_SECONDS=0):
+            self.client.post(
+                reverse("tasks"), {"title": "New", "description": "y"}, format="json"
+            )
+        self.assertEqual(self.titles(self.client.get(reverse("tasks"))), ["Replica"])
+
+    def test_failed_write_does_not_pin(self):
+        response = self.client.post(reverse("tasks"), {"title": ""}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.titles(self.client.get(reverse("tasks"))), ["Replica"])
+
+    def test_writes_read_from_primary(self):
+        # Only on the primary, so a PATCH looking it up on the replica would 404.
+        task = Task.objects.create(title="Fresh", description="x", owner=self.user)
+        url = reverse("task_detail", kwargs={"pk": task.pk})
+        response = self.client.patch(url, {"status": "completed"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["title"], "Fresh")
+
+    async def test_async_view(self):
+        client = AsyncClient()
+        headers = {"Authorization": self.authorization(self.user)}
+        response = await client.get(reverse("async_tasks"), headers=headers)
+        self.assertEqual(self.titles(response), ["Replica"])
+        response = await client.post(
+            reverse("async_tasks"),
+            {"title": "New", "description": "y"},
+            content_type="application/json",
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        response = await client.get(reverse("async_tasks"), headers=headers)
+        self.assertEqual(self.titles(response), ["New", "Primary"])
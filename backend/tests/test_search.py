@@ -0,0 +1,61 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from apps.todo.models import Task
+from django.contrib.auth.models import User
+
+
+class TaskSearchTests(APITestCase):
+    def setUp(self):
+        self.tasks_url = reverse("tasks")
+        self.user = User.objects.create_user(username="admin", password="testpass")
+        self.other = User.objects.create_user(username="user", password="testpass")
+        self.body_match = Task.objects.create(
+            title="Weekly chores",
+            description="Buy groceries and clean the kitchen",
+            owner=self.user,
+        )
+        self.title_match = Task.objects.create(
+            title="Groceries",
+            description="Milk, eggs, bread",
+            status=Task.Status.IN_PROGRESS,
+            owner=self.user,
+        )
+        Task.objects.create(
+            title="Groceries", description="Someone else's list", owner=self.other
+        )
+        self.client.force_authenticate(self.user)
+
+    def search(self, query, **params):
+        response = self.client.get(self.tasks_url, {"search": query, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task["id"] for task in response.data["results"]]
+
+    def test_search_ranks_title_matches_first(self):
+        self.assertEqual(self.search("groceries"), [self.title_match.id, self.body_match.id])
+
+    def test_search_matches_word_prefixes(self):
+        self.assertEqual(self.search("groc"), [self.title_match.id, self.body_match.id])
+        self.assertEqual(self.search("KITCH"), [self.body_match.id])
+
+    def test_search_requires_every_word(self):
+        self.assertEqual(self.search("groceries kitchen"), [self.body_match.id])
+
+    def test_search_matches_status(self):
+        self.assertEqual(self.search("in_progress"), [self.title_match.id])
+
+    def test_search_keeps_explicit_ordering(self):
+        ids = self.search("groceries", ordering="created_at")
+        self.assertEqual(ids, [self.body_match.id, self.title_match.id])
+
+    def test_search_without_words_falls_back(self):
+        self.assertEqual(self.search(","), [self.title_match.id])
+
+    def test_search_index_follows_writes(self):
+        self.title_match.title = "Hardware store"
+        self.title_match.save()
+        self.assertEqual(self.search("hardware"), [self.title_match.id])
+        self.assertEqual(self.search("groceries"), [self.body_match.id])
+
+        self.body_match.delete()
+        self.assertEqual(self.search("groceries"), [])
@@ -0,0 +1,107 @@
+import datetime
+import json
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.test import AsyncClient, SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from apps.todo import renderers
+from apps.todo.models import Task
+from apps.todo.renderers import FastJSONRenderer
+from apps.todo.rows import task_rows, to_records
+from apps.todo.serializers import TaskSerializer
+from django.contrib.auth.models import User
+
+
+class TaskRowSerializationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="testpass")
+        titles = ["Plain", 'Quotes " and \\ slashes', "Ünïcode ✓ 😀", "Line\u2028sep\u2029"]
+        due_dates = [
+            None,
+            datetime.datetime(2025, 12, 31, 10, 0, tzinfo=datetime.timezone.utc),
+            datetime.datetime(2025, 6, 1, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        ]
+        for i, title in enumerate(titles * 3):
+            Task.objects.create(
+                title=title,
+                description=f"Task {i}\n",
+                status=list(Task.Status)[i % 3],
+                priority=list(Task.Priority)[i % 3],
+                due_date=due_dates[i % 3],
+                owner=self.user,
+            )
+        self.client.force_authenticate(self.user)
+
+    def reference(self, content):
+        """``content`` re-rendered the old way: TaskSerializer and JSONRenderer."""
+        data = json.loads(content)
+        tasks = Task.objects.in_bulk([row["id"] for row in data["results"]])
+        data["results"] = TaskSerializer(
+            [tasks[row["id"]] for row in data["results"]], many=True
+        ).data
+        return JSONRenderer().render(data)
+
+    def test_list_is_byte_compatible(self):
+        responses = []
+        for params in [
+            {"page_size": 100},
+            {"page": 2, "page_size": 5, "ordering": "due_date"},
+            {"pagination": "cursor", "ordering": "-priority"},
+            {"search": "slashes"},
+        ]:
+            response = self.client.get(reverse("tasks"), params)
+            self.assertTrue(response.data["results"])
+            self.assertEqual(response.content, self.reference(response.content))
+            responses.append(response.content)
+        self.assertIn(b"Line\\u2028sep\\u2029", responses[0])
+
+    def test_other_time_zone(self):
+        with timezone.override("Asia/Kolkata"):
+            response = self.client.get(reverse("tasks"), {"page_size": 100})
+            self.assertIn(b"+05:30", response.content)
+            self.assertEqual(response.content, self.reference(response.content))
+
+    async def test_async_list(self):
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        response = await AsyncClient().get(
+            reverse("async_tasks"), {"page_size": 100}, headers=headers
+        )
+        reference = await sync_to_async(self.reference)(response.content)
+        self.assertEqual(response.content, reference)
+
+    def test_to_records_selected_fields(self):
+        fields = ("id", "status", "due_date")
+        records = to_records(task_rows(Task.objects.order_by("id"), fields), fields)
+        task = Task.objects.order_by("id").first()
+        self.assertEqual(records[0], {"id": task.pk, "status": "pending", "due_date": None})
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_matches_json_renderer(self):
+        data = {
+            "detail": gettext_lazy("Not found."),
+            0: ["int keys"],
+            "when": datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2025, 1, 2),
+            "amount": Decimal("1.50"),
+            "nested": [None, True, 1.5, " "],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_falls_back_to_json_renderer(self):
+        data = {"a": [1, 2]}
+        context = {"indent": 2}
+        self.assertEqual(
+            FastJSONRenderer().render(data, renderer_context=context),
+            JSONRenderer().render(data, renderer_context=context),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(FastJSONRenderer().render(data), b'{"a":[1,2]}')
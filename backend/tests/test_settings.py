@@ -0,0 +1,75 @@
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase
+
+from config.settings.database import (
+    database_from_env,
+    databases_from_env,
+    sqlite_database,
+)
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    def test_sqlite_is_the_default(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            database = database_from_env("sqlite", "db.sqlite3")
+        self.assertEqual(database["ENGINE"], "django.db.backends.sqlite3")
+        self.assertEqual(database["NAME"], "db.sqlite3")
+        self.assertNotIn("OPTIONS", database)
+
+    def test_tuned_sqlite_applies_pragmas(self):
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.dict(
+            os.environ, {"SQLITE_BUSY_TIMEOUT": "7"}, clear=True
+        ):
+            settings_dict = sqlite_database(str(Path(tmp) / "db.sqlite3"), tuned=True)
+            wrapper = DatabaseWrapper({**settings_dict, "TIME_ZONE": None}, "tuned")
+            connection = wrapper.get_new_connection(wrapper.get_connection_params())
+            try:
+                pragmas = {
+                    name: connection.execute(f"PRAGMA {name}").fetchone()[0]
+                    for name in ("journal_mode", "synchronous", "busy_timeout")
+                }
+                self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+            finally:
+                connection.close()
+        # synchronous=1 is NORMAL.
+        self.assertEqual(pragmas, {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 7000})
+        self.assertGreater(settings_dict["CONN_MAX_AGE"], 0)
+
+    def test_postgresql_uses_pool_by_default(self):
+        env = {"DATABASE_ENGINE": "postgresql", "POSTGRES_HOST": "db", "POSTGRES_DB": "app"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            database = database_from_env("sqlite", "db.sqlite3")
+        self.assertEqual(database["ENGINE"], "django.db.backends.postgresql")
+        self.assertEqual((database["HOST"], database["NAME"]), ("db", "app"))
+        self.assertEqual(database["OPTIONS"]["pool"]["max_size"], 10)
+        self.assertNotIn("CONN_MAX_AGE", database)
+
+    def test_postgresql_persistent_connections_without_pool(self):
+        env = {"DATABASE_POOL": "0", "DATABASE_CONN_MAX_AGE": "300"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            database = database_from_env("postgresql", "db.sqlite3")
+        self.assertNotIn("OPTIONS", database)
+        self.assertEqual(database["CONN_MAX_AGE"], 300)
+        self.assertTrue(database["CONN_HEALTH_CHECKS"])
+
+    def test_engine_can_be_overridden(self):
+        with mock.patch.dict(os.environ, {"DATABASE_ENGINE": "sqlite"}, clear=True):
+            database = database_from_env("postgresql", "db.sqlite3", tuned_sqlite=True)
+        self.assertEqual(database["OPTIONS"]["transaction_mode"], "IMMEDIATE")
+
+    def test_replicas(self):
+        env = {"DATABASE_ENGINE": "postgresql", "DATABASE_REPLICAS": "r1, r2"}
+        with mock.patch.dict(os.environ, env, clear=True):
+            databases = databases_from_env("sqlite", "db.sqlite3")
+        self.assertEqual(list(databases), ["default", "replica_1", "replica_2"])
+        self.assertEqual(databases["replica_2"]["HOST"], "r2")
+        self.assertEqual(databases["replica_2"]["TEST"], {"MIRROR": "default"})
+
+        with mock.patch.dict(os.environ, {"DATABASE_REPLICAS": "replica.sqlite3"}, clear=True):
+            databases = databases_from_env("sqlite", "db.sqlite3")
+        self.assertEqual(databases["replica_1"]["NAME"], "replica.sqlite3")
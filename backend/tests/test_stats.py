@@ -0,0 +1,199 @@
+import datetime
+import io
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.todo import stats
+from apps.todo.models import Task, TaskStats
+from django.contrib.auth.models import User
+
+
+class TaskStatsTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("task_stats")
+        self.tasks_url = reverse("tasks")
+        self.user = User.objects.create_user(username="user", password="testpass")
+        self.other = User.objects.create_user(username="other", password="testpass")
+        self.now = timezone.now()
+        Task.objects.create(
+            title="Late",
+            description="Overdue",
+            priority=Task.Priority.HIGH,
+            due_date=self.now - datetime.timedelta(days=1),
+            owner=self.user,
+        )
+        Task.objects.create(
+            title="Done late",
+            description="Completed",
+            status=Task.Status.COMPLETED,
+            due_date=self.now - datetime.timedelta(days=1),
+            owner=self.user,
+        )
+        Task.objects.create(
+            title="Soon",
+            description="Due tomorrow",
+            status=Task.Status.IN_PROGRESS,
+            due_date=self.now + datetime.timedelta(days=1),
+            owner=self.user,
+        )
+        Task.objects.create(title="Other", description="Not mine", owner=self.other)
+        self.client.force_authenticate(self.user)
+
+    def assertStatsCorrect(self, owner=None):
+        row = TaskStats.objects.get(owner=owner or self.user)
+        self.assertEqual(stats.differences(row), [])
+
+    def test_stats(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "total": 3,
+                "status": {"pending": 1, "in_progress": 1, "completed": 1},
+                "priority": {"low": 2, "medium": 0, "high": 1},
+                "overdue": 1,
+            },
+        )
+
+    def test_read_is_one_query(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_overdue_refreshes_when_a_due_date_passes(self):
+        self.assertEqual(self.client.get(self.url).data["overdue"], 1)
+        later = self.now + datetime.timedelta(days=2)
+        with mock.patch("django.utils.timezone.now", return_value=later):
+            self.assertEqual(self.client.get(self.url).data["overdue"], 2)
+            with self.assertNumQueries(1):
+                self.client.get(self.url)
+
+    def test_task_writes(self):
+        stats.rebuild(self.user.pk)
+        due = self.now + datetime.timedelta(hours=1)
+        response = self.client.post(
+            self.tasks_url, {"title": "New", "description": "x", "due_date": due}, format="json"
+        )
+        detail_url = reverse("task_detail", kwargs={"pk": response.data["id"]})
+        self.assertStatsCorrect()
+        self.assertEqual(TaskStats.objects.get(owner=self.user).overdue_valid_until, due)
+
+        self.client.patch(detail_url, {"status": "completed", "priority": "high"}, format="json")
+        self.assertStatsCorrect()
+        self.client.patch(detail_url, {"status": "invalid"}, format="json")
+        self.assertStatsCorrect()
+        self.client.delete(detail_url)
+        self.assertStatsCorrect()
+        self.assertEqual(self.client.get(self.url).data["total"], 3)
+        self.assertFalse(TaskStats.objects.filter(owner=self.other).exists())
+
+    def test_first_write_builds_the_row(self):
+        self.client.post(self.tasks_url, {"title": "New", "description": "x"}, format="json")
+        self.assertEqual(TaskStats.objects.get(owner=self.user).total, 4)
+
+    def test_bulk_writes(self):
+        stats.rebuild(self.user.pk)
+        url = reverse("tasks_bulk")
+        past = self.now - datetime.timedelta(hours=1)
+        created = self.client.post(
+            url,
+            [
+                {"title": "A", "description": "x", "due_date": past},
+                {"title": "B", "description": "x", "priority": "medium"},
+            ],
+            format="json",
+        ).data["results"]
+        self.assertStatsCorrect()
+        ids = [task["id"] for task in created]
+        changes = [{"id": ids[0], "status": "completed"}, {"id": ids[1], "priority": "low"}]
+        self.client.patch(url, changes, format="json")
+        self.assertStatsCorrect()
+        self.client.delete(url, {"ids": ids}, format="json")
+        self.assertStatsCorrect()
+        self.assertEqual(TaskStats.objects.get(owner=self.user).total, 3)
+
+    def test_import(self):
+        stats.rebuild(self.user.pk)
+        content = "title,description,status\nA,x,completed\nB,x,pending\n"
+        upload = SimpleUploadedFile("tasks.csv", content.encode())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("task_imports"), {"file": upload}, format="multipart")
+        self.assertStatsCorrect()
+        self.assertEqual(TaskStats.objects.get(owner=self.user).total, 5)
+
+    async def test_async_writes(self):
+        await sync_to_async(stats.rebuild)(self.user.pk)
+        headers = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        client = AsyncClient()
+        response = await client.post(
+            reverse("async_tasks"),
+            {"title": "New", "description": "x"},
+            content_type="application/json",
+            headers=headers,
+        )
+        detail_url = reverse("async_task_detail", kwargs={"pk": response.json()["id"]})
+        await sync_to_async(self.assertStatsCorrect)()
+        await client.patch(
+            detail_url, {"status": "completed"}, content_type="application/json", headers=headers
+        )
+        await sync_to_async(self.assertStatsCorrect)()
+        await client.delete(detail_url, headers=headers)
+        await sync_to_async(self.assertStatsCorrect)()
+        row = await TaskStats.objects.aget(owner=self.user)
+        self.assertEqual(row.total, 3)
+
+
+class TaskStatsCommandTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="user", password="testpass")
+        Task.objects.create(title="A", description="x", owner=self.user)
+
+    def call(self, *args):
+        out = io.StringIO()
+        call_command("task_stats", *args, stdout=out)
+        return out.getvalue()
+
+    def test_rebuild_and_verify(self):
+        with self.assertRaises(CommandError):
+            self.call("--verify")
+        self.assertIn("1 owner(s)", self.call())
+        self.assertEqual(TaskStats.objects.get(owner=self.user).total, 1)
+        self.assertIn("are correct", self.call("--verify"))
+
+    def test_rebuild_creates_the_row_before_counting(self):
+        TaskStats.objects.filter(owner=self.user).delete()
+        with CaptureQueriesContext(connection) as queries:
+            stats.rebuild(self.user.pk)
+        sql = [query["sql"] for query in queries.captured_queries]
+        insert = next(i for i, q in enumerate(sql) if q.startswith("INSERT"))
+        count = next(i for i, q in enumerate(sql) if "COUNT(" in q)
+        self.assertLess(insert, count)
+        self.assertEqual(TaskStats.objects.get(owner=self.user).total, 1)
+
+    def test_verify_reports_drift(self):
+        stats.rebuild(self.user.pk)
+        TaskStats.objects.filter(owner=self.user).update(total=5, status_pending=0)
+        out = io.StringIO()
+        with self.assertRaisesMessage(CommandError, "1 owner(s)"):
+            call_command("task_stats", "--verify", "--owner", str(self.user.pk), stdout=out)
+        self.assertIn("total 5 != 1", out.getvalue())
+        self.assertIn("status_pending 0 != 1", out.getvalue())
+
+        self.call("--owner", str(self.user.pk))
+        self.assertIn("are correct", self.call("--verify"))
@@ -13,8 +13,8 @@ class TodoTests(APITestCase):
         self.task = Task.objects.create(
             title="Test task",
             description="Test description",
-            status="pending",
-            priority="high",
+            status=Task.Status.PENDING,
+            priority=Task.Priority.HIGH,
             due_date="2025-12-31",
             owner=self.admin,
         )
@@ -163,3 +163,30 @@ class TodoTests(APITestCase):
             reverse("task_detail", kwargs={"pk": 1}), format="json"
         )
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_priority_orders_by_meaning(self):
+        self.client.force_authenticate(self.admin)
+        for priority in ["medium", "low"]:
+            data = dict(self.valid_data, priority=priority, title=priority)
+            self.client.post(self.tasks_url, data, format="json")
+
+        response = self.client.get(self.tasks_url, {"ordering": "priority"})
+        priorities = [task["priority"] for task in response.data["results"]]
+        self.assertEqual(priorities, ["low", "medium", "high"])
+
+        response = self.client.get(self.tasks_url, {"ordering": "-priority", "priority": "low"})
+        self.assertEqual([task["title"] for task in response.data["results"]], ["low"])
+        response = self.client.get(self.tasks_url, {"status": "urgent"})
+        self.assertEqual(response.data["count"], 0)
+
+    def test_choices_are_exchanged_as_codes(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.post(
+            self.tasks_url, dict(self.valid_data, status="in_progress"), format="json"
+        )
+        self.assertEqual(response.data["status"], "in_progress")
+        task = Task.objects.get(pk=response.data["id"])
+        self.assertEqual((task.status, task.priority), (2, 3))
+
+        response = self.client.post(self.tasks_url, self.invalid_data, format="json")
+        self.assertEqual(response.data["status"], ['"invalid" is not a valid choice.'])